@@ -0,0 +1,469 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Integer, Select, case, cast, distinct, exists, func, literal, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from . import models
+
+site = models.CampaignSite
+campaign = models.Campaign
+campaign_period = models.CampaignPeriod
+
+# Columns a site rollup can be grouped by
+SITE_DIMENSIONS = {
+    "estado": site.estado,
+    "municipio": site.municipio,
+    "zm": site.zm,
+    "tipo_de_mueble": site.tipo_de_mueble,
+    "tipo_de_anuncio": site.tipo_de_anuncio,
+    "tipo_campania": campaign.tipo_campania,
+}
+
+# Measures aggregated by SQL in the GROUP BY
+SITE_MEASURES = {
+    "total_sitios": func.count(),
+    "campanias": func.count(distinct(site.campaign_name)),
+    "impactos_mensuales": func.coalesce(func.sum(site.impactos_mensuales), 0),
+    "impactos_catorcenal": func.coalesce(func.sum(site.impactos_catorcenal), 0),
+    "alcance_mensual": func.coalesce(func.sum(site.alcance_mensual), 0.0),
+    "alcance_mensual_promedio": func.avg(site.alcance_mensual),
+    "frecuencia_mensual_promedio": func.avg(site.frecuencia_mensual),
+}
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _share(values: np.ndarray) -> np.ndarray:
+    total = np.nansum(values)
+    return values / total if total else np.full(values.shape, np.nan)
+
+
+# Measures derived from the SQL ones with vectorized NumPy over all groups:
+# name -> (SQL measures it needs, function of their arrays)
+DERIVED_MEASURES = {
+    "impactos_por_sitio": (("impactos_mensuales", "total_sitios"), _ratio),
+    "frecuencia_efectiva": (("impactos_mensuales", "alcance_mensual"), _ratio),
+    "participacion_impactos": (("impactos_mensuales",), _share),
+}
+
+DEFAULT_SITE_DIMENSIONS = ("zm", "tipo_de_mueble")
+DEFAULT_SITE_MEASURES = ("total_sitios", "impactos_mensuales", "alcance_mensual_promedio")
+
+
+def parse_fields(raw: Optional[str], allowed: Sequence[str], default: Sequence[str], label: str) -> List[str]:
+    """Split a comma-separated parameter and check it against ``allowed``."""
+    if not raw:
+        return list(default)
+    fields = list(dict.fromkeys(field.strip() for field in raw.split(",") if field.strip()))
+    unknown = [field for field in fields if field not in allowed]
+    if unknown or not fields:
+        raise ValueError(f"{label} debe ser una lista de: {', '.join(allowed)}")
+    return fields
+
+
+def site_rollup_select(
+    dimensions: Sequence[str],
+    measures: Sequence[str],
+    tipo_campania: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Select:
+    """GROUP BY ``dimensions`` over ``campaign_sites``.
+
+    Campaigns are joined only when a filter or dimension reads them; the
+    date window keeps sites whose campaign overlaps it, like the search.
+    """
+    query = select(
+        *(SITE_DIMENSIONS[name].label(name) for name in dimensions),
+        *(SITE_MEASURES[name].label(name) for name in measures),
+    ).select_from(site)
+
+    filters = []
+    if tipo_campania:
+        filters.append(campaign.tipo_campania == tipo_campania)
+    if end_date is not None:
+        filters.append(campaign.fecha_inicio <= end_date)
+    if start_date is not None:
+        filters.append(campaign.fecha_fin >= start_date)
+    if filters or "tipo_campania" in dimensions:
+        query = query.join(campaign, campaign.name == site.campaign_name).where(*filters)
+
+    group_by = [SITE_DIMENSIONS[name] for name in dimensions]
+    return query.group_by(*group_by).order_by(*group_by)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return round(value, 4) if isinstance(value, float) else value
+
+
+def site_rollups(
+    db: Session,
+    dimensions: Sequence[str] = DEFAULT_SITE_DIMENSIONS,
+    measures: Sequence[str] = DEFAULT_SITE_MEASURES,
+    tipo_campania: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    sort: Optional[str] = None,
+    limit: int = 100
+) -> Dict[str, Any]:
+    """Site rollups sorted by ``sort`` (descending), top ``limit`` groups."""
+    sql_measures = [name for name in measures if name in SITE_MEASURES]
+    for name in measures:
+        if name in DERIVED_MEASURES:
+            sql_measures += [needed for needed in DERIVED_MEASURES[name][0] if needed not in sql_measures]
+
+    rows = db.execute(
+        site_rollup_select(dimensions, sql_measures, tipo_campania, start_date, end_date)
+    ).all()
+
+    columns = {
+        name: [row[index] for row in rows]
+        for index, name in enumerate([*dimensions, *sql_measures])
+    }
+    arrays = {
+        name: np.array(columns[name], dtype=np.float64) for name in sql_measures
+    }
+    for name in measures:
+        if name in DERIVED_MEASURES:
+            needed, compute = DERIVED_MEASURES[name]
+            arrays[name] = compute(*(arrays[input_name] for input_name in needed))
+            columns[name] = arrays[name].tolist()
+
+    sort = sort or measures[0]
+    order = np.argsort(-np.nan_to_num(arrays[sort], nan=-np.inf), kind="stable")[:limit]
+    return {
+        "dimensions": list(dimensions),
+        "measures": list(measures),
+        "total_grupos": len(rows),
+        "data": [
+            {name: _plain(columns[name][index]) for name in [*dimensions, *measures]}
+            for index in order.tolist()
+        ],
+    }
+
+
+# ``period`` values are "YYYY-NN": NN is the month, or for catorcenal
+# campaigns the 14-day period of the year, numbered from January 1st (the
+# exports' ``id_fourteen``/``mes`` pairs follow the same rule)
+PERIOD_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]"
+FORTNIGHT_DAYS = 14
+FORTNIGHTS_PER_YEAR = 27
+
+
+def month_key_expression(period, tipo_campania):
+    """SQL for the yyyymm month key of ``period``, NULL if it isn't "YYYY-NN"."""
+    year = cast(func.substr(period, 1, 4), Integer)
+    number = cast(func.substr(period, 6, 2), Integer)
+    fortnight_start = func.date(
+        func.printf("%04d-01-01", year), func.printf("+%d days", (number - 1) * FORTNIGHT_DAYS)
+    )
+    return case(
+        (~period.op("GLOB", is_comparison=True)(PERIOD_GLOB), None),
+        (
+            tipo_campania == "catorcenal",
+            case(
+                (number.between(1, FORTNIGHTS_PER_YEAR), cast(func.strftime("%Y%m", fortnight_start), Integer)),
+                else_=None,
+            ),
+        ),
+        (number.between(1, 12), year * 100 + number),
+        else_=None,
+    )
+
+
+def refresh_period_month_keys(conn: Connection, campaign_names: Optional[Iterable[str]] = None) -> None:
+    """Derive ``month_key`` and ``tipo_campania`` of the given campaigns' periods (all if None).
+
+    The seed computes both while preparing its frames; this is the SQL path
+    for rows already stored by an older seed.
+    """
+    tipo = select(campaign.tipo_campania).where(campaign.name == campaign_period.campaign_name).scalar_subquery()
+    stmt = update(campaign_period).values(
+        tipo_campania=tipo,
+        month_key=month_key_expression(campaign_period.period, tipo),
+    )
+    if campaign_names is not None:
+        stmt = stmt.where(campaign_period.campaign_name.in_(list(campaign_names)))
+    conn.execute(stmt)
+
+
+def ensure_period_month_keys(conn: Connection) -> None:
+    """Fill month keys on a database seeded before they existed."""
+    if conn.execute(select(exists().where(campaign_period.month_key.is_(None)))).scalar():
+        refresh_period_month_keys(conn)
+
+
+def month_key(month: str) -> int:
+    """``"2025-03"`` -> ``202503``."""
+    year, number = month.split("-")
+    return int(year) * 100 + int(number)
+
+
+def period_series_select(
+    tipo_campania: Optional[str] = None,
+    start_key: Optional[int] = None,
+    end_key: Optional[int] = None
+) -> Select:
+    query = select(
+        campaign_period.month_key,
+        func.count(),
+        func.coalesce(func.sum(campaign_period.impactos_periodo_personas), 0),
+        func.coalesce(func.sum(campaign_period.impactos_periodo_vehiculos), 0),
+    ).where(campaign_period.month_key.is_not(None))
+    if start_key is not None:
+        query = query.where(campaign_period.month_key >= start_key)
+    if end_key is not None:
+        query = query.where(campaign_period.month_key <= end_key)
+    if tipo_campania:
+        query = query.where(campaign_period.tipo_campania == tipo_campania)
+    return query.group_by(campaign_period.month_key).order_by(campaign_period.month_key)
+
+
+def period_series(
+    db: Session,
+    tipo_campania: Optional[str] = None,
+    start_month: Optional[str] = None,
+    end_month: Optional[str] = None
+) -> Dict[str, Any]:
+    """Monthly period impacts across campaigns, with running totals.
+
+    One grouped query returns the months that have periods; months between
+    them without any are filled with zeros, so the series is continuous and
+    the running totals are plain ``cumsum`` over the columns.
+    """
+    rows = db.execute(period_series_select(
+        tipo_campania,
+        month_key(start_month) if start_month else None,
+        month_key(end_month) if end_month else None,
+    )).all()
+    keys, periods, people, vehicles = (
+        np.array(column, dtype=np.int64).reshape(-1) for column in (zip(*rows) if rows else ([],) * 4)
+    )
+    # Months since year 0, so consecutive months are consecutive integers
+    months = keys // 100 * 12 + keys % 100 - 1
+    span = np.arange(months.min(), months.max() + 1) if len(months) else months
+    positions = months - (span[0] if len(span) else 0)
+
+    columns = {}
+    for name, values in (
+        ("periodos", periods),
+        ("impactos_periodo_personas", people),
+        ("impactos_periodo_vehiculos", vehicles),
+    ):
+        filled = np.zeros(len(span), dtype=np.int64)
+        filled[positions] = values
+        columns[name] = filled
+    columns["acumulado_personas"] = np.cumsum(columns["impactos_periodo_personas"])
+    columns["acumulado_vehiculos"] = np.cumsum(columns["impactos_periodo_vehiculos"])
+
+    labels = [f"{year:04d}-{month:02d}" for year, month in zip((span // 12).tolist(), (span % 12 + 1).tolist())]
+    values = {name: column.tolist() for name, column in columns.items()}
+    return {
+        "tipo_campania": tipo_campania,
+        "meses": len(span),
+        "impactos_periodo_personas": int(people.sum()),
+        "impactos_periodo_vehiculos": int(vehicles.sum()),
+        "data": [
+            {"month": label, **{name: column[index] for name, column in values.items()}}
+            for index, label in enumerate(labels)
+        ],
+    }
+
+
+HOURS = 24
+# Storage format of ``Campaign.hourly_vehicle_counts``
+HOURLY_DTYPE = np.dtype("<i4")
+
+
+def _pack_rows(matrix: np.ndarray, dtype: np.dtype) -> List[bytes]:
+    packed = np.ascontiguousarray(matrix, dtype=dtype)
+    return [row.tobytes() for row in packed]
+
+
+def _unpack_rows(blobs: Sequence[bytes], dtype: np.dtype, width: int) -> np.ndarray:
+    """Decode fixed-width blobs into an ``(n, width)`` matrix in one ``frombuffer``."""
+    if not blobs:
+        return np.zeros((0, width), dtype=dtype)
+    return np.frombuffer(b"".join(blobs), dtype=dtype).reshape(-1, width)
+
+
+def pack_hourly(counts: np.ndarray) -> List[bytes]:
+    """Pack an ``(n, 24)`` count matrix into one blob per row."""
+    return _pack_rows(counts, HOURLY_DTYPE)
+
+
+def unpack_hourly(blobs: Sequence[bytes]) -> np.ndarray:
+    """Blobs -> ``(n, 24)`` int64 matrix."""
+    return _unpack_rows(blobs, HOURLY_DTYPE, HOURS).astype(np.int64)
+
+
+def hourly_select(
+    tipo_campania: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Select:
+    query = select(campaign.hourly_vehicle_counts).where(campaign.hourly_vehicle_counts.is_not(None))
+    if tipo_campania:
+        query = query.where(campaign.tipo_campania == tipo_campania)
+    if end_date is not None:
+        query = query.where(campaign.fecha_inicio <= end_date)
+    if start_date is not None:
+        query = query.where(campaign.fecha_fin >= start_date)
+    return query
+
+
+def hourly_profile(db: Session, campaign_id: str) -> Optional[Dict[str, Any]]:
+    blob = db.execute(
+        select(campaign.hourly_vehicle_counts).where(campaign.name == campaign_id)
+    ).scalar()
+    if blob is None:
+        return None
+    counts = unpack_hourly([blob])[0]
+    peak_hour = int(counts.argmax())
+    return {
+        "name": campaign_id,
+        "vehicle_counts": counts.tolist(),
+        "total": int(counts.sum()),
+        "peak_hour": peak_hour,
+        "peak_count": int(counts[peak_hour]),
+    }
+
+
+def hourly_rollups(
+    db: Session,
+    tipo_campania: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Sum, mean and peak-hour profiles of every matching campaign.
+
+    All profiles are decoded into one ``(campaigns, 24)`` matrix and each
+    statistic is a single vectorized reduction over it.
+    """
+    counts = unpack_hourly(db.execute(hourly_select(tipo_campania, start_date, end_date)).scalars().all())
+    total = counts.sum(axis=0)
+    grand_total = int(total.sum())
+    mean = counts.mean(axis=0) if len(counts) else np.zeros(HOURS)
+    peak_hours = np.bincount(counts.argmax(axis=1), minlength=HOURS) if len(counts) else np.zeros(HOURS, dtype=int)
+    return {
+        "campanias": len(counts),
+        "total": grand_total,
+        "sum": total.tolist(),
+        "mean": np.round(mean, 2).tolist(),
+        "share": np.round(total / grand_total, 4).tolist() if grand_total else [0.0] * HOURS,
+        "peak_hour": int(total.argmax()) if grand_total else None,
+        "peak_hour_campaigns": peak_hours.tolist(),
+    }
+
+
+# Layout of ``CampaignSite.demographics``: source CSV column -> response
+# name (the same names ``Campaign`` uses for its campaign-level shares)
+SITE_DEMOGRAPHICS = {
+    "nivel_socioeconomico_ab": "nse_ab",
+    "nivel_socioeconomico_c_mas": "nse_cmas",
+    "nivel_socioeconomico_c": "nse_c",
+    "nivel_socioeconomico_d_mas": "nse_dmas",
+    "nivel_socioeconomico_d": "nse_d",
+    "nivel_socioeconomico_e": "nse_e",
+    "cero_catorce": "edad_0a14",
+    "quince_diecinueve": "edad_15a19",
+    "veinte_veinticuatro": "edad_20a24",
+    "veinticinco_treintaycuatro": "edad_25a34",
+    "treintaycinco_cuarentaycuatro": "edad_35a44",
+    "cuarentaycinco_sesentaycuatro": "edad_45a64",
+    "sesentaycinco_mas": "edad_65mas",
+    "per_hom": "hombres",
+    "per_muj": "mujeres",
+}
+DEMOGRAPHIC_FIELDS = list(SITE_DEMOGRAPHICS.values())
+DEMOGRAPHIC_DTYPE = np.dtype("<f4")
+
+# Site columns a demographic profile can be weighted by (None = every site
+# counts the same)
+DEMOGRAPHIC_WEIGHTS = {
+    "impactos_mensuales": site.impactos_mensuales,
+    "impactos_catorcenal": site.impactos_catorcenal,
+    "alcance_mensual": site.alcance_mensual,
+    "sitios": None,
+}
+
+
+def pack_demographics(shares: np.ndarray) -> List[bytes]:
+    """Pack an ``(n, 15)`` share matrix into one float32 blob per site."""
+    return _pack_rows(shares, DEMOGRAPHIC_DTYPE)
+
+
+def unpack_demographics(blobs: Sequence[bytes]) -> np.ndarray:
+    """Blobs -> ``(n, 15)`` float64 matrix in ``DEMOGRAPHIC_FIELDS`` order."""
+    return _unpack_rows(blobs, DEMOGRAPHIC_DTYPE, len(DEMOGRAPHIC_FIELDS)).astype(np.float64)
+
+
+def demographic_select(
+    weight: str,
+    campaign_names: Optional[Sequence[str]] = None,
+    site_codes: Optional[Sequence[str]] = None,
+    tipo_campania: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Select:
+    weight_column = DEMOGRAPHIC_WEIGHTS[weight]
+    query = select(
+        site.demographics,
+        weight_column if weight_column is not None else literal(1),
+    ).where(site.demographics.is_not(None))
+    if campaign_names:
+        query = query.where(site.campaign_name.in_(campaign_names))
+    if site_codes:
+        query = query.where(site.codigo_del_sitio.in_(site_codes))
+
+    filters = []
+    if tipo_campania:
+        filters.append(campaign.tipo_campania == tipo_campania)
+    if end_date is not None:
+        filters.append(campaign.fecha_inicio <= end_date)
+    if start_date is not None:
+        filters.append(campaign.fecha_fin >= start_date)
+    if filters:
+        query = query.join(campaign, campaign.name == site.campaign_name).where(*filters)
+    return query
+
+
+def demographic_profile(
+    db: Session,
+    weight: str = "impactos_mensuales",
+    campaign_names: Optional[Sequence[str]] = None,
+    site_codes: Optional[Sequence[str]] = None,
+    tipo_campania: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Weighted average of the selected sites' demographic vectors.
+
+    The sites' vectors form an ``(n, 15)`` matrix ``M`` and their weights a
+    vector ``w``; the profile is the single product ``w @ M / w.sum()``.
+    """
+    rows = db.execute(
+        demographic_select(weight, campaign_names, site_codes, tipo_campania, start_date, end_date)
+    ).all()
+    matrix = unpack_demographics([row[0] for row in rows])
+    weights = np.nan_to_num(np.array([row[1] for row in rows], dtype=np.float64))
+    total_weight = float(weights.sum())
+    profile = weights @ matrix / total_weight if total_weight else np.full(len(DEMOGRAPHIC_FIELDS), np.nan)
+    values = dict(zip(DEMOGRAPHIC_FIELDS, (_plain(value) for value in profile.tolist())))
+    return {
+        "sitios": len(rows),
+        "weight": weight,
+        "total_weight": _plain(total_weight),
+        "nse": {name: value for name, value in values.items() if name.startswith("nse_")},
+        "edad": {name: value for name, value in values.items() if name.startswith("edad_")},
+        "genero": {"hombres": values["hombres"], "mujeres": values["mujeres"]},
+    }
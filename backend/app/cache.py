@@ -0,0 +1,108 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple, Optional
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    """In-process LRU + TTL cache of serialized responses.
+
+    Entries belong to a data generation (bumped by every seed). When a
+    request observes a different generation the whole cache is dropped, so
+    invalidation is exact; the TTL only bounds how long unused entries live.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_SIZE,
+        ttl_seconds: float = RESPONSE_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _sync_generation(self, generation: int) -> None:
+        if generation != self.generation:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.generation = generation
+
+    def get(self, key: Hashable, generation: int) -> Optional[CachedResponse]:
+        with self._lock:
+            self._sync_generation(generation)
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, generation: int, body: bytes) -> CachedResponse:
+        entry = CachedResponse(body, make_etag(body), self._clock() + self.ttl_seconds)
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            self._sync_generation(generation)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation = None
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "generation": self.generation,
+            }
+
+
+response_cache = ResponseCache()
@@ -1,25 +1,234 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from datetime import datetime
-from typing import Optional, Tuple, List
+import base64
+import json
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Query, Session, selectinload
+from sqlalchemy import Select, and_, delete, func, insert, literal, select, tuple_, union_all
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, Optional, Tuple, List, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from . import models, schemas
 
+
+GENERATION_KEY = "generation"
+
+T = TypeVar("T")
+DbSession = Union[Session, AsyncSession]
+
+
+async def run(db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await any sync crud function on either kind of session.
+
+    ``AsyncSession`` runs it through ``run_sync``: only the I/O is awaited on
+    the aiosqlite driver, row processing still runs on the event loop. A
+    plain ``Session`` runs the whole call on the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def get_data_generation(db: Session) -> int:
+    """Counter bumped by every seed; 0 for a database never seeded."""
+    value = db.execute(
+        select(models.DatasetMeta.value).where(models.DatasetMeta.key == GENERATION_KEY)
+    ).scalar()
+    return int(value) if value is not None else 0
+
+
+def get_meta(conn: Connection, key: str) -> Optional[str]:
+    meta = models.DatasetMeta.__table__
+    return conn.execute(select(meta.c.value).where(meta.c.key == key)).scalar()
+
+
+def set_meta(conn: Connection, key: str, value: str) -> None:
+    meta = models.DatasetMeta.__table__
+    stmt = sqlite_insert(meta).values(key=key, value=value)
+    conn.execute(stmt.on_conflict_do_update(index_elements=[meta.c.key], set_={"value": stmt.excluded.value}))
+
+
+def bump_data_generation(conn: Connection) -> int:
+    current = get_meta(conn, GENERATION_KEY)
+    generation = (int(current) if current is not None else 0) + 1
+    set_meta(conn, GENERATION_KEY, str(generation))
+    return generation
+
+
+def encode_cursor(campaign: models.Campaign) -> str:
+    """Opaque keyset token for the position right after ``campaign``."""
+    fecha_inicio = campaign.fecha_inicio.isoformat() if campaign.fecha_inicio is not None else None
+    payload = json.dumps([fecha_inicio, campaign.name])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[date], str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        fecha_inicio, name = json.loads(base64.urlsafe_b64decode(padded))
+        return (date.fromisoformat(fecha_inicio) if fecha_inicio is not None else None), str(name)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("cursor inválido") from exc
+
+
+def _paginate(
+    query: Query,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    include_total: bool
+) -> Tuple[List[models.Campaign], Optional[int], Optional[str]]:
+    """Apply the shared ordering plus OFFSET or keyset pagination.
+
+    Campaigns are ordered by ``(fecha_inicio, name)`` descending so every row
+    has a unique position; one extra row is fetched to know whether a
+    ``next_cursor`` exists. SQLite sorts NULL dates last in that order; a
+    row-value comparison never matches them, so once the dated rows run out
+    a second indexed query continues with the undated ones by name.
+    """
+    total = query.count() if include_total else None
+    ordered = query.order_by(models.Campaign.fecha_inicio.desc(), models.Campaign.name.desc())
+    if not cursor:
+        return _page(ordered.offset(skip).limit(limit + 1).all(), limit, total)
+
+    fecha_inicio, name = decode_cursor(cursor)
+    undated = ordered.filter(models.Campaign.fecha_inicio.is_(None))
+    if fecha_inicio is None:
+        return _page(undated.filter(models.Campaign.name < name).limit(limit + 1).all(), limit, total)
+    results = ordered.filter(
+        tuple_(models.Campaign.fecha_inicio, models.Campaign.name) < tuple_(fecha_inicio, name)
+    ).limit(limit + 1).all()
+    if len(results) <= limit:
+        results += undated.limit(limit + 1 - len(results)).all()
+    return _page(results, limit, total)
+
+
+def _page(
+    results: List[models.Campaign],
+    limit: int,
+    total: Optional[int]
+) -> Tuple[List[models.Campaign], Optional[int], Optional[str]]:
+    next_cursor = encode_cursor(results[limit - 1]) if len(results) > limit else None
+    return results[:limit], total, next_cursor
+
 def get_campaigns(
     db: Session,
     skip: int = 0,
     limit: int = 10,
-    tipo_campania: Optional[str] = None
-):
-    query = db.query(models.Campaign).order_by(models.Campaign.fecha_inicio.desc())
+    tipo_campania: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True
+) -> Tuple[List[models.Campaign], Optional[int], Optional[str]]:
+    query = db.query(models.Campaign)
     if tipo_campania:
         query = query.filter(models.Campaign.tipo_campania == tipo_campania)
-    total = query.count()
-    results = query.offset(skip).limit(limit).all()
-    return results, total
+    return _paginate(query, skip, limit, cursor, include_total)
+
+def get_campaign(db: Session, campaign_id: str, with_children: bool = False):
+    """Fetch one campaign; ``with_children`` eager-loads periods and sites.
+
+    Children are loaded with one ``selectinload`` query each, so a detail
+    lookup costs exactly three statements.
+    """
+    query = db.query(models.Campaign).filter(models.Campaign.name == campaign_id)
+    if with_children:
+        query = query.options(
+            selectinload(models.Campaign.periods),
+            selectinload(models.Campaign.sites),
+        )
+    return query.first()
+
+def get_campaign_details(db: Session, campaign_ids: Iterable[str]):
+    """Campaigns with their summaries, periods and sites for many ids at once.
+
+    Costs three statements whatever the number of ids: campaigns outer
+    joined to their summary rows, then one ``selectinload`` IN query per
+    child table. Returns ``(campaign, summary)`` pairs in ``campaign_ids``
+    order; unknown ids are skipped.
+    """
+    names = list(dict.fromkeys(campaign_ids))
+    rows = (
+        db.query(models.Campaign, models.CampaignSummary)
+        .outerjoin(models.CampaignSummary, models.CampaignSummary.campaign_name == models.Campaign.name)
+        .filter(models.Campaign.name.in_(names))
+        .options(
+            selectinload(models.Campaign.periods),
+            selectinload(models.Campaign.sites),
+        )
+        .all()
+    )
+    found = {campaign.name: [campaign, summary] for campaign, summary in rows}
+    unmaterialized = [name for name, (_, summary) in found.items() if summary is None]
+    if unmaterialized:
+        for summary in db.execute(summary_select(unmaterialized)):
+            found[summary.campaign_name][1] = summary
+    return [tuple(found[name]) for name in names if name in found]
 
-def get_campaign(db: Session, campaign_id: str):
-    return db.query(models.Campaign).filter(models.Campaign.name == campaign_id).first()
+def summary_select(campaign_names: Optional[Iterable[str]] = None) -> Select:
+    """GROUP BY rollups shaped like ``campaign_summaries`` rows."""
+    period = models.CampaignPeriod
+    site = models.CampaignSite
+    campaign = models.Campaign
+
+    periods = select(
+        period.campaign_name,
+        func.count().label("total_periodos"),
+        func.coalesce(func.sum(period.impactos_periodo_personas), 0).label("impactos_periodo_personas"),
+        func.coalesce(func.sum(period.impactos_periodo_vehiculos), 0).label("impactos_periodo_vehiculos"),
+    ).group_by(period.campaign_name)
+    sites = select(
+        site.campaign_name,
+        func.count().label("total_sitios"),
+        func.coalesce(func.sum(site.impactos_mensuales), 0).label("impactos_mensuales"),
+        func.coalesce(func.sum(site.impactos_catorcenal), 0).label("impactos_catorcenal"),
+        func.round(func.coalesce(func.sum(site.alcance_mensual), 0) * 1.0 / func.count(), 2).label(
+            "alcance_mensual_promedio"
+        ),
+    ).group_by(site.campaign_name)
+    if campaign_names is not None:
+        names = list(campaign_names)
+        periods = periods.where(period.campaign_name.in_(names))
+        sites = sites.where(site.campaign_name.in_(names))
+    periods = periods.subquery()
+    sites = sites.subquery()
+
+    query = (
+        select(
+            campaign.name.label("campaign_name"),
+            func.coalesce(periods.c.total_periodos, 0).label("total_periodos"),
+            func.coalesce(periods.c.impactos_periodo_personas, 0).label("impactos_periodo_personas"),
+            func.coalesce(periods.c.impactos_periodo_vehiculos, 0).label("impactos_periodo_vehiculos"),
+            func.coalesce(sites.c.total_sitios, 0).label("total_sitios"),
+            func.coalesce(sites.c.impactos_mensuales, 0).label("impactos_mensuales"),
+            func.coalesce(sites.c.impactos_catorcenal, 0).label("impactos_catorcenal"),
+            func.coalesce(sites.c.alcance_mensual_promedio, 0.0).label("alcance_mensual_promedio"),
+        )
+        .outerjoin(periods, periods.c.campaign_name == campaign.name)
+        .outerjoin(sites, sites.c.campaign_name == campaign.name)
+    )
+    if campaign_names is not None:
+        query = query.where(campaign.name.in_(names))
+    return query
+
+def refresh_campaign_summaries(conn: Connection, campaign_names: Optional[Iterable[str]] = None) -> None:
+    """Recompute ``campaign_summaries`` for the given campaigns (all if None)."""
+    summary = models.CampaignSummary.__table__
+    names = None if campaign_names is None else list(campaign_names)
+    clear = delete(summary)
+    if names is not None:
+        clear = clear.where(summary.c.campaign_name.in_(names))
+    conn.execute(clear)
+    rollups = summary_select(names)
+    conn.execute(insert(summary).from_select([column.name for column in rollups.selected_columns], rollups))
+
+def get_campaign_summary(db: Session, campaign_id: str):
+    """Materialized summary row, or the same rollup computed on the fly."""
+    summary = db.get(models.CampaignSummary, campaign_id)
+    if summary is None:
+        summary = db.execute(summary_select([campaign_id])).first()
+    return summary
 
 def search_campaigns_by_date(
     db: Session,
@@ -27,8 +236,10 @@ def search_campaigns_by_date(
     end_date: datetime,
     skip: int = 0,
     limit: int = 10,
-    tipo_campania: Optional[str] = None
-) -> Tuple[List[models.Campaign], int]:
+    tipo_campania: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True
+) -> Tuple[List[models.Campaign], Optional[int], Optional[str]]:
     query = db.query(models.Campaign).filter(
         and_(
             models.Campaign.fecha_inicio <= end_date,
@@ -39,6 +250,175 @@ def search_campaigns_by_date(
     if tipo_campania:
         query = query.filter(models.Campaign.tipo_campania == tipo_campania)
 
-    total = query.count()
-    results = query.order_by(models.Campaign.fecha_inicio.desc()).offset(skip).limit(limit).all()
-    return results, total
+    return _paginate(query, skip, limit, cursor, include_total)
+
+
+# Site attributes materialized in campaign_facets; tipo_campania is read from
+# campaigns directly
+SITE_FACETS = ("estado", "municipio", "zm", "tipo_de_mueble", "tipo_de_anuncio")
+FACET_FIELDS = ("tipo_campania",) + SITE_FACETS
+
+def facet_rows_select(campaign_names: Optional[List[str]] = None) -> Select:
+    """Distinct ``(facet, value, campaign_name)`` rows from ``campaign_sites``."""
+    site = models.CampaignSite
+    parts = []
+    for facet in SITE_FACETS:
+        column = getattr(site, facet)
+        part = select(
+            literal(facet).label("facet"), column.label("value"), site.campaign_name.label("campaign_name")
+        ).where(column.is_not(None)).distinct()
+        if campaign_names is not None:
+            part = part.where(site.campaign_name.in_(campaign_names))
+        parts.append(part)
+    return union_all(*parts)
+
+def refresh_campaign_facets(conn: Connection, campaign_names: Optional[Iterable[str]] = None) -> None:
+    """Recompute ``campaign_facets`` for the given campaigns (all if None)."""
+    facets = models.CampaignFacet.__table__
+    names = None if campaign_names is None else list(campaign_names)
+    clear = delete(facets)
+    if names is not None:
+        clear = clear.where(facets.c.campaign_name.in_(names))
+    conn.execute(clear)
+    conn.execute(insert(facets).from_select(["facet", "value", "campaign_name"], facet_rows_select(names)))
+
+def parse_facets(raw: Optional[str]) -> List[str]:
+    fields = list(dict.fromkeys(value.strip() for value in (raw or "").split(",") if value.strip()))
+    unknown = [field for field in fields if field not in FACET_FIELDS]
+    if unknown:
+        raise ValueError(f"facets desconocidas: {', '.join(unknown)}. Opciones: {', '.join(FACET_FIELDS)}")
+    return fields
+
+def facet_select(
+    fields: List[str],
+    tipo_campania: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Select:
+    """Campaign counts per value of every facet in one ``UNION ALL`` statement.
+
+    Each facet is counted under the other active filters but not its own, so
+    a selector still shows the alternatives to its current value.
+    """
+    campaign = models.Campaign
+    facet = models.CampaignFacet
+    window = []
+    if end_date is not None:
+        window.append(campaign.fecha_inicio <= end_date)
+    if start_date is not None:
+        window.append(campaign.fecha_fin >= start_date)
+
+    parts = []
+    for field in fields:
+        if field == "tipo_campania":
+            part = (
+                select(literal(field).label("facet"), campaign.tipo_campania.label("value"), func.count().label("count"))
+                .where(campaign.tipo_campania.is_not(None), *window)
+                .group_by(campaign.tipo_campania)
+            )
+        else:
+            part = select(literal(field).label("facet"), facet.value.label("value"), func.count().label("count"))
+            part = part.where(facet.facet == field)
+            filters = window + ([campaign.tipo_campania == tipo_campania] if tipo_campania else [])
+            if filters:
+                part = part.join(campaign, campaign.name == facet.campaign_name).where(*filters)
+            part = part.group_by(facet.value)
+        parts.append(part)
+    return union_all(*parts) if len(parts) > 1 else parts[0]
+
+def get_facets(
+    db: Session,
+    fields: List[str],
+    tipo_campania: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> dict:
+    """``{field: [{"value", "count"}, ...]}``, most frequent values first."""
+    facets = {field: [] for field in fields}
+    if not fields:
+        return facets
+    for row in db.execute(facet_select(fields, tipo_campania, start_date, end_date)):
+        facets[row.facet].append({"value": row.value, "count": row.count})
+    for values in facets.values():
+        values.sort(key=lambda item: (-item["count"], item["value"]))
+    return facets
+
+
+EXPORT_DATASETS = {
+    "campaigns": models.Campaign,
+    "periods": models.CampaignPeriod,
+    "sites": models.CampaignSite,
+}
+
+
+# Internal bookkeeping, derived keys and packed arrays served by their own endpoints
+EXPORT_EXCLUDED_COLUMNS = {"row_hash", "hourly_vehicle_counts", "demographics", "audience_vector"}
+
+# Columns the seed derives from other tables; exports mirror the source files
+EXPORT_DERIVED_COLUMNS = {models.CampaignPeriod: {"month_key", "tipo_campania"}}
+
+
+def export_columns(model) -> list:
+    excluded = EXPORT_EXCLUDED_COLUMNS | EXPORT_DERIVED_COLUMNS.get(model, set())
+    return [column for column in model.__table__.columns if column.name not in excluded]
+
+
+def export_select(
+    dataset: str,
+    tipo_campania: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Select:
+    """Core SELECT over one dataset, filtered like the list endpoints.
+
+    Periods and sites are restricted to the campaigns matching the filters.
+    Every ordering follows an index so SQLite streams rows without sorting.
+    """
+    campaign = models.Campaign
+    filters = []
+    if tipo_campania:
+        filters.append(campaign.tipo_campania == tipo_campania)
+    if end_date is not None:
+        filters.append(campaign.fecha_inicio <= end_date)
+    if start_date is not None:
+        filters.append(campaign.fecha_fin >= start_date)
+
+    model = EXPORT_DATASETS[dataset]
+    query = select(*export_columns(model))
+    if model is campaign:
+        return query.where(*filters).order_by(campaign.fecha_inicio.desc(), campaign.name.desc())
+    if filters:
+        query = query.where(model.campaign_name.in_(select(campaign.name).where(*filters)))
+    natural_key = model.period if model is models.CampaignPeriod else model.codigo_del_sitio
+    return query.order_by(model.campaign_name, natural_key)
+
+
+def campaign_sites_select(campaign_id: str) -> Select:
+    site = models.CampaignSite
+    return (
+        select(*export_columns(site))
+        .where(site.campaign_name == campaign_id)
+        .order_by(site.campaign_name, site.codigo_del_sitio)
+    )
+
+
+async def get_data_generation_async(db: DbSession) -> int:
+    return await run(db, get_data_generation)
+
+async def get_campaigns_async(db: DbSession, **kwargs: Any):
+    return await run(db, get_campaigns, **kwargs)
+
+async def get_campaign_async(db: DbSession, campaign_id: str, with_children: bool = False):
+    return await run(db, get_campaign, campaign_id, with_children=with_children)
+
+async def get_campaign_details_async(db: DbSession, campaign_ids: Iterable[str]):
+    return await run(db, get_campaign_details, campaign_ids)
+
+async def search_campaigns_by_date_async(db: DbSession, **kwargs: Any):
+    return await run(db, search_campaigns_by_date, **kwargs)
+
+async def get_facets_async(db: DbSession, fields: List[str], **kwargs: Any):
+    return await run(db, get_facets, fields, **kwargs)
+
+async def get_campaign_summary_async(db: DbSession, campaign_id: str):
+    return await run(db, get_campaign_summary, campaign_id)
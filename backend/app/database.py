@@ -1,14 +1,144 @@
 import os
-from sqlalchemy import create_engine
+from urllib.parse import urlencode
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 default_path = "sqlite:///./campaigns.db"
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", default_path)
 
+# "sync": blocking sessions run on the threadpool; "async": aiosqlite sessions
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+# Connection pool bounds (SQLAlchemy's defaults); every in-flight request
+# holds one connection, so size them for the expected concurrency
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+# Read-only pool used by the API's sessions
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", str(DB_POOL_SIZE)))
+DB_READ_MAX_OVERFLOW = int(os.getenv("DB_READ_MAX_OVERFLOW", str(DB_MAX_OVERFLOW)))
+
+# "performance" applies the PRAGMAs below on every connection; "default"
+# leaves SQLite's stock settings (rollback journal, no mmap)
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # ms
+
+# journal_mode and synchronous are only meaningful on connections that write
+WRITER_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+)
+
+
+def sqlite_pragmas(read_only: bool = False, profile: str = SQLITE_PROFILE):
+    if profile != "performance":
+        return []
+    pragmas = [] if read_only else list(WRITER_PRAGMAS)
+    return pragmas + [
+        ("busy_timeout", SQLITE_BUSY_TIMEOUT),
+        ("mmap_size", SQLITE_MMAP_SIZE),
+        ("cache_size", SQLITE_CACHE_SIZE),
+        ("temp_store", "MEMORY"),
+    ]
+
+
+def apply_sqlite_profile(bind: Engine, read_only: bool = False, profile: str = SQLITE_PROFILE) -> None:
+    """Run the profile's PRAGMAs on every new DBAPI connection of ``bind``."""
+    if bind.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(read_only, profile)
+    if not pragmas:
+        return
+
+    @event.listens_for(bind, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def use_snapshot_reads(bind: Engine) -> None:
+    """Make every transaction of ``bind`` one SQLite read snapshot.
+
+    pysqlite only emits BEGIN before writes, so each SELECT of a read-only
+    session would otherwise see the latest commit; with an explicit BEGIN a
+    request's queries (data generation included) all see the same data,
+    even while a refresh commits under WAL.
+    """
+    if bind.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(bind, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(bind, "begin")
+    def begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def to_async_url(url: str) -> str:
+    """``sqlite:///x.db`` -> ``sqlite+aiosqlite:///x.db``."""
+    dialect, _, rest = url.partition("://")
+    return f"{dialect.split('+')[0]}+aiosqlite://{rest}"
+
+
+def to_read_only_url(url: str) -> str:
+    """Open a file-backed SQLite database with ``mode=ro``.
+
+    Other URLs (including in-memory SQLite) are returned unchanged.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return url
+    if parsed.database.startswith("file:"):
+        return url
+    query = urlencode({**parsed.query, "mode": "ro", "uri": "true"}, doseq=True)
+    return f"{parsed.drivername}:///file:{parsed.database}?{query}"
+
+
+# Writer: migrations, seeding and refreshes
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
 )
+apply_sqlite_profile(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Reader: the API only ever reads, so its sessions use a read-only pool that
+# never takes write locks and, under WAL, never blocks behind the seed
+read_engine = create_engine(
+    to_read_only_url(SQLALCHEMY_DATABASE_URL),
+    connect_args={"check_same_thread": False},
+    pool_size=DB_READ_POOL_SIZE,
+    max_overflow=DB_READ_MAX_OVERFLOW,
+)
+apply_sqlite_profile(read_engine, read_only=True)
+use_snapshot_reads(read_engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        to_async_url(to_read_only_url(SQLALCHEMY_DATABASE_URL)),
+        pool_size=DB_READ_POOL_SIZE,
+        max_overflow=DB_READ_MAX_OVERFLOW,
+    )
+    apply_sqlite_profile(async_engine.sync_engine, read_only=True)
+    use_snapshot_reads(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
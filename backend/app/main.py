@@ -1,17 +1,43 @@
 import logging
+import secrets
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, Hashable, List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-from . import crud, models, schemas
-from .database import SessionLocal, engine
+from . import analytics, crud, metrics, models, refresh, schemas
+from .serialization import campaign_row, dumps, period_row, site_row
+from .cache import etag_matches, response_cache
+from .crud import DbSession
+from .database import AsyncSessionLocal, ReadSessionLocal, async_engine, engine, read_engine
+from .export import EXPORT_FORMATS, stream_export
+from .migrations import upgrade_schema
+from .search import search_campaigns
+from .similarity import MAX_NEIGHBOURS, audience_index, similar_campaigns
 
-models.Base.metadata.create_all(bind=engine)
+logger = logging.getLogger("uvicorn.error")
 
-app = FastAPI(title="Campaign Analytics API")
+metrics.instrument_engine(engine, "writer")
+metrics.instrument_engine(read_engine, "reader")
+if async_engine is not None:
+    metrics.instrument_engine(async_engine.sync_engine, "reader")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # On startup rather than at import, so importing the app (tests,
+    # benchmarks, tooling) never touches the database; with an up-to-date
+    # schema this is a single query
+    upgrade_schema(engine)
+    with ReadSessionLocal() as db:
+        audience_index.load(db)
+    yield
+
+
+app = FastAPI(title="Campaign Analytics API", lifespan=lifespan)
 
 @app.get("/")
 def read_root():
@@ -29,63 +55,172 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing"],
 )
+# Outermost, so CORS handling is included in the recorded latency
+app.add_middleware(metrics.MetricsMiddleware)
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+# Dependency to get DB session (an AsyncSession when DB_MODE=async)
+async def get_db():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+def normalize_tipo_campania(tipo_campania: Optional[str]) -> Optional[str]:
+    if not tipo_campania:
+        return None
+    normalized_type = tipo_campania.lower()
+    allowed_types = {"mensual", "catorcenal"}
+    if normalized_type not in allowed_types:
+        raise HTTPException(
+            status_code=400,
+            detail=f"tipo_campania debe ser uno de: {', '.join(sorted(allowed_types))}"
+        )
+    return normalized_type
+
+async def cached_json(
+    request: Request,
+    db: DbSession,
+    key: Hashable,
+    build: Callable[[], Awaitable[Any]]
+) -> Response:
+    """Serve ``await build()`` as JSON through the response cache.
+
+    ``key`` must identify the normalized request parameters. Responses carry
+    a strong ETag and a matching ``If-None-Match`` gets ``304 Not Modified``.
+    The generation is left in ``request.state.data_generation`` for builders
+    that key in-process state on it.
+    """
+    generation = await crud.get_data_generation_async(db)
+    request.state.data_generation = generation
+    entry = response_cache.get(key, generation)
+    if entry is None:
+        entry = response_cache.set(key, generation, dumps(await build()))
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+def parse_facet_fields(facets: Optional[str]) -> List[str]:
+    try:
+        return crud.parse_facets(facets)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+def paginated_response(
+    campaigns: List[models.Campaign],
+    total: Optional[int],
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    next_cursor: Optional[str]
+) -> Dict[str, Any]:
+    return {
+        "data": campaign_row.many(campaigns),
+        "total": total,
+        "page": None if cursor else page,
+        "pageSize": limit,
+        "next_cursor": next_cursor,
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """
+    Request latency, per-request SQL and cache counters in Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render_metrics(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/cache/stats")
+def read_cache_stats():
+    """
+    Hit/miss/eviction counters of the response cache.
+    """
+    return response_cache.stats()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not refresh.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Endpoints de administración deshabilitados: defina ADMIN_TOKEN")
+    if not secrets.compare_digest(x_admin_token or "", refresh.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="X-Admin-Token inválido")
+
+@app.post("/admin/refresh", status_code=202, dependencies=[Depends(require_admin)])
+def start_refresh():
+    """
+    Reload the CSVs in a background process and swap them in atomically.
+    """
+    if not refresh.refresh_worker.start():
+        raise HTTPException(status_code=409, detail="Ya hay un refresco en curso")
+    return refresh.refresh_worker.status()
+
+@app.get("/admin/refresh", dependencies=[Depends(require_admin)])
+def read_refresh_status():
+    """
+    State, timestamps and last output lines of the latest refresh.
+    """
+    return refresh.refresh_worker.status()
+
 @app.get("/campaigns/", response_model=Dict[str, Any])
-def read_campaigns(
+async def read_campaigns(
+    request: Request,
     page: int = Query(1, ge=1, description="Número de página (1-indexado)"),
     limit: int = Query(5, ge=1, le=50, description="Resultados por página"),
     tipo_campania: Optional[str] = Query(
         None,
         description="Filtra por tipo de campaña (mensual/catorcenal)"
     ),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(
+        None,
+        description="Token next_cursor de la respuesta anterior (paginación por cursor; ignora page)"
+    ),
+    include_total: bool = Query(True, description="Calcula el total de resultados (false evita el COUNT)"),
+    facets: Optional[str] = Query(
+        None,
+        description="Conteos de campañas por valor, separados por coma (tipo_campania, estado, municipio, zm, tipo_de_mueble, tipo_de_anuncio)"
+    ),
+    db: DbSession = Depends(get_db)
 ):
     """
     Get all campaigns with pagination and optional filtering by campaign type.
     """
-    logger = logging.getLogger("uvicorn.error")
-    try:
-        normalized_type: Optional[str] = None
-        if tipo_campania:
-            normalized_type = tipo_campania.lower()
-            allowed_types = {"mensual", "catorcenal"}
-            if normalized_type not in allowed_types:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"tipo_campania debe ser uno de: {', '.join(sorted(allowed_types))}"
-                )
-
-        skip = (page - 1) * limit
-
-        campaigns, total = crud.get_campaigns(
-            db,
-            skip=skip,
-            limit=limit,
-            tipo_campania=normalized_type
-        )
-        data = [schemas.Campaign.from_orm(campaign).dict() for campaign in campaigns]
-        logger.info("Fetched %s campaigns (total=%s, page=%s, limit=%s)", len(data), total, page, limit)
-        return {
-            "data": data,
-            "total": total,
-            "page": page,
-            "pageSize": limit
-        }
-    except Exception as exc:
-        logger.exception("Error while fetching campaigns")
-        raise HTTPException(status_code=500, detail="Internal server error") from exc
+    normalized_type = normalize_tipo_campania(tipo_campania)
+    facet_fields = parse_facet_fields(facets)
+    skip = (page - 1) * limit
+
+    async def build():
+        try:
+            campaigns, total, next_cursor = await crud.get_campaigns_async(
+                db,
+                skip=skip,
+                limit=limit,
+                tipo_campania=normalized_type,
+                cursor=cursor,
+                include_total=include_total
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        except Exception as exc:
+            logger.exception("Error while fetching campaigns")
+            raise HTTPException(status_code=500, detail="Internal server error") from exc
+
+        payload = paginated_response(campaigns, total, page, limit, cursor, next_cursor)
+        if facet_fields:
+            payload["facets"] = await crud.get_facets_async(db, facet_fields, tipo_campania=normalized_type)
+        return payload
+
+    key = ("campaigns", page, limit, normalized_type, cursor, include_total, tuple(facet_fields))
+    return await cached_json(request, db, key, build)
 
 @app.get("/campaigns/search-by-date", response_model=Dict[str, Any])
-def search_campaigns_by_date(
+async def search_campaigns_by_date(
+    request: Request,
     start_date: datetime = Query(..., description="Fecha de inicio (YYYY-MM-DD)"),
     end_date: datetime = Query(..., description="Fecha fin (YYYY-MM-DD)"),
     page: int = Query(1, ge=1, description="Número de página (1-indexado)"),
@@ -94,112 +229,513 @@ def search_campaigns_by_date(
         None,
         description="Filtra por tipo de campaña (mensual/catorcenal)"
     ),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(
+        None,
+        description="Token next_cursor de la respuesta anterior (paginación por cursor; ignora page)"
+    ),
+    include_total: bool = Query(True, description="Calcula el total de resultados (false evita el COUNT)"),
+    facets: Optional[str] = Query(
+        None,
+        description="Conteos de campañas por valor, separados por coma (tipo_campania, estado, municipio, zm, tipo_de_mueble, tipo_de_anuncio)"
+    ),
+    db: DbSession = Depends(get_db)
 ):
     """
     Search campaigns by date range.
     """
-    logger = logging.getLogger("uvicorn.error")
-
     if start_date > end_date:
         raise HTTPException(
             status_code=400,
             detail="start_date debe ser anterior o igual a end_date"
         )
 
-    normalized_type: Optional[str] = None
-    if tipo_campania:
-        normalized_type = tipo_campania.lower()
-        allowed_types = {"mensual", "catorcenal"}
-        if normalized_type not in allowed_types:
-            raise HTTPException(
-                status_code=400,
-                detail=f"tipo_campania debe ser uno de: {', '.join(sorted(allowed_types))}"
+    normalized_type = normalize_tipo_campania(tipo_campania)
+    facet_fields = parse_facet_fields(facets)
+    skip = (page - 1) * limit
+
+    async def build():
+        try:
+            campaigns, total, next_cursor = await crud.search_campaigns_by_date_async(
+                db,
+                start_date=start_date,
+                end_date=end_date,
+                skip=skip,
+                limit=limit,
+                tipo_campania=normalized_type,
+                cursor=cursor,
+                include_total=include_total
             )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        except Exception as exc:
+            logger.exception("Error while searching campaigns by date")
+            raise HTTPException(status_code=500, detail="Internal server error") from exc
 
+        payload = paginated_response(campaigns, total, page, limit, cursor, next_cursor)
+        if facet_fields:
+            payload["facets"] = await crud.get_facets_async(
+                db,
+                facet_fields,
+                tipo_campania=normalized_type,
+                start_date=start_date,
+                end_date=end_date
+            )
+        return payload
+
+    key = (
+        "search-by-date",
+        start_date.date(),
+        end_date.date(),
+        page,
+        limit,
+        normalized_type,
+        cursor,
+        include_total,
+        tuple(facet_fields),
+    )
+    return await cached_json(request, db, key, build)
+
+@app.get("/search", response_model=Dict[str, Any])
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Nombre de campaña, código de sitio o ubicación"),
+    field: Optional[str] = Query(
+        None,
+        pattern="^(name|codigo|municipio|estado|zm)$",
+        description="Restringe la búsqueda a un solo campo"
+    ),
+    page: int = Query(1, ge=1, description="Número de página (1-indexado)"),
+    limit: int = Query(10, ge=1, le=50, description="Resultados por página"),
+    tipo_campania: Optional[str] = Query(
+        None,
+        description="Filtra por tipo de campaña (mensual/catorcenal)"
+    ),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Full-text search over campaign names and their sites' codes and locations,
+    ranked by relevance. The last term matches as a prefix.
+    """
+    normalized_type = normalize_tipo_campania(tipo_campania)
+    query = " ".join(q.split())
     skip = (page - 1) * limit
 
+    async def build():
+        try:
+            campaigns, total = await crud.run(
+                db,
+                search_campaigns,
+                query,
+                field=field,
+                skip=skip,
+                limit=limit,
+                tipo_campania=normalized_type,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return paginated_response(campaigns, total, page, limit, None, None)
+
+    key = ("search", query.casefold(), field, page, limit, normalized_type)
+    return await cached_json(request, db, key, build)
+
+def export_response(db: DbSession, stmt, export_format: str, file_name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(db, stmt, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{file_name}.{export_format}"'},
+    )
+
+@app.get("/export/campaigns")
+async def export_campaigns(
+    dataset: str = Query("campaigns", pattern="^(campaigns|periods|sites)$", description="Tabla a exportar"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato de salida"),
+    tipo_campania: Optional[str] = Query(
+        None,
+        description="Filtra por tipo de campaña (mensual/catorcenal)"
+    ),
+    start_date: Optional[datetime] = Query(None, description="Campañas vigentes desde (YYYY-MM-DD)"),
+    end_date: Optional[datetime] = Query(None, description="Campañas vigentes hasta (YYYY-MM-DD)"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Stream a whole dataset as NDJSON or CSV, filtered like the list endpoints.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date debe ser anterior o igual a end_date"
+        )
+    stmt = crud.export_select(
+        dataset,
+        tipo_campania=normalize_tipo_campania(tipo_campania),
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return export_response(db, stmt, format, dataset)
+
+@app.get("/campaigns/{campaign_id}/sites/export")
+async def export_campaign_sites(
+    campaign_id: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato de salida"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Stream the sites of one campaign as NDJSON or CSV.
+    """
+    if await crud.get_campaign_async(db, campaign_id) is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return export_response(db, crud.campaign_sites_select(campaign_id), format, "campaign_sites")
+
+@app.get("/analytics/sites", response_model=Dict[str, Any])
+async def read_site_analytics(
+    request: Request,
+    dimensions: Optional[str] = Query(
+        None,
+        description=f"Dimensiones separadas por coma: {', '.join(analytics.SITE_DIMENSIONS)}"
+    ),
+    measures: Optional[str] = Query(
+        None,
+        description=(
+            "Medidas separadas por coma: "
+            f"{', '.join([*analytics.SITE_MEASURES, *analytics.DERIVED_MEASURES])}"
+        )
+    ),
+    tipo_campania: Optional[str] = Query(
+        None,
+        description="Filtra por tipo de campaña (mensual/catorcenal)"
+    ),
+    start_date: Optional[datetime] = Query(None, description="Campañas vigentes desde (YYYY-MM-DD)"),
+    end_date: Optional[datetime] = Query(None, description="Campañas vigentes hasta (YYYY-MM-DD)"),
+    sort: Optional[str] = Query(None, description="Medida para ordenar (descendente); por defecto la primera"),
+    limit: int = Query(100, ge=1, le=1000, description="Grupos devueltos"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Cross-campaign site rollups grouped by the selected dimensions.
+    """
     try:
-        campaigns, total = crud.search_campaigns_by_date(
+        selected_dimensions = analytics.parse_fields(
+            dimensions, list(analytics.SITE_DIMENSIONS), analytics.DEFAULT_SITE_DIMENSIONS, "dimensions"
+        )
+        selected_measures = analytics.parse_fields(
+            measures,
+            [*analytics.SITE_MEASURES, *analytics.DERIVED_MEASURES],
+            analytics.DEFAULT_SITE_MEASURES,
+            "measures"
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if sort is not None and sort not in selected_measures:
+        raise HTTPException(status_code=400, detail="sort debe ser una de las medidas seleccionadas")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date debe ser anterior o igual a end_date"
+        )
+    normalized_type = normalize_tipo_campania(tipo_campania)
+
+    async def build():
+        return await crud.run(
             db,
+            analytics.site_rollups,
+            dimensions=selected_dimensions,
+            measures=selected_measures,
+            tipo_campania=normalized_type,
             start_date=start_date,
             end_date=end_date,
-            skip=skip,
+            sort=sort,
             limit=limit,
-            tipo_campania=normalized_type
-        )
-        data = [schemas.Campaign.from_orm(campaign).dict() for campaign in campaigns]
-        logger.info(
-            "Date search returned %s campaigns (total=%s, page=%s, limit=%s)",
-            len(data),
-            total,
-            page,
-            limit
         )
-        return {
-            "data": data,
-            "total": total,
-            "page": page,
-            "pageSize": limit
-        }
-    except Exception as exc:
-        logger.exception("Error while searching campaigns by date")
-        raise HTTPException(status_code=500, detail="Internal server error") from exc
 
-@app.get("/campaigns/{campaign_id}", response_model=schemas.CampaignDetail)
-def read_campaign(campaign_id: str, db: Session = Depends(get_db)):
+    key = (
+        "analytics-sites",
+        tuple(selected_dimensions),
+        tuple(selected_measures),
+        normalized_type,
+        start_date.date() if start_date else None,
+        end_date.date() if end_date else None,
+        sort,
+        limit,
+    )
+    return await cached_json(request, db, key, build)
+
+@app.get("/analytics/hourly", response_model=Dict[str, Any])
+async def read_hourly_analytics(
+    request: Request,
+    tipo_campania: Optional[str] = Query(
+        None,
+        description="Filtra por tipo de campaña (mensual/catorcenal)"
+    ),
+    start_date: Optional[datetime] = Query(None, description="Campañas vigentes desde (YYYY-MM-DD)"),
+    end_date: Optional[datetime] = Query(None, description="Campañas vigentes hasta (YYYY-MM-DD)"),
+    db: DbSession = Depends(get_db)
+):
     """
-    Get detailed information for a specific campaign with summary data.
+    Sum, mean and peak-hour vehicle traffic profiles across campaigns.
     """
-    campaign = crud.get_campaign(db, campaign_id)
-    if campaign is None:
-        raise HTTPException(status_code=404, detail="Campaign not found")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date debe ser anterior o igual a end_date"
+        )
+    normalized_type = normalize_tipo_campania(tipo_campania)
 
-    def safe_sum(values):
-        return sum(v for v in values if v is not None)
-
-    campaign_data = schemas.Campaign.from_orm(campaign).dict()
-    periods = [schemas.CampaignPeriod.from_orm(period).dict() for period in campaign.periods]
-    sites = [schemas.CampaignSite.from_orm(site).dict() for site in campaign.sites]
-
-    period_summary = {
-        "total_periodos": len(periods),
-        "impactos_personas": safe_sum(
-            period["impactos_periodo_personas"] for period in periods
-        ),
-        "impactos_vehiculos": safe_sum(
-            period["impactos_periodo_vehiculos"] for period in periods
-        ),
-    }
+    async def build():
+        return await crud.run(
+            db,
+            analytics.hourly_rollups,
+            tipo_campania=normalized_type,
+            start_date=start_date,
+            end_date=end_date,
+        )
 
-    total_sites = len(sites)
-    impactos_mensuales = safe_sum(site["impactos_mensuales"] for site in sites)
-    impactos_catorcenal = safe_sum(site["impactos_catorcenal"] for site in sites)
-    alcance_promedio = (
-        safe_sum(site["alcance_mensual"] for site in sites) / total_sites
-        if total_sites > 0 else 0.0
+    key = (
+        "analytics-hourly",
+        normalized_type,
+        start_date.date() if start_date else None,
+        end_date.date() if end_date else None,
     )
+    return await cached_json(request, db, key, build)
 
-    site_summary = {
-        "total_sitios": total_sites,
-        "impactos_mensuales": impactos_mensuales,
-        "impactos_catorcenal": impactos_catorcenal,
-        "alcance_mensual_promedio": round(alcance_promedio, 2),
-    }
+@app.get("/analytics/periods", response_model=Dict[str, Any])
+async def read_period_analytics(
+    request: Request,
+    tipo_campania: Optional[str] = Query(
+        None,
+        description="Filtra por tipo de campaña (mensual/catorcenal)"
+    ),
+    start_month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Primer mes (YYYY-MM)"),
+    end_month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Último mes (YYYY-MM)"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Monthly impacts of every campaign period, with running totals.
+    """
+    if start_month and end_month and start_month > end_month:
+        raise HTTPException(
+            status_code=400,
+            detail="start_month debe ser anterior o igual a end_month"
+        )
+    normalized_type = normalize_tipo_campania(tipo_campania)
+
+    async def build():
+        return await crud.run(
+            db,
+            analytics.period_series,
+            tipo_campania=normalized_type,
+            start_month=start_month,
+            end_month=end_month,
+        )
+
+    key = ("analytics-periods", normalized_type, start_month, end_month)
+    return await cached_json(request, db, key, build)
+
+def split_list(raw: Optional[str]) -> List[str]:
+    if not raw:
+        return []
+    return sorted({value.strip() for value in raw.split(",") if value.strip()})
+
+@app.get("/analytics/demographics", response_model=Dict[str, Any])
+async def read_demographic_analytics(
+    request: Request,
+    campaigns: Optional[str] = Query(None, description="Nombres de campaña separados por coma"),
+    sites: Optional[str] = Query(None, description="Códigos de sitio separados por coma"),
+    weight: str = Query(
+        "impactos_mensuales",
+        description=f"Ponderación de cada sitio: {', '.join(analytics.DEMOGRAPHIC_WEIGHTS)}"
+    ),
+    tipo_campania: Optional[str] = Query(
+        None,
+        description="Filtra por tipo de campaña (mensual/catorcenal)"
+    ),
+    start_date: Optional[datetime] = Query(None, description="Campañas vigentes desde (YYYY-MM-DD)"),
+    end_date: Optional[datetime] = Query(None, description="Campañas vigentes hasta (YYYY-MM-DD)"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Weighted demographic profile (NSE, age, gender) of an ad-hoc set of sites.
+    """
+    if weight not in analytics.DEMOGRAPHIC_WEIGHTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"weight debe ser uno de: {', '.join(analytics.DEMOGRAPHIC_WEIGHTS)}"
+        )
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date debe ser anterior o igual a end_date"
+        )
+    normalized_type = normalize_tipo_campania(tipo_campania)
+    campaign_names = split_list(campaigns)
+    site_codes = split_list(sites)
+
+    async def build():
+        return await crud.run(
+            db,
+            analytics.demographic_profile,
+            weight=weight,
+            campaign_names=campaign_names,
+            site_codes=site_codes,
+            tipo_campania=normalized_type,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+    key = (
+        "analytics-demographics",
+        tuple(campaign_names),
+        tuple(site_codes),
+        weight,
+        normalized_type,
+        start_date.date() if start_date else None,
+        end_date.date() if end_date else None,
+    )
+    return await cached_json(request, db, key, build)
 
-    general_summary = {
-        "impactos_personas": campaign_data.get("impactos_personas"),
-        "impactos_vehiculos": campaign_data.get("impactos_vehiculos"),
-        "alcance": campaign_data.get("alcance"),
-        "frecuencia_calculada": campaign_data.get("frecuencia_calculada"),
-        "frecuencia_promedio": campaign_data.get("frecuencia_promedio"),
+def summary_payload(campaign: models.Campaign, summary) -> Dict[str, Any]:
+    """The three "Resumen" blocks, built from a ``campaign_summaries`` row."""
+    return {
+        "general_summary": {
+            "impactos_personas": campaign.impactos_personas,
+            "impactos_vehiculos": campaign.impactos_vehiculos,
+            "alcance": campaign.alcance,
+            "frecuencia_calculada": campaign.frecuencia_calculada,
+            "frecuencia_promedio": campaign.frecuencia_promedio,
+        },
+        "period_summary": {
+            "total_periodos": summary.total_periodos,
+            "impactos_personas": summary.impactos_periodo_personas,
+            "impactos_vehiculos": summary.impactos_periodo_vehiculos,
+        },
+        "site_summary": {
+            "total_sitios": summary.total_sitios,
+            "impactos_mensuales": summary.impactos_mensuales,
+            "impactos_catorcenal": summary.impactos_catorcenal,
+            "alcance_mensual_promedio": summary.alcance_mensual_promedio,
+        },
     }
 
+def detail_payload(campaign: models.Campaign, summary) -> Dict[str, Any]:
+    """``CampaignDetail`` body; periods and sites must already be loaded."""
     return {
-        **campaign_data,
-        "periods": periods,
-        "sites": sites,
-        "general_summary": general_summary,
-        "period_summary": period_summary,
-        "site_summary": site_summary,
+        **campaign_row(campaign),
+        "periods": period_row.many(campaign.periods),
+        "sites": site_row.many(campaign.sites),
+        **summary_payload(campaign, summary),
     }
+
+# selectinload sends up to 500 keys per IN, so this keeps a batch at three queries
+MAX_DETAIL_IDS = 500
+
+async def campaign_details_response(request: Request, db: DbSession, campaign_ids: List[str]) -> Response:
+    names = list(dict.fromkeys(name.strip() for name in campaign_ids if name.strip()))
+    if not names:
+        raise HTTPException(status_code=400, detail="ids debe incluir al menos una campaña")
+    if len(names) > MAX_DETAIL_IDS:
+        raise HTTPException(status_code=400, detail=f"ids admite como máximo {MAX_DETAIL_IDS} campañas")
+
+    async def build():
+        details = await crud.get_campaign_details_async(db, names)
+        found = {campaign.name for campaign, _ in details}
+        return {
+            "data": [detail_payload(campaign, summary) for campaign, summary in details],
+            "missing": [name for name in names if name not in found],
+        }
+
+    return await cached_json(request, db, ("details", tuple(names)), build)
+
+@app.get("/campaign-details", response_model=schemas.CampaignDetails)
+async def read_campaign_details(
+    request: Request,
+    ids: str = Query(..., description="Nombres de campaña separados por coma"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Get the detail payload of many campaigns in three queries.
+    """
+    return await campaign_details_response(request, db, ids.split(","))
+
+@app.post("/campaign-details", response_model=schemas.CampaignDetails)
+async def read_campaign_details_batch(
+    request: Request,
+    body: schemas.CampaignDetailsRequest,
+    db: DbSession = Depends(get_db)
+):
+    """
+    Same as ``GET /campaign-details`` for id lists too long for a URL.
+    """
+    return await campaign_details_response(request, db, body.ids)
+
+@app.get("/campaigns/{campaign_id}/summary", response_model=schemas.CampaignSummaries)
+async def read_campaign_summary(request: Request, campaign_id: str, db: DbSession = Depends(get_db)):
+    """
+    Get only the summary blocks for a campaign, without its periods and sites.
+    """
+    async def build():
+        campaign = await crud.get_campaign_async(db, campaign_id)
+        if campaign is None:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+
+        summary = await crud.get_campaign_summary_async(db, campaign_id)
+        return {"name": campaign.name, **summary_payload(campaign, summary)}
+
+    return await cached_json(request, db, ("summary", campaign_id), build)
+
+@app.get("/campaigns/{campaign_id}/hourly", response_model=Dict[str, Any])
+async def read_campaign_hourly(request: Request, campaign_id: str, db: DbSession = Depends(get_db)):
+    """
+    Get the 24-hour vehicle traffic profile of a campaign.
+    """
+    async def build():
+        if await crud.get_campaign_async(db, campaign_id) is None:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        profile = await crud.run(db, analytics.hourly_profile, campaign_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Hourly profile not found")
+        return profile
+
+    return await cached_json(request, db, ("hourly", campaign_id), build)
+
+@app.get("/campaigns/{campaign_id}/similar", response_model=Dict[str, Any])
+async def read_similar_campaigns(
+    request: Request,
+    campaign_id: str,
+    k: int = Query(10, ge=1, le=MAX_NEIGHBOURS, description="Número de campañas similares"),
+    tipo_campania: Optional[str] = Query(
+        None,
+        description="Filtra por tipo de campaña (mensual/catorcenal)"
+    ),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Get the k campaigns whose audience (NSE, age and gender shares) is most
+    similar to this campaign's, by cosine similarity.
+    """
+    normalized_type = normalize_tipo_campania(tipo_campania)
+
+    async def build():
+        similar = await crud.run(
+            db, similar_campaigns, campaign_id, k, normalized_type, request.state.data_generation
+        )
+        if similar is None:
+            if await crud.get_campaign_async(db, campaign_id) is None:
+                raise HTTPException(status_code=404, detail="Campaign not found")
+            raise HTTPException(status_code=404, detail="Audience profile not found")
+        return similar
+
+    return await cached_json(request, db, ("similar", campaign_id, k, normalized_type), build)
+
+@app.get("/campaigns/{campaign_id}", response_model=schemas.CampaignDetail)
+async def read_campaign(request: Request, campaign_id: str, db: DbSession = Depends(get_db)):
+    """
+    Get detailed information for a specific campaign with summary data.
+    """
+    async def build():
+        campaign = await crud.get_campaign_async(db, campaign_id, with_children=True)
+        if campaign is None:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+
+        summary = await crud.get_campaign_summary_async(db, campaign_id)
+        return detail_payload(campaign, summary)
+
+    return await cached_json(request, db, ("detail", campaign_id), build)
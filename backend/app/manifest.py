@@ -0,0 +1,66 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from .crud import get_meta, set_meta
+
+MANIFEST_KEY = "csv_manifest"
+
+Manifest = Dict[str, Dict[str, object]]
+
+
+def file_sha256(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def build_manifest(paths: Iterable[Path], previous: Optional[Manifest] = None) -> Manifest:
+    """Size, mtime and SHA-256 of every seed input, keyed by file name.
+
+    Files whose size and mtime match ``previous`` reuse its digest, so an
+    unchanged data directory is checked with three ``stat`` calls; a copy
+    with new mtimes (e.g. a fresh image layer) is hashed once and compared
+    by content.
+    """
+    manifest: Manifest = {}
+    for path in paths:
+        file_name = path.name
+        if not path.exists():
+            raise FileNotFoundError(f"No se encontró el archivo requerido: {path}")
+        stat = path.stat()
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        known = (previous or {}).get(file_name)
+        if known and (known.get("size"), known.get("mtime_ns")) == (entry["size"], entry["mtime_ns"]):
+            entry["sha256"] = known["sha256"]
+        else:
+            entry["sha256"] = file_sha256(path)
+        manifest[file_name] = entry
+    return manifest
+
+
+def same_contents(stored: Optional[Manifest], current: Manifest) -> bool:
+    if not stored:
+        return False
+    return all(stored.get(name, {}).get("sha256") == entry["sha256"] for name, entry in current.items())
+
+
+def read_manifest(conn: Connection) -> Optional[Manifest]:
+    value = get_meta(conn, MANIFEST_KEY)
+    return json.loads(value) if value else None
+
+
+def stored_manifest(bind: Engine) -> Optional[Manifest]:
+    """The manifest of the last seed, or None on a database without one."""
+    try:
+        with bind.connect() as conn:
+            return read_manifest(conn)
+    except OperationalError:
+        return None
+
+
+def write_manifest(conn: Connection, manifest: Manifest) -> None:
+    set_meta(conn, MANIFEST_KEY, json.dumps(manifest, sort_keys=True))
@@ -0,0 +1,222 @@
+import logging
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .cache import response_cache
+
+# Statements slower than this are logged with their SQL (0 disables the log)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Request latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Statements issued by one request
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger("uvicorn.error")
+
+Labels = Tuple[str, ...]
+
+
+class RequestStats:
+    """DB work attributed to the request being served."""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set by the middleware; the threadpool and run_sync copy the context, so
+# cursor hooks on any thread see (and mutate) the same RequestStats
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # One slot per bucket plus +Inf, then the running sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            base = format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series[:-1]):
+                cumulative += count
+                le = bound if isinstance(bound, str) else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{{{base}{',' if base else ''}le=\"{le}\"}} {cumulative}")
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for labels, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{{{format_labels(self.label_names, labels)}}} {value:g}")
+        return lines
+
+
+def format_labels(names: Sequence[str], values: Labels) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+request_latency = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    ("route",),
+    QUERY_COUNT_BUCKETS,
+)
+request_db_seconds = Counter(
+    "http_request_db_seconds_total",
+    "Time spent executing SQL, by route.",
+    ("route",),
+)
+db_queries = Counter(
+    "db_queries_total",
+    "SQL statements executed, including those outside requests.",
+    ("engine",),
+)
+db_slow_queries = Counter(
+    "db_slow_queries_total",
+    "SQL statements slower than SLOW_QUERY_MS.",
+    ("engine",),
+)
+
+
+_instrumented: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def instrument_engine(bind: Engine, label: str) -> None:
+    """Time every statement on ``bind`` and attribute it to the current request."""
+    if bind in _instrumented:
+        return
+    _instrumented.add(bind)
+
+    @event.listens_for(bind, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(bind, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        db_queries.inc((label,))
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+            db_slow_queries.inc((label,))
+            logger.warning("Slow query (%.1f ms): %s %r", elapsed * 1000, statement, parameters)
+
+
+def route_label(scope) -> str:
+    """The matched route template, so path parameters don't explode cardinality."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency and DB work.
+
+    Latency is observed once the app has sent its whole body, so streamed
+    exports are timed to completion. Responses carry a ``Server-Timing``
+    header with the DB time and statement count up to the first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                timing = f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            route = route_label(scope)
+            request_latency.observe((scope["method"], route, status), time.perf_counter() - started)
+            request_queries.observe((route,), stats.queries)
+            request_db_seconds.inc((route,), stats.db_seconds)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in (request_latency, request_queries, request_db_seconds, db_queries, db_slow_queries):
+        lines.extend(metric.render())
+    cache = response_cache.stats()
+    for key in ("hits", "misses", "evictions", "invalidations"):
+        lines.append(f"# TYPE response_cache_{key}_total counter")
+        lines.append(f"response_cache_{key}_total {cache[key]}")
+    lines.append("# TYPE response_cache_entries gauge")
+    lines.append(f"response_cache_entries {cache['entries']}")
+    return "\n".join(lines) + "\n"
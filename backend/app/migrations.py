@@ -0,0 +1,80 @@
+import hashlib
+from typing import Dict, Optional
+
+from sqlalchemy import exists, inspect, select, text
+from sqlalchemy.engine import Dialect, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from . import models
+from .analytics import ensure_period_month_keys
+from .crud import get_meta, refresh_campaign_facets, set_meta
+from .database import Base
+from .search import SEARCH_INDEX_DDL, ensure_search_index
+from .similarity import refresh_audience_vectors
+
+SCHEMA_KEY = "schema_fingerprint"
+
+
+_fingerprints: Dict[str, str] = {}
+
+
+def schema_fingerprint(bind: Engine) -> str:
+    """Digest of the DDL the models (and the search index) would emit."""
+    dialect = bind.dialect
+    if dialect.name not in _fingerprints:
+        _fingerprints[dialect.name] = _ddl_digest(dialect)
+    return _fingerprints[dialect.name]
+
+
+def _ddl_digest(dialect: Dialect) -> str:
+    statements = [SEARCH_INDEX_DDL]
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            statements.append(str(CreateIndex(index).compile(dialect=dialect)))
+    return hashlib.sha256("\n".join(statements).encode()).hexdigest()
+
+
+def stored_fingerprint(bind: Engine) -> Optional[str]:
+    try:
+        with bind.connect() as conn:
+            return get_meta(conn, SCHEMA_KEY)
+    except OperationalError:
+        # No dataset_meta table: a new or pre-migration database
+        return None
+
+
+def upgrade_schema(bind: Engine) -> None:
+    """Bring an existing database up to the current models.
+
+    Only additive changes are applied: missing tables, nullable columns and
+    indexes declared on the models, and the facet table, search index,
+    period month keys and campaign audience vectors are filled if they are
+    still empty. The schema fingerprint stored in
+    ``dataset_meta`` makes the up-to-date case a single query, so it is safe
+    (and cheap) to run on every start.
+    """
+    fingerprint = schema_fingerprint(bind)
+    if stored_fingerprint(bind) == fingerprint:
+        return
+    Base.metadata.create_all(bind=bind)
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        # Tables derived by the seed, filled once for databases seeded before them
+        has_facets = conn.execute(select(exists().select_from(models.CampaignFacet))).scalar()
+        if not has_facets and conn.execute(select(exists().select_from(models.CampaignSite))).scalar():
+            refresh_campaign_facets(conn)
+        ensure_period_month_keys(conn)
+        refresh_audience_vectors(conn)
+        if bind.dialect.name == "sqlite":
+            ensure_search_index(conn)
+        set_meta(conn, SCHEMA_KEY, fingerprint)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Float, Integer, Date, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, String, Float, Integer, Date, ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import deferred, relationship
 from .database import Base
 
 class Campaign(Base):
@@ -37,9 +37,28 @@ class Campaign(Base):
     hombres = Column(Float)
     mujeres = Column(Float)
 
-    # Relationships
-    periods = relationship("CampaignPeriod", back_populates="campaign")
-    sites = relationship("CampaignSite", back_populates="campaign")
+    # Vehicle counts for hours 00..23 packed as 24 little-endian int32
+    # (96 bytes); never loaded with the row, see app.analytics.unpack_hourly
+    hourly_vehicle_counts = deferred(Column(LargeBinary), raiseload=True)
+
+    # The nse_*/edad_*/hombres/mujeres shares as one L2-normalized float32
+    # vector (60 bytes), loaded into app.similarity's in-memory matrix
+    audience_vector = deferred(Column(LargeBinary), raiseload=True)
+
+    # Hash of the source CSV row, used by incremental seeding
+    row_hash = Column(BigInteger)
+
+    # Relationships; never lazy-loaded, crud picks the loader strategy
+    periods = relationship("CampaignPeriod", back_populates="campaign", lazy="raise")
+    sites = relationship("CampaignSite", back_populates="campaign", lazy="raise")
+
+    __table_args__ = (
+        # Listing order (fecha_inicio DESC, name DESC) and the date-overlap
+        # search; fecha_fin is carried so the overlap filter runs on the index
+        Index("ix_campaigns_fecha_inicio_name", "fecha_inicio", "name", "fecha_fin"),
+        # Same access path restricted to one tipo_campania
+        Index("ix_campaigns_tipo_fecha_inicio_name", "tipo_campania", "fecha_inicio", "name", "fecha_fin"),
+    )
 
 class CampaignPeriod(Base):
     __tablename__ = "campaign_periods"
@@ -49,8 +68,29 @@ class CampaignPeriod(Base):
     period = Column(String)
     impactos_periodo_personas = Column(Integer)
     impactos_periodo_vehiculos = Column(Integer)
+    row_hash = Column(BigInteger)
+
+    # Calendar month of the period as yyyymm (202503), derived by the seed
+    # from ``period`` ("2025-03", or fortnight "2025-17" for catorcenal
+    # campaigns); NULL when ``period`` has neither form
+    month_key = Column(Integer)
+    # The campaign's tipo_campania, copied with month_key (whose meaning
+    # depends on it) so the filtered monthly series never joins campaigns
+    tipo_campania = Column(String)
+
+    campaign = relationship("Campaign", back_populates="periods", lazy="raise")
 
-    campaign = relationship("Campaign", back_populates="periods")
+    __table_args__ = (
+        # Natural key; target of the incremental seed's ON CONFLICT upserts
+        Index("ux_campaign_periods_campaign_period", "campaign_name", "period", unique=True),
+        # Monthly series: GROUP BY month_key in index order, without
+        # reading the table, for all campaigns or one tipo_campania
+        Index("ix_campaign_periods_month_key", "month_key", "impactos_periodo_personas", "impactos_periodo_vehiculos"),
+        Index(
+            "ix_campaign_periods_tipo_month_key",
+            "tipo_campania", "month_key", "impactos_periodo_personas", "impactos_periodo_vehiculos",
+        ),
+    )
 
 class CampaignSite(Base):
     __tablename__ = "campaign_sites"
@@ -69,4 +109,55 @@ class CampaignSite(Base):
     impactos_mensuales = Column(Integer)
     alcance_mensual = Column(Float)
 
-    campaign = relationship("Campaign", back_populates="sites")
+    # Site audience shares packed as 15 little-endian float32 in the order
+    # of app.analytics.DEMOGRAPHIC_FIELDS (NSE, age buckets, gender)
+    demographics = deferred(Column(LargeBinary), raiseload=True)
+
+    row_hash = Column(BigInteger)
+
+    campaign = relationship("Campaign", back_populates="sites", lazy="raise")
+
+    __table_args__ = (
+        # Natural key; target of the incremental seed's ON CONFLICT upserts
+        Index("ux_campaign_sites_campaign_codigo", "campaign_name", "codigo_del_sitio", unique=True),
+    )
+
+class CampaignSummary(Base):
+    """Per-campaign rollups of periods and sites, refreshed by the seed."""
+
+    __tablename__ = "campaign_summaries"
+
+    campaign_name = Column(String, ForeignKey("campaigns.name"), primary_key=True)
+    total_periodos = Column(Integer)
+    impactos_periodo_personas = Column(Integer)
+    impactos_periodo_vehiculos = Column(Integer)
+    total_sitios = Column(Integer)
+    impactos_mensuales = Column(Integer)
+    impactos_catorcenal = Column(Integer)
+    alcance_mensual_promedio = Column(Float)
+
+class CampaignFacet(Base):
+    """Distinct site attribute values of each campaign, refreshed by the seed.
+
+    Facet counts group this table instead of ``campaign_sites``: a campaign
+    contributes one row per value however many of its sites share it.
+    """
+
+    __tablename__ = "campaign_facets"
+
+    facet = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    campaign_name = Column(String, ForeignKey("campaigns.name"), primary_key=True)
+
+    __table_args__ = (
+        # Filtered facets walk the matching campaigns and look up their values
+        Index("ix_campaign_facets_campaign_facet", "campaign_name", "facet", "value"),
+    )
+
+class DatasetMeta(Base):
+    """Key/value facts about the loaded dataset (e.g. its generation)."""
+
+    __tablename__ = "dataset_meta"
+
+    key = Column(String, primary_key=True)
+    value = Column(String)
@@ -0,0 +1,191 @@
+import os
+import subprocess
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy.engine import Engine
+
+from .database import engine
+
+try:
+    import fcntl
+except ImportError:  # not POSIX
+    fcntl = None
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Token the /admin endpoints require in X-Admin-Token; unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Added to the worker's nice value so, on a busy host, the API's request
+# threads win the CPU over parsing and indexing the new data
+REFRESH_NICENESS = int(os.getenv("REFRESH_NICENESS", "10"))
+
+REFRESH_COMMAND = (sys.executable, "seed.py", "--refresh")
+
+# Descriptor of the refresh lock a worker hands to its seed process, which
+# then runs under the lock its parent took instead of taking a new one
+LOCK_FD_ENV = "REFRESH_LOCK_FD"
+
+# Last lines of the worker's output kept for the status endpoint
+OUTPUT_LINES = 20
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _lower_priority() -> None:
+    os.nice(REFRESH_NICENESS)
+
+
+class RefreshInProgress(RuntimeError):
+    pass
+
+
+def lock_path(bind: Engine) -> Path:
+    """Lock file shared by every process that may refresh ``bind``'s database."""
+    target = bind.url.database
+    if bind.dialect.name != "sqlite" or not target or target == ":memory:":
+        raise ValueError("el refresco requiere una base de datos SQLite en archivo")
+    return Path(f"{target}.refresh.lock")
+
+
+def try_lock(path: Path) -> Optional[int]:
+    """Take the ``flock`` on ``path`` without waiting; its descriptor, or None if held.
+
+    The lock belongs to the open file, so it is released when the last
+    descriptor sharing it is closed, including when its process dies.
+    """
+    if fcntl is None:
+        raise RuntimeError("el refresco requiere fcntl (POSIX)")
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _inherited_lock(path: Path) -> Optional[int]:
+    raw = os.environ.pop(LOCK_FD_ENV, None)
+    if raw is None:
+        return None
+    fd = int(raw)
+    held, expected = os.fstat(fd), os.stat(path)
+    if (held.st_dev, held.st_ino) != (expected.st_dev, expected.st_ino):
+        raise RuntimeError(f"{LOCK_FD_ENV} no apunta a {path}")
+    # Same open file as the parent's lock: succeeds only if that lock is held
+    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    return fd
+
+
+@contextmanager
+def refresh_lock(path: Path) -> Iterator[None]:
+    """Hold the cross-process refresh lock; RefreshInProgress if another holder has it."""
+    fd = _inherited_lock(path)
+    if fd is None:
+        fd = try_lock(path)
+    if fd is None:
+        raise RefreshInProgress("ya hay un refresco en curso")
+    try:
+        yield
+    finally:
+        os.close(fd)
+
+
+class RefreshWorker:
+    """Runs ``seed.py --refresh`` in a background process, one at a time.
+
+    A separate process keeps pandas and the inserts off the API's GIL; the
+    seed swaps the new data in with a single transaction and bumps the data
+    generation, which is what invalidates the API's in-process caches.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str] = REFRESH_COMMAND,
+        cwd: Path = BASE_DIR,
+        lock: Optional[Path] = None,
+    ):
+        self.command = list(command)
+        self.cwd = cwd
+        self.lock = lock
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._output: Deque[str] = deque(maxlen=OUTPUT_LINES)
+        self.state = "idle"
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.returncode: Optional[int] = None
+
+    def start(self) -> bool:
+        """Launch a refresh; False if one is already running in any process.
+
+        The cross-process lock is taken here and handed to the seed process,
+        so no other API worker (or CLI refresh) can start between the check
+        and the spawn; it is released when that process exits.
+        """
+        with self._lock:
+            if self.state == "running":
+                return False
+            fd = try_lock(self.lock or lock_path(engine))
+            if fd is None:
+                return False
+            self._output.clear()
+            try:
+                process = subprocess.Popen(
+                    self.command,
+                    cwd=self.cwd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    pass_fds=(fd,),
+                    env={**os.environ, LOCK_FD_ENV: str(fd)},
+                    preexec_fn=_lower_priority if REFRESH_NICENESS and os.name == "posix" else None,
+                )
+            finally:
+                os.close(fd)
+            self.state = "running"
+            self.started_at = _now()
+            self.finished_at = None
+            self.returncode = None
+            self._thread = threading.Thread(target=self._wait, args=(process,), daemon=True)
+            self._thread.start()
+        return True
+
+    def _wait(self, process: subprocess.Popen) -> None:
+        for line in process.stdout:
+            self._output.append(line.rstrip())
+        returncode = process.wait()
+        with self._lock:
+            self.returncode = returncode
+            self.state = "succeeded" if returncode == 0 else "failed"
+            self.finished_at = _now()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Block until the current refresh (if any) finishes; its exit code."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.returncode
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            output: List[str] = list(self._output)
+            return {
+                "state": self.state,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "returncode": self.returncode,
+                "output": output,
+            }
+
+
+refresh_worker = RefreshWorker()
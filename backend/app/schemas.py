@@ -54,11 +54,18 @@ class SiteSummary(BaseModel):
     impactos_catorcenal: int
     alcance_mensual_promedio: float
 
+class CampaignSummaries(BaseModel):
+    name: str
+    general_summary: GeneralSummary
+    period_summary: PeriodSummary
+    site_summary: SiteSummary
+
 class CampaignBase(BaseModel):
     name: str
     tipo_campania: str
-    fecha_inicio: date
-    fecha_fin: date
+    # Undated campaigns exist (the keyset pagination lists them last)
+    fecha_inicio: Optional[date] = None
+    fecha_fin: Optional[date] = None
     universo_zona_metro: Optional[int] = None
     impactos_personas: Optional[int] = None
     impactos_vehiculos: Optional[int] = None
@@ -96,3 +103,10 @@ class CampaignDetail(Campaign):
     model_config = {
         "from_attributes": True
     }
+
+class CampaignDetailsRequest(BaseModel):
+    ids: List[str]
+
+class CampaignDetails(BaseModel):
+    data: List[CampaignDetail]
+    missing: List[str]
@@ -0,0 +1,132 @@
+import re
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DDL, Column, MetaData, String, Table, delete, event, exists, func, insert, literal_column, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import Base
+
+SEARCH_TABLE = "search_index"
+
+# One document per campaign; site attributes are the distinct values of its
+# sites, so "campaigns with sites in Cuauhtémoc" is a single MATCH
+SEARCH_FIELDS = {
+    "name": "name",
+    "codigo": "codigos",
+    "municipio": "municipios",
+    "estado": "estados",
+    "zm": "zms",
+}
+
+# bm25 column weights, in SEARCH_FIELDS order: a hit on the campaign name
+# outranks one on a site code, which outranks one on a location
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0, 1.0, 1.0)
+
+# The FTS5 table lives outside Base.metadata (create_all can't emit virtual
+# tables); this Table only gives inserts/deletes/selects typed columns
+search_index = Table(
+    SEARCH_TABLE,
+    MetaData(),
+    *(Column(column, String) for column in SEARCH_FIELDS.values()),
+)
+
+# unicode61 folds case and accents ("cuauhtemoc" matches "Cuauhtémoc") and
+# splits site codes on "-", so "PRUEBA-MEX-05" is searched as a phrase
+SEARCH_INDEX_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    f"{', '.join(SEARCH_FIELDS.values())}, tokenize='unicode61 remove_diacritics 2')"
+)
+event.listen(Base.metadata, "after_create", DDL(SEARCH_INDEX_DDL).execute_if(dialect="sqlite"))
+event.listen(
+    Base.metadata,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLE}").execute_if(dialect="sqlite"),
+)
+
+_WORD = re.compile(r"\w")
+
+
+def document_select(campaign_names: Optional[Sequence[str]] = None):
+    """One row per campaign: its name plus its sites' distinct codes and locations."""
+    site = models.CampaignSite
+    stmt = (
+        select(
+            models.Campaign.name,
+            func.group_concat(site.codigo_del_sitio.distinct()),
+            func.group_concat(site.municipio.distinct()),
+            func.group_concat(site.estado.distinct()),
+            func.group_concat(site.zm.distinct()),
+        )
+        .outerjoin(site, site.campaign_name == models.Campaign.name)
+        .group_by(models.Campaign.name)
+    )
+    if campaign_names is not None:
+        stmt = stmt.where(models.Campaign.name.in_(campaign_names))
+    return stmt
+
+
+def refresh_search_index(conn: Connection, campaign_names: Optional[Iterable[str]] = None) -> None:
+    """Rebuild the search documents of the given campaigns (all if None)."""
+    names = None if campaign_names is None else list(campaign_names)
+    clear = delete(search_index)
+    if names is not None:
+        clear = clear.where(search_index.c.name.in_(names))
+    conn.execute(clear)
+    conn.execute(insert(search_index).from_select(list(SEARCH_FIELDS.values()), document_select(names)))
+
+
+def ensure_search_index(conn: Connection) -> None:
+    """Fill an empty index on a database seeded before it existed."""
+    empty = not conn.execute(select(exists().select_from(search_index))).scalar()
+    if empty and conn.execute(select(exists().select_from(models.Campaign))).scalar():
+        refresh_search_index(conn)
+
+
+def match_expression(query: str, field: Optional[str] = None) -> str:
+    """FTS5 query for free text: every term must match, the last one as a prefix.
+
+    Each whitespace-separated term is quoted as a phrase, so punctuation in
+    site codes never reaches the FTS5 query parser.
+    """
+    terms = [term for term in query.split() if _WORD.search(term)]
+    if not terms:
+        raise ValueError("q debe contener al menos una palabra o código")
+    if field is not None and field not in SEARCH_FIELDS:
+        raise ValueError(f"field debe ser uno de: {', '.join(SEARCH_FIELDS)}")
+    phrases = ['"' + term.replace('"', '""') + '"' for term in terms]
+    expression = " ".join(phrases) + "*"
+    if field is not None:
+        expression = f"{SEARCH_FIELDS[field]} : ({expression})"
+    return expression
+
+
+def search_campaigns(
+    db: Session,
+    query: str,
+    field: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 10,
+    tipo_campania: Optional[str] = None,
+) -> Tuple[List[models.Campaign], int]:
+    """Campaigns matching ``query``, best bm25 rank first, plus the match count."""
+    match = literal_column(SEARCH_TABLE).op("MATCH")(match_expression(query, field))
+    rank = func.bm25(literal_column(SEARCH_TABLE), *SEARCH_WEIGHTS)
+
+    hits = select(search_index.c.name).where(match)
+    if tipo_campania:
+        hits = hits.join(models.Campaign, models.Campaign.name == search_index.c.name).where(
+            models.Campaign.tipo_campania == tipo_campania
+        )
+    total = db.execute(select(func.count()).select_from(hits.subquery())).scalar_one()
+
+    page = db.execute(hits.add_columns(rank).order_by(rank, search_index.c.name).offset(skip).limit(limit))
+    names = [row.name for row in page]
+    if not names:
+        return [], total
+    campaigns = {
+        campaign.name: campaign
+        for campaign in db.query(models.Campaign).filter(models.Campaign.name.in_(names))
+    }
+    return [campaigns[name] for name in names if name in campaigns], total
@@ -0,0 +1,37 @@
+import operator
+from typing import Any, Dict, Iterable, List, Type
+
+import orjson
+from pydantic import BaseModel
+
+from . import schemas
+
+
+class RowSerializer:
+    """ORM object -> dict with the fields of a response schema.
+
+    The schema's field list is resolved once into an ``attrgetter``, so a
+    row costs one C-level call instead of a pydantic ``from_orm().dict()``
+    round trip. Values come from the database already typed, so they are
+    not validated again.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.fields = tuple(schema.model_fields)
+        self._values = operator.attrgetter(*self.fields)
+
+    def __call__(self, obj: Any) -> Dict[str, Any]:
+        return dict(zip(self.fields, self._values(obj)))
+
+    def many(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        return [dict(zip(self.fields, self._values(obj))) for obj in objs]
+
+
+campaign_row = RowSerializer(schemas.Campaign)
+period_row = RowSerializer(schemas.CampaignPeriod)
+site_row = RowSerializer(schemas.CampaignSite)
+
+
+def dumps(payload: Any) -> bytes:
+    """Compact UTF-8 JSON; dates and NumPy values are encoded natively."""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
@@ -0,0 +1,173 @@
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from . import models
+from .analytics import DEMOGRAPHIC_DTYPE, DEMOGRAPHIC_FIELDS, _pack_rows, _unpack_rows
+from .crud import get_data_generation
+
+campaign = models.Campaign
+
+# Layout of ``Campaign.audience_vector``: the campaign's own shares, in the
+# order site demographic blobs use
+AUDIENCE_FIELDS = DEMOGRAPHIC_FIELDS
+
+MAX_NEIGHBOURS = 100
+
+
+def pack_audience(shares: np.ndarray) -> List[bytes]:
+    """Pack an ``(n, 15)`` share matrix as L2-normalized float32 rows.
+
+    Normalizing once at ingest makes every cosine similarity a plain dot
+    product; an all-zero row stays zero and is left out of the index.
+    """
+    shares = np.asarray(shares, dtype=np.float64)
+    norms = np.linalg.norm(shares, axis=1, keepdims=True)
+    return _pack_rows(np.divide(shares, norms, out=np.zeros_like(shares), where=norms > 0), DEMOGRAPHIC_DTYPE)
+
+
+def unpack_audience(blobs: Sequence[bytes]) -> np.ndarray:
+    """Blobs -> ``(n, 15)`` float32 matrix of unit (or zero) rows."""
+    return _unpack_rows(blobs, DEMOGRAPHIC_DTYPE, len(AUDIENCE_FIELDS))
+
+
+def refresh_audience_vectors(conn: Connection) -> None:
+    """Compute the missing vectors of a database seeded before they existed.
+
+    Campaigns with a missing share keep a NULL vector, as the seed leaves them.
+    """
+    shares = [getattr(campaign, field) for field in AUDIENCE_FIELDS]
+    rows = conn.execute(
+        select(campaign.name, *shares)
+        .where(campaign.audience_vector.is_(None))
+        .where(*(share.is_not(None) for share in shares))
+    ).all()
+    if not rows:
+        return
+    blobs = pack_audience(np.array([row[1:] for row in rows], dtype=np.float64))
+    table = campaign.__table__
+    conn.execute(
+        update(table).where(table.c.name == bindparam("b_name")).values(audience_vector=bindparam("b_vector")),
+        [{"b_name": row.name, "b_vector": blob} for row, blob in zip(rows, blobs)],
+    )
+
+
+class Neighbour(NamedTuple):
+    name: str
+    similarity: float
+
+
+class AudienceMatrix(NamedTuple):
+    names: np.ndarray
+    tipos: np.ndarray
+    vectors: np.ndarray
+    positions: Dict[str, int]
+
+
+def load_audience_matrix(conn: Connection) -> AudienceMatrix:
+    """Every campaign with a non-zero audience vector, in name order."""
+    rows = conn.execute(
+        select(campaign.name, campaign.tipo_campania, campaign.audience_vector)
+        .where(campaign.audience_vector.is_not(None))
+        .order_by(campaign.name)
+    ).all()
+    vectors = unpack_audience([row.audience_vector for row in rows])
+    keep = np.flatnonzero(vectors.any(axis=1))
+    names = np.array([rows[i].name for i in keep], dtype=object)
+    return AudienceMatrix(
+        names=names,
+        tipos=np.array([rows[i].tipo_campania for i in keep], dtype=object),
+        vectors=np.ascontiguousarray(vectors[keep]),
+        positions={name: position for position, name in enumerate(names)},
+    )
+
+
+class AudienceIndex:
+    """In-memory matrix of every campaign's audience vector.
+
+    Loaded once per data generation (at startup, then again on the first
+    request after a seed), so a similarity query is one matrix-vector
+    product over the whole catalogue and never scans the table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (generation, matrix), published and read as one reference so a
+        # request never pairs one generation with another's matrix
+        self._loaded: Optional[Tuple[int, AudienceMatrix]] = None
+
+    def load(self, db: Session, generation: Optional[int] = None) -> AudienceMatrix:
+        """The matrix for ``generation`` (read from ``db`` if not given).
+
+        Callers that already know the request's generation pass it, so an
+        up-to-date index answers without any SQL.
+        """
+        if generation is None:
+            generation = get_data_generation(db)
+        loaded = self._loaded
+        if loaded is not None and loaded[0] == generation:
+            return loaded[1]
+        with self._lock:
+            loaded = self._loaded
+            if loaded is None or loaded[0] != generation:
+                loaded = (generation, load_audience_matrix(db.connection()))
+                self._loaded = loaded
+            return loaded[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._loaded = None
+
+
+audience_index = AudienceIndex()
+
+
+def nearest(matrix: AudienceMatrix, position: int, k: int, tipo_campania: Optional[str] = None) -> List[Neighbour]:
+    """Top-``k`` cosine neighbours of the campaign at ``position``, best first.
+
+    ``argpartition`` picks the k best in linear time; only those k are sorted.
+    """
+    scores = matrix.vectors @ matrix.vectors[position]
+    candidates = np.ones(len(scores), dtype=bool)
+    candidates[position] = False
+    if tipo_campania:
+        candidates &= matrix.tipos == tipo_campania
+    candidate_positions = np.flatnonzero(candidates)
+    k = min(k, len(candidate_positions))
+    if k == 0:
+        return []
+    candidate_scores = scores[candidate_positions]
+    if k < len(candidate_positions):
+        best = np.argpartition(-candidate_scores, k - 1)[:k]
+        candidate_positions, candidate_scores = candidate_positions[best], candidate_scores[best]
+    # Positions follow name order, so equal scores are listed by name
+    order = np.lexsort((candidate_positions, -candidate_scores))
+    return [
+        Neighbour(matrix.names[candidate_positions[i]], round(float(candidate_scores[i]), 6))
+        for i in order
+    ]
+
+
+def similar_campaigns(
+    db: Session,
+    campaign_id: str,
+    k: int = 10,
+    tipo_campania: Optional[str] = None,
+    generation: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """Campaigns whose audience is closest to ``campaign_id``'s; None if it has no vector."""
+    matrix = audience_index.load(db, generation)
+    position = matrix.positions.get(campaign_id)
+    if position is None:
+        return None
+    neighbours = nearest(matrix, position, k, tipo_campania)
+    return {
+        "name": campaign_id,
+        "k": k,
+        "campanias": len(matrix.names),
+        "data": [neighbour._asdict() for neighbour in neighbours],
+    }
@@ -0,0 +1,87 @@
+"""Site analytics benchmark: ``/analytics/sites`` rollups over 1M+ site rows.
+
+The bundled CSVs are replicated ``--scale`` times (51 sites per copy, so the
+default scale gives ~1.02M site rows). Each query runs ``--repeat`` times
+through ``app.analytics.site_rollups``; the baseline loads the same rows
+with pandas and groups them in memory::
+
+    python -m benchmarks.analytics --scale 20000 --repeat 5
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from benchmarks.ingest import BASE_DIR, write_scaled_csvs
+
+import seed  # noqa: E402
+from app import analytics, models  # noqa: E402
+
+QUERIES = {
+    "zm x tipo_de_mueble": {},
+    "estado x municipio": {"dimensions": ["estado", "municipio"]},
+    "zm, derivadas": {
+        "dimensions": ["zm"],
+        "measures": ["impactos_mensuales", "impactos_por_sitio", "frecuencia_efectiva", "participacion_impactos"],
+    },
+    "zm x tipo_de_mueble, ventana de fechas": {"start_date": "2025-01-01", "end_date": "2025-03-31"},
+}
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=20000, help="Copias de los CSV incluidos")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        write_scaled_csvs(BASE_DIR / "data", tmp_dir, args.scale)
+        bind = create_engine(f"sqlite:///{tmp_dir / 'analytics.db'}")
+        seed.load_data(bind=bind, data_dir=tmp_dir)
+
+        with Session(bind) as session:
+            site_rows = session.execute(select(func.count()).select_from(models.CampaignSite)).scalar()
+            print(f"site rows: {site_rows}")
+            print(f"{'query':<40} {'groups':>7} {'median ms':>10}")
+            for label, params in QUERIES.items():
+                result = analytics.site_rollups(session, **params)
+                elapsed = timed(lambda: analytics.site_rollups(session, **params), args.repeat)
+                print(f"{label:<40} {result['total_grupos']:>7} {elapsed:>10.1f}")
+
+            def pandas_baseline():
+                frame = pd.read_sql(
+                    "SELECT zm, tipo_de_mueble, impactos_mensuales, alcance_mensual FROM campaign_sites",
+                    session.connection(),
+                )
+                return frame.groupby(["zm", "tipo_de_mueble"]).agg(
+                    total_sitios=("impactos_mensuales", "size"),
+                    impactos_mensuales=("impactos_mensuales", "sum"),
+                    alcance_mensual_promedio=("alcance_mensual", "mean"),
+                )
+
+            profile = analytics.demographic_profile(session)
+            elapsed = timed(lambda: analytics.demographic_profile(session), args.repeat)
+            print(f"{'perfil demográfico (todos los sitios)':<40} {profile['sitios']:>7} {elapsed:>10.1f}")
+
+            baseline = timed(pandas_baseline, args.repeat)
+            print(f"{'baseline: pandas read_sql + groupby':<40} {'':>7} {baseline:>10.1f}")
+        bind.dispose()
+
+
+if __name__ == "__main__":
+    main()
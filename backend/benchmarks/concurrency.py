@@ -0,0 +1,127 @@
+"""Concurrency benchmark: API throughput with DB_MODE=sync vs DB_MODE=async.
+
+Seeds a throwaway database from the bundled CSVs (replicated ``--scale``
+times), starts one uvicorn process per mode with the response cache
+disabled, and drives list/search/detail traffic at each concurrency level::
+
+    python -m benchmarks.concurrency --levels 50 100 250 500 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks.ingest import BASE_DIR, write_scaled_csvs
+from benchmarks.server import free_port, start_server, wait_ready
+
+import seed  # noqa: E402  (benchmarks.ingest puts the backend on sys.path)
+
+MODES = ("sync", "async")
+
+
+def request_paths(campaign_names):
+    """Mixed traffic: listings, date searches and campaign details."""
+    paths = []
+    for index, name in enumerate(campaign_names):
+        paths.append(f"/campaigns/?page={index % 5 + 1}&limit=5")
+        paths.append("/campaigns/search-by-date?start_date=2024-01-01&end_date=2025-12-31&limit=5")
+        paths.append(f"/campaigns/{name}")
+    return paths
+
+
+def start_mode(mode: str, database_url: str, port: int, max_clients: int) -> subprocess.Popen:
+    env = {
+        "DB_MODE": mode,
+        "RESPONSE_CACHE_SIZE": "0",
+        # One connection per in-flight request, so pool waits do not skew the comparison
+        "DB_POOL_SIZE": "20",
+        "DB_MAX_OVERFLOW": str(max_clients),
+    }
+    return start_server(database_url, port, env=env)
+
+
+async def drive(base_url: str, paths, concurrency: int, total_requests: int) -> dict:
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for index in range(total_requests):
+        queue.put_nowait(paths[index % len(paths)])
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                path = queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "rps": total_requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def run_mode(mode: str, database_url: str, paths, levels, total_requests: int):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_mode(mode, database_url, port, max(levels))
+    try:
+        await wait_ready(base_url)
+        return [await drive(base_url, paths, level, total_requests) for level in levels]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=20, help="Copias de los CSV incluidos")
+    parser.add_argument("--levels", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--requests", type=int, default=2000, help="Peticiones por nivel")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        write_scaled_csvs(BASE_DIR / "data", tmp_dir, args.scale)
+        db_path = tmp_dir / "campaigns.db"
+        database_url = f"sqlite:///{db_path}"
+        bind = create_engine(database_url)
+        seed.load_data(bind=bind, data_dir=tmp_dir)
+        names = [f"campania_{index}_{copy}" for copy in range(args.scale) for index in range(1, 13)]
+        bind.dispose()
+        paths = request_paths(names)
+
+        print(f"{'mode':<6} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        for mode in args.modes:
+            for result in asyncio.run(run_mode(mode, database_url, paths, args.levels, args.requests)):
+                print(
+                    f"{mode:<6} {result['concurrency']:>7} {result['rps']:>8.0f} "
+                    f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>6}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Export benchmark: peak memory of the streaming export vs. row count.
+
+Each ``--scales`` value seeds a throwaway database with that many copies of
+the bundled CSVs and drains the sites export (``app.export.iter_export``),
+next to the peak of loading the same rows with ``.all()``::
+
+    python -m benchmarks.export --scales 10 100 1000
+"""
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.ingest import BASE_DIR, write_scaled_csvs
+
+import seed  # noqa: E402
+from app.crud import export_select  # noqa: E402
+from app.export import iter_export  # noqa: E402
+
+
+def measure(bind, dataset: str, export_format: str, streaming: bool) -> dict:
+    with Session(bind) as session:
+        stmt = export_select(dataset)
+        tracemalloc.start()
+        if streaming:
+            size = sum(len(chunk) for chunk in iter_export(session, stmt, export_format))
+        else:
+            size = len(session.execute(stmt).all())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"peak_mib": peak / (1024 * 1024), "size": size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--dataset", default="sites", choices=["campaigns", "periods", "sites"])
+    parser.add_argument("--format", default="ndjson", choices=["ndjson", "csv"])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'stream MiB':>11} {'.all() MiB':>11}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_dir = Path(tmp)
+            write_scaled_csvs(BASE_DIR / "data", tmp_dir, scale)
+            bind = create_engine(f"sqlite:///{tmp_dir / 'export.db'}")
+            seed.load_data(bind=bind, data_dir=tmp_dir)
+            streamed = measure(bind, args.dataset, args.format, streaming=True)
+            loaded = measure(bind, args.dataset, args.format, streaming=False)
+            bind.dispose()
+        print(
+            f"{loaded['size']:>9} {streamed['peak_mib']:>11.2f} {loaded['peak_mib']:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Deterministic synthetic dataset shaped like the bundled CSVs.
+
+Writes ``bd_campanias_agrupado.csv``, ``bd_campanias_periodos.csv`` and
+``bd_campanias_sitios.csv`` with exactly the bundled headers (column order
+included), so ``seed.load_data`` reads them unchanged. Categorical values
+(furniture types, estado/municipio/zm triples) are drawn from the bundled
+files; the same ``--seed`` always produces byte-identical files. Rows are
+generated and appended per chunk of campaigns, so 5M sites fit in memory::
+
+    python -m benchmarks.generator --campaigns 10000 --sites 5000000 --out /tmp/bench-data
+"""
+import argparse
+from datetime import date
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+SOURCE_DIR = BASE_DIR / "data"
+
+AGRUPADO = "bd_campanias_agrupado.csv"
+PERIODOS = "bd_campanias_periodos.csv"
+SITIOS = "bd_campanias_sitios.csv"
+
+NSE = ["nse_ab", "nse_c", "nse_cmas", "nse_d", "nse_dmas", "nse_e"]
+EDAD = ["edad_0a14", "edad_15a19", "edad_20a24", "edad_25a34", "edad_35a44", "edad_45a64", "edad_65mas"]
+SITE_NSE = [
+    "nivel_socioeconomico_ab",
+    "nivel_socioeconomico_c_mas",
+    "nivel_socioeconomico_c",
+    "nivel_socioeconomico_d",
+    "nivel_socioeconomico_e",
+    "nivel_socioeconomico_d_mas",
+]
+SITE_EDAD = [
+    "cero_catorce",
+    "quince_diecinueve",
+    "veinte_veinticuatro",
+    "veinticinco_treintaycuatro",
+    "treintaycinco_cuarentaycuatro",
+    "cuarentaycinco_sesentaycuatro",
+    "sesentaycinco_mas",
+]
+HOURLY = [f"hourly_vehicle_count_{hour:02d}" for hour in range(24)]
+
+# Relative traffic per hour (night trough, morning and evening peaks)
+HOURLY_SHAPE = np.array([
+    0.25, 0.2, 0.15, 0.12, 0.14, 0.2, 0.45, 0.8, 1.0, 0.95, 0.9, 0.88,
+    0.9, 0.92, 0.9, 0.88, 0.9, 0.97, 1.0, 0.85, 0.65, 0.5, 0.4, 0.3,
+])
+FIRST_DAY = date(2023, 1, 1).toordinal()
+DAYS = 3 * 365
+
+
+def source_headers() -> Dict[str, List[str]]:
+    return {
+        file_name: list(pd.read_csv(SOURCE_DIR / file_name, nrows=0).columns)
+        for file_name in (AGRUPADO, PERIODOS, SITIOS)
+    }
+
+
+def source_categories() -> Dict[str, np.ndarray]:
+    sites = pd.read_csv(SOURCE_DIR / SITIOS)
+    locations = sites[["estado", "municipio", "zm"]].drop_duplicates().to_numpy(dtype=object)
+    return {
+        "tipo_de_mueble": np.sort(sites["tipo_de_mueble"].dropna().unique().astype(object)),
+        "tipo_de_anuncio": np.sort(sites["tipo_de_anuncio"].dropna().unique().astype(object)),
+        "locations": locations,
+    }
+
+
+def shares(rng: np.random.Generator, rows: int, width: int) -> np.ndarray:
+    return rng.dirichlet(np.ones(width) * 4, size=rows)
+
+
+def iso_dates(ordinals: np.ndarray) -> np.ndarray:
+    return np.array([date.fromordinal(int(day)).isoformat() for day in ordinals], dtype=object)
+
+
+def campaign_chunk(rng: np.random.Generator, start: int, sites_per_campaign: np.ndarray, periods: int) -> pd.DataFrame:
+    rows = len(sites_per_campaign)
+    tipo = np.where(rng.random(rows) < 0.7, "mensual", "catorcenal")
+    first_day = FIRST_DAY + rng.integers(0, DAYS, rows)
+    length = np.where(tipo == "mensual", 30, 13) * periods
+    impactos_personas = rng.integers(100_000, 60_000_000, rows)
+    alcance = (impactos_personas / rng.uniform(5, 45, rows)).astype(np.int64)
+    frame = pd.DataFrame({
+        "name": [f"gen_{index:07d}" for index in range(start, start + rows)],
+        "sites": sites_per_campaign,
+        "periods": [day[:7] for day in iso_dates(first_day)],
+        "tipo_campania": tipo,
+        "fecha_inicio": iso_dates(first_day),
+        "fecha_fin": iso_dates(first_day + length),
+        "universo_zona_metro": rng.integers(500_000, 25_000_000, rows),
+        "impactos_personas": impactos_personas,
+        "impactos_vehiculos": rng.integers(50_000, 40_000_000, rows),
+        "frecuencia_calculada": np.round(impactos_personas / np.maximum(alcance, 1), 8),
+        "frecuencia_promedio": np.round(rng.uniform(5, 45, rows), 2),
+        "alcance": alcance,
+    })
+    frame[NSE] = shares(rng, rows, len(NSE))
+    frame[EDAD] = shares(rng, rows, len(EDAD))
+    hombres = rng.uniform(0.45, 0.55, rows)
+    frame["hombres"] = hombres
+    frame["mujeres"] = 1 - hombres
+    peak = rng.integers(2_000, 60_000, rows)
+    noise = rng.uniform(0.85, 1.15, (rows, len(HOURLY)))
+    frame[HOURLY] = (peak[:, None] * HOURLY_SHAPE[None, :] * noise).astype(np.int64)
+    return frame
+
+
+def period_chunk(rng: np.random.Generator, campaigns: pd.DataFrame, periods: int) -> pd.DataFrame:
+    names = np.repeat(campaigns["name"].to_numpy(), periods)
+    first = pd.to_datetime(campaigns["fecha_inicio"]).dt.to_period("M").to_numpy()
+    offsets = np.tile(np.arange(periods), len(campaigns))
+    months = [str(month + offset) for month, offset in zip(np.repeat(first, periods), offsets)]
+    vehicles = rng.integers(1_000, 20_000, len(names))
+    # The real export stores vehicle impacts as "NNNNN-MM-DD"; seed.clean_number repairs it
+    return pd.DataFrame({
+        "name": names,
+        "tipo_campania": np.repeat(campaigns["tipo_campania"].to_numpy(), periods),
+        "period": months,
+        "impactos_periodo_personas": rng.integers(100_000, 20_000_000, len(names)),
+        "impactos_periodo_vehículos": [f"{value}-06-26" for value in vehicles],
+    })
+
+
+def site_chunk(
+    rng: np.random.Generator,
+    campaigns: pd.DataFrame,
+    inventory: int,
+    categories: Dict[str, np.ndarray],
+) -> pd.DataFrame:
+    counts = campaigns["sites"].to_numpy()
+    rows = int(counts.sum())
+    # Each campaign books a run of distinct site codes from the shared inventory
+    offsets = rng.integers(0, inventory, len(campaigns))
+    position = np.arange(rows) - np.repeat(np.cumsum(counts) - counts, counts)
+    codes = (np.repeat(offsets, counts) + position) % inventory
+    locations = categories["locations"][codes % len(categories["locations"])]
+    muebles = categories["tipo_de_mueble"]
+    anuncios = categories["tipo_de_anuncio"]
+
+    frame = pd.DataFrame({
+        "codigo_del_sitio": [f"GEN-{code:07d}" for code in codes],
+        "tipo_de_mueble": muebles[codes % len(muebles)],
+        "tipo_de_anuncio": anuncios[codes % len(anuncios)],
+        "disponible": "Sí",
+        "estado": locations[:, 0],
+        "municipio": locations[:, 1],
+        "zm": locations[:, 2],
+    })
+    frame[SITE_NSE] = shares(rng, rows, len(SITE_NSE))
+    frame[SITE_EDAD] = shares(rng, rows, len(SITE_EDAD))
+    mujeres = rng.uniform(0.45, 0.55, rows)
+    frame["per_muj"] = mujeres
+    frame["per_hom"] = 1 - mujeres
+    frecuencia = rng.uniform(5, 30, rows)
+    impactos_catorcenal = rng.integers(10_000, 3_000_000, rows)
+    impactos_mensuales = impactos_catorcenal * rng.uniform(1.8, 2.3, rows)
+    alcance_mensual = impactos_mensuales / (frecuencia * 1.3)
+    frame["frecuencia_catorcenal"] = frecuencia
+    frame["frecuencia_mensual"] = frecuencia * 1.3
+    frame["exposicion_promedio_catorcenal"] = rng.uniform(5, 40, rows)
+    frame["impactos_catorcenal"] = impactos_catorcenal
+    frame["alcance_vehiculos_catorcenal"] = impactos_catorcenal / frecuencia
+    fechas_inicio = np.repeat(campaigns["fecha_inicio"].to_numpy(), counts)
+    fechas_fin = np.repeat(campaigns["fecha_fin"].to_numpy(), counts)
+    frame["id_fourteen"] = [f"{day[:4]}-{int(day[5:7]) * 2:02d}" for day in fechas_inicio]
+    frame["mes"] = [day[:7] for day in fechas_inicio]
+    frame["impactos_mensuales"] = np.round(impactos_mensuales)
+    frame["alcance_mensual"] = alcance_mensual
+    frame["impactos_mensuales_prom_min_max"] = np.round(impactos_mensuales).astype(np.int64)
+    frame["alcance_mensuales_prom_min_max"] = alcance_mensual
+    frame["name"] = np.repeat(campaigns["name"].to_numpy(), counts)
+    frame["fecha_uso_inicio"] = fechas_inicio
+    frame["fecha_uso_fin"] = fechas_fin
+    return frame
+
+
+def generate_dataset(
+    target_dir: Path,
+    campaigns: int = 1_000,
+    sites: int = 50_000,
+    periods: int = 3,
+    seed: int = 0,
+    chunk_campaigns: int = 2_000,
+) -> Dict[str, int]:
+    """Write the three CSVs to ``target_dir`` and return their row counts.
+
+    ``sites`` is spread evenly over the campaigns (the first ones get the
+    remainder).
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    headers = source_headers()
+    categories = source_categories()
+    rng = np.random.default_rng(seed)
+
+    per_campaign = np.full(campaigns, sites // campaigns, dtype=np.int64)
+    per_campaign[: sites % campaigns] += 1
+    inventory = max(int(per_campaign.max()), sites // 10, 1)
+
+    counts = {AGRUPADO: 0, PERIODOS: 0, SITIOS: 0}
+    for start in range(0, campaigns, chunk_campaigns):
+        chunk = campaign_chunk(rng, start, per_campaign[start:start + chunk_campaigns], periods)
+        frames = {
+            AGRUPADO: chunk,
+            PERIODOS: period_chunk(rng, chunk, periods),
+            SITIOS: site_chunk(rng, chunk, inventory, categories),
+        }
+        for file_name, frame in frames.items():
+            frame[headers[file_name]].to_csv(
+                target_dir / file_name, mode="a" if start else "w", header=not start, index=False
+            )
+            counts[file_name] += len(frame)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=10_000)
+    parser.add_argument("--sites", type=int, default=5_000_000)
+    parser.add_argument("--periods", type=int, default=3, help="Periodos por campaña")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador (mismo valor, mismos archivos)")
+    parser.add_argument("--out", type=Path, required=True, help="Directorio de salida")
+    args = parser.parse_args()
+
+    counts = generate_dataset(args.out, args.campaigns, args.sites, args.periods, args.seed)
+    for file_name, rows in counts.items():
+        print(f"{file_name}: {rows} filas")
+
+
+if __name__ == "__main__":
+    main()
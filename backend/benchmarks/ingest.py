@@ -0,0 +1,176 @@
+"""Ingest benchmark: rows/sec and peak memory for each ``seed`` mode.
+
+The bundled CSVs are replicated ``--scale`` times (campaign names get a
+``_<n>`` suffix so natural keys stay unique) and loaded into a throwaway
+SQLite file once per mode. ``original`` is the seed as it was before the
+ingest work (inferred ``read_csv``, per-value ``clean_number``, one ORM
+object per ``iterrows()`` row), the before of a before/after comparison;
+``orm`` and ``bulk`` are today's ``seed.load_data`` modes, which share the
+vectorized preparation and differ only in how rows are inserted::
+
+    python -m benchmarks.ingest --scale 200 --chunk-size 5000
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+import seed  # noqa: E402
+from app.models import Base, Campaign, CampaignPeriod, CampaignSite  # noqa: E402
+
+CSV_FILES = (
+    "bd_campanias_agrupado.csv",
+    "bd_campanias_periodos.csv",
+    "bd_campanias_sitios.csv",
+)
+
+MODES = ("original",) + seed.INGEST_MODES
+
+CAMPAIGN_COLUMNS = [
+    "universo_zona_metro", "impactos_personas", "impactos_vehiculos", "frecuencia_calculada",
+    "frecuencia_promedio", "alcance", "nse_ab", "nse_c", "nse_cmas", "nse_d", "nse_dmas", "nse_e",
+    "edad_0a14", "edad_15a19", "edad_20a24", "edad_25a34", "edad_35a44", "edad_45a64", "edad_65mas",
+    "hombres", "mujeres",
+]
+SITE_COLUMNS = [
+    "tipo_de_mueble", "tipo_de_anuncio", "estado", "municipio", "zm", "frecuencia_catorcenal",
+    "frecuencia_mensual", "impactos_catorcenal", "impactos_mensuales", "alcance_mensual",
+]
+
+
+def write_scaled_csvs(source_dir: Path, target_dir: Path, scale: int) -> int:
+    """Replicate every CSV ``scale`` times and return the total row count."""
+    total_rows = 0
+    for file_name in CSV_FILES:
+        frame = pd.read_csv(source_dir / file_name)
+        copies = []
+        for n in range(scale):
+            copy = frame.copy()
+            copy["name"] = copy["name"].astype(str).str.strip() + f"_{n}"
+            copies.append(copy)
+        scaled = pd.concat(copies, ignore_index=True)
+        scaled.to_csv(target_dir / file_name, index=False)
+        total_rows += len(scaled)
+    return total_rows
+
+
+def original_clean_number(x):
+    if isinstance(x, str) and "-" in x:
+        return int(x.split("-")[0])
+    return x
+
+
+def load_original(bind, data_dir: Path) -> None:
+    """The seed before the ingest work, kept verbatim apart from ``bind``/``data_dir``."""
+    Base.metadata.drop_all(bind=bind)
+    Base.metadata.create_all(bind=bind)
+    db = Session(bind=bind)
+    try:
+        df_agrupado = pd.read_csv(data_dir / "bd_campanias_agrupado.csv")
+        df_agrupado["name_norm"] = df_agrupado["name"].astype(str).str.strip().str.lower()
+        df_agrupado = df_agrupado.drop_duplicates(subset=["name_norm"]).drop(columns=["name_norm"])
+
+        df_periodos = pd.read_csv(data_dir / "bd_campanias_periodos.csv")
+        df_periodos["name_norm"] = df_periodos["name"].astype(str).str.strip().str.lower()
+        df_periodos["period_norm"] = df_periodos["period"].astype(str).str.strip().str.lower()
+        df_periodos = df_periodos.drop_duplicates(subset=["name_norm", "period_norm"]).drop(
+            columns=["name_norm", "period_norm"]
+        )
+        vehicles_col = "impactos_periodo_vehículos"
+        if vehicles_col not in df_periodos.columns:
+            vehicles_col = "impactos_periodo_vehiculos"
+        df_periodos["impactos_periodo_vehiculos"] = df_periodos[vehicles_col].apply(original_clean_number)
+
+        df_sitios = pd.read_csv(data_dir / "bd_campanias_sitios.csv")
+        df_sitios["name_norm"] = df_sitios["name"].astype(str).str.strip().str.lower()
+        df_sitios["codigo_norm"] = df_sitios["codigo_del_sitio"].astype(str).str.strip().str.lower()
+        df_sitios = df_sitios.drop_duplicates(subset=["name_norm", "codigo_norm"]).drop(
+            columns=["name_norm", "codigo_norm"]
+        )
+
+        for _, row in df_agrupado.iterrows():
+            db.add(Campaign(
+                name=str(row["name"]).strip(),
+                tipo_campania=row["tipo_campania"],
+                fecha_inicio=datetime.strptime(row["fecha_inicio"], "%Y-%m-%d").date(),
+                fecha_fin=datetime.strptime(row["fecha_fin"], "%Y-%m-%d").date(),
+                **{column: row[column] for column in CAMPAIGN_COLUMNS},
+            ))
+        db.commit()
+
+        for _, row in df_periodos.iterrows():
+            db.add(CampaignPeriod(
+                campaign_name=str(row["name"]).strip(),
+                period=str(row["period"]).strip(),
+                impactos_periodo_personas=row["impactos_periodo_personas"],
+                impactos_periodo_vehiculos=row["impactos_periodo_vehiculos"],
+            ))
+        for _, row in df_sitios.iterrows():
+            db.add(CampaignSite(
+                campaign_name=str(row["name"]).strip(),
+                codigo_del_sitio=str(row["codigo_del_sitio"]).strip(),
+                **{column: row[column] for column in SITE_COLUMNS},
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_mode(mode: str, data_dir: Path, db_path: Path, chunk_size: int) -> dict:
+    bind = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    try:
+        frames = seed.prepare_frames(data_dir)
+        rows = sum(len(frame) for frame in frames.values())
+        tracemalloc.start()
+        started = time.perf_counter()
+        if mode == "original":
+            load_original(bind, data_dir)
+        else:
+            seed.load_data(mode=mode, chunk_size=chunk_size, bind=bind, data_dir=data_dir)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        bind.dispose()
+    return {
+        "mode": mode,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else float("inf"),
+        "peak_mib": peak / (1024 * 1024),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100, help="Copias de los CSV incluidos")
+    parser.add_argument("--chunk-size", type=int, default=seed.CHUNK_SIZE)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        csv_rows = write_scaled_csvs(BASE_DIR / "data", tmp_dir, args.scale)
+        print(f"CSV rows: {csv_rows} (scale={args.scale}, chunk_size={args.chunk_size})")
+        print(f"{'mode':<8} {'rows':>10} {'seconds':>9} {'rows/sec':>12} {'peak MiB':>9}")
+        for mode in args.modes:
+            result = run_mode(mode, tmp_dir, tmp_dir / f"{mode}.db", args.chunk_size)
+            print(
+                f"{result['mode']:<8} {result['rows']:>10} {result['seconds']:>9.2f} "
+                f"{result['rows_per_sec']:>12.0f} {result['peak_mib']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
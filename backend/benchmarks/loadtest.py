@@ -0,0 +1,239 @@
+"""Load test against a real uvicorn process.
+
+Starts ``uvicorn app.main:app`` with ``--workers`` processes on a seeded
+SQLite file (an existing ``--database`` or one generated with
+``benchmarks.generator``), then drives a weighted mix of list, search and
+detail requests from an asyncio client for ``--duration`` seconds, either
+closed-loop (``--concurrency`` clients back to back) or open-loop at a fixed
+``--rps`` arrival rate. Open-loop latencies are measured from each request's
+scheduled start, so a server that falls behind shows its queueing delay.
+Reports throughput, error rates and latency histograms per request kind::
+
+    python -m benchmarks.loadtest --workers 2 --concurrency 64 --duration 30
+    python -m benchmarks.loadtest --database campaigns.db --rps 200 --mix list=6,search=2,detail=2
+    python -m benchmarks.loadtest --env DB_MODE=async --env RESPONSE_CACHE_SIZE=1024 --output run.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+import numpy as np
+
+from benchmarks.generator import BASE_DIR, generate_dataset
+from benchmarks.server import free_port, start_server, wait_ready
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+DEFAULT_MIX = "list=5,search=3,detail=2"
+
+
+def parse_mix(raw: str) -> Dict[str, float]:
+    mix = {}
+    for part in raw.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("list", "search", "detail") or not weight:
+            raise argparse.ArgumentTypeError("--mix usa el formato list=5,search=3,detail=2")
+        mix[kind] = float(weight)
+    return mix
+
+
+def request_picker(database: Path, mix: Dict[str, float], rng: random.Random) -> Callable[[], Tuple[str, str]]:
+    """``() -> (kind, path)`` drawing kinds by weight over the seeded data."""
+    with sqlite3.connect(database) as conn:
+        names = [row[0] for row in conn.execute("SELECT name FROM campaigns")]
+        first, last = conn.execute("SELECT MIN(fecha_inicio), MAX(fecha_fin) FROM campaigns").fetchone()
+    if not names:
+        raise SystemExit(f"{database} no tiene campañas")
+    first_day = date.fromisoformat(first)
+    span = max((date.fromisoformat(last) - first_day).days - 30, 1)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+
+    def pick() -> Tuple[str, str]:
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "list":
+            tipo = rng.choice(["", "&tipo_campania=mensual", "&tipo_campania=catorcenal"])
+            return kind, f"/campaigns/?page={rng.randint(1, 20)}&limit=10{tipo}"
+        if kind == "search":
+            start = first_day + timedelta(days=rng.randrange(span))
+            return kind, f"/campaigns/search-by-date?start_date={start}&end_date={start + timedelta(days=30)}&limit=10"
+        return kind, f"/campaigns/{rng.choice(names)}"
+
+    return pick
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    async def send(self, client: httpx.AsyncClient, kind: str, path: str, started: float) -> None:
+        try:
+            response = await client.get(path)
+            status = str(response.status_code)
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        self.latencies[kind].append((time.perf_counter() - started) * 1000)
+        self.statuses[kind][status] += 1
+
+
+async def closed_loop(client, pick, recorder: Recorder, concurrency: int, duration: float) -> None:
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            kind, path = pick()
+            await recorder.send(client, kind, path, time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def open_loop(client, pick, recorder: Recorder, rps: float, duration: float) -> None:
+    started = time.perf_counter()
+    tasks = []
+    for index in range(int(rps * duration)):
+        scheduled = started + index / rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        kind, path = pick()
+        tasks.append(asyncio.create_task(recorder.send(client, kind, path, scheduled)))
+    await asyncio.gather(*tasks)
+
+
+def summarize(latencies: List[float], statuses: Counter, elapsed: float) -> Dict:
+    values = np.array(latencies) if latencies else np.zeros(1)
+    total = sum(statuses.values())
+    errors = total - statuses.get("200", 0)
+    counts, _ = np.histogram(values, bins=(0, *HISTOGRAM_BUCKETS))
+    return {
+        "requests": total,
+        "rps": total / elapsed,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "statuses": dict(statuses),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p90_ms": float(np.percentile(values, 90)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+        "histogram": {
+            f"<={bound:g}ms" if bound != float("inf") else f">{HISTOGRAM_BUCKETS[-2]:g}ms": int(count)
+            for bound, count in zip(HISTOGRAM_BUCKETS, counts)
+        },
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'kind':<8} {'requests':>9} {'req/s':>8} {'errors':>7} {'p50':>8} {'p90':>8} "
+          f"{'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+    for kind, stats in report["kinds"].items():
+        print(
+            f"{kind:<8} {stats['requests']:>9} {stats['rps']:>8.1f} {stats['error_rate']:>6.1%} "
+            f"{stats['p50_ms']:>8.1f} {stats['p90_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+            f"{stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}"
+        )
+    overall = report["kinds"]["total"]
+    print(f"\nlatency histogram (total, {overall['requests']} requests):")
+    peak = max(overall["histogram"].values()) or 1
+    for bucket, count in overall["histogram"].items():
+        print(f"{bucket:>10} {count:>8} {'#' * round(40 * count / peak)}")
+    errors = {status: count for status, count in overall["statuses"].items() if status != "200"}
+    if errors:
+        print(f"errors: {errors}")
+
+
+async def run_load(args: argparse.Namespace, database: Path) -> Dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {"RESPONSE_CACHE_SIZE": "0", **dict(item.split("=", 1) for item in args.env)}
+    server = start_server(f"sqlite:///{database}", port, args.workers, env, args.server_log_level)
+    recorder = Recorder()
+    pick = request_picker(database, args.mix, random.Random(args.seed))
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    try:
+        await wait_ready(base_url)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            started = time.perf_counter()
+            if args.rps:
+                await open_loop(client, pick, recorder, args.rps, args.duration)
+            else:
+                await closed_loop(client, pick, recorder, args.concurrency, args.duration)
+            elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    all_statuses = sum(recorder.statuses.values(), Counter())
+    kinds = {kind: summarize(recorder.latencies[kind], recorder.statuses[kind], elapsed)
+             for kind in sorted(recorder.latencies)}
+    kinds["total"] = summarize(all_latencies, all_statuses, elapsed)
+    return {
+        "config": {
+            "workers": args.workers,
+            "concurrency": None if args.rps else args.concurrency,
+            "rps": args.rps,
+            "duration": args.duration,
+            "mix": args.mix,
+            "env": env,
+            "database": str(database),
+        },
+        "elapsed": elapsed,
+        "kinds": kinds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", type=Path, help="Base SQLite ya sembrada (si no, se genera una)")
+    parser.add_argument("--campaigns", type=int, default=2_000, help="Campañas a generar sin --database")
+    parser.add_argument("--sites", type=int, default=50_000, help="Sitios a generar sin --database")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos de uvicorn")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=32, help="Clientes concurrentes (lazo cerrado)")
+    load.add_argument("--rps", type=float, help="Tasa de llegada fija (lazo abierto)")
+    parser.add_argument("--duration", type=float, default=20.0, help="Segundos de carga")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Pesos, p. ej. {DEFAULT_MIX}")
+    parser.add_argument("--env", action="append", default=[], help="Variable KEY=VALUE para el servidor")
+    parser.add_argument("--server-log-level", default="warning", help="Nivel de log de uvicorn (info incluye access log)")
+    parser.add_argument("--max-connections", type=int, default=1_000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de la mezcla de peticiones")
+    parser.add_argument("--output", type=Path, help="Guarda el reporte en JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as tmp:
+        database = args.database
+        if database is None:
+            import seed
+            from sqlalchemy import create_engine
+
+            data_dir = Path(tmp) / "data"
+            generate_dataset(data_dir, args.campaigns, args.sites)
+            database = Path(tmp) / "campaigns.db"
+            bind = create_engine(f"sqlite:///{database}")
+            seed.load_data(bind=bind, data_dir=data_dir)
+            bind.dispose()
+        report = asyncio.run(run_load(args, database.resolve()))
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Serialization micro-benchmark: per-row cost of list and detail payloads.
+
+Compares the previous path (``schemas.X.from_orm(obj).dict()`` per row,
+``jsonable_encoder`` and ``json.dumps``) with ``app.serialization``
+(``attrgetter`` column maps and orjson), on ORM objects built from the
+bundled CSVs::
+
+    python -m benchmarks.serialization --repeat 200
+"""
+import argparse
+import json
+import timeit
+import warnings
+
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.ingest import BASE_DIR
+
+import seed  # noqa: E402
+from app import models, schemas  # noqa: E402
+from app.serialization import campaign_row, dumps, period_row, site_row  # noqa: E402
+
+
+def build_objects():
+    frames = seed.prepare_frames(BASE_DIR / "data")
+
+    def objects(model, frame):
+        columns = [column.name for column in model.__table__.columns if column.name in frame.columns]
+        records = frame[columns].astype(object).where(frame[columns].notna(), None).to_dict("records")
+        return [model(id=index, **record) if "id" in model.__table__.columns else model(**record)
+                for index, record in enumerate(records)]
+
+    campaigns = objects(models.Campaign, frames["campaigns"])
+    periods = objects(models.CampaignPeriod, frames["campaign_periods"])
+    sites = objects(models.CampaignSite, frames["campaign_sites"])
+    return campaigns, periods, sites
+
+
+def pydantic_path(campaigns, periods, sites):
+    payload = {
+        "list": [schemas.Campaign.from_orm(campaign).dict() for campaign in campaigns],
+        "periods": [schemas.CampaignPeriod.from_orm(period).dict() for period in periods],
+        "sites": [schemas.CampaignSite.from_orm(site).dict() for site in sites],
+    }
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(campaigns, periods, sites):
+    return dumps({
+        "list": campaign_row.many(campaigns),
+        "periods": period_row.many(periods),
+        "sites": site_row.many(sites),
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    # The baseline deliberately uses the deprecated pydantic v1 API
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    campaigns, periods, sites = build_objects()
+    payloads = {
+        "list (campaigns)": (campaigns, [], []),
+        "detail (periods + sites)": ([campaigns[0]], periods, sites),
+    }
+    print(f"{'payload':<26} {'rows':>5} {'pydantic us/row':>16} {'fast us/row':>12} {'speedup':>8}")
+    for label, (rows_c, rows_p, rows_s) in payloads.items():
+        rows = len(rows_c) + len(rows_p) + len(rows_s)
+        assert json.loads(pydantic_path(rows_c, rows_p, rows_s)) == json.loads(fast_path(rows_c, rows_p, rows_s))
+        slow = timeit.timeit(lambda: pydantic_path(rows_c, rows_p, rows_s), number=args.repeat)
+        fast = timeit.timeit(lambda: fast_path(rows_c, rows_p, rows_s), number=args.repeat)
+        per_row = lambda seconds: seconds / args.repeat / rows * 1e6  # noqa: E731
+        print(f"{label:<26} {rows:>5} {per_row(slow):>16.2f} {per_row(fast):>12.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
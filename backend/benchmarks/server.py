@@ -0,0 +1,52 @@
+"""Run the API in a real uvicorn process for the HTTP benchmarks."""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    database_url: str,
+    port: int,
+    workers: int = 1,
+    env: Optional[Dict[str, str]] = None,
+    log_level: str = "warning",
+) -> subprocess.Popen:
+    """Run uvicorn on ``port``; its own output is discarded."""
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", log_level]
+    if workers > 1:
+        command += ["--workers", str(workers)]
+    return subprocess.Popen(
+        command,
+        cwd=BASE_DIR,
+        env={**os.environ, "DATABASE_URL": database_url, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"uvicorn no respondió en {base_url}")
@@ -0,0 +1,154 @@
+"""Concurrent-read benchmark for the SQLite profiles in ``app.database``.
+
+For each profile a scaled database is seeded, then reader threads run the
+list and detail queries on a read-only pool while one writer keeps
+rewriting ``campaign_sites`` the way a seed does: one transaction of
+``--batches`` batches of ``--batch-rows`` rows, with ``--pause-ms`` of
+work between batches. Each batch dirties more pages than the writer's
+page cache holds, so under the rollback journal the writer spills them and
+keeps the exclusive lock, which readers must wait out, until it commits::
+
+    python -m benchmarks.sqlite_profile --readers 8 --seconds 10
+"""
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.ingest import BASE_DIR, write_scaled_csvs
+
+import seed  # noqa: E402  (benchmarks.ingest puts the backend on sys.path)
+from app import crud  # noqa: E402
+from app.database import apply_sqlite_profile, to_read_only_url  # noqa: E402
+
+PROFILES = ("default", "performance")
+
+
+def make_engine(url: str, profile: str, read_only: bool, pool_size: int):
+    bind = create_engine(
+        to_read_only_url(url) if read_only else url,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    apply_sqlite_profile(bind, read_only=read_only, profile=profile)
+    return bind
+
+
+# The value has to change: SQLite skips rows an UPDATE leaves identical, and
+# a transaction that dirties no page never takes the exclusive lock
+REWRITE = text(
+    "UPDATE campaign_sites SET impactos_mensuales = impactos_mensuales + 1 "
+    "WHERE id > :low AND id <= :low + :rows"
+)
+
+
+def run_profile(profile: str, data_dir: Path, db_path: Path, args: argparse.Namespace) -> dict:
+    readers, seconds = args.readers, args.seconds
+    url = f"sqlite:///{db_path}"
+    writer = make_engine(url, profile, read_only=False, pool_size=1)
+    if profile == "default":
+        with writer.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+    seed.load_data(bind=writer, data_dir=data_dir)
+    reader = make_engine(url, profile, read_only=True, pool_size=readers)
+    Session = sessionmaker(bind=reader, autoflush=False)
+    with Session() as session:
+        names = [campaign.name for campaign in crud.get_campaigns(session, limit=50)[0]]
+    with writer.connect() as conn:
+        site_rows = conn.execute(text("SELECT MAX(id) FROM campaign_sites")).scalar()
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+        cache_size = conn.exec_driver_sql("PRAGMA cache_size").scalar()
+    cache_mib = (-cache_size * 1024 if cache_size < 0 else cache_size * page_size) / (1024 * 1024)
+
+    stop = threading.Event()
+    latencies = []
+    errors = []
+    writes = 0
+
+    def read_loop(worker: int):
+        index = worker
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with Session() as session:
+                    crud.get_campaigns(session, skip=(index % 5) * 5, limit=5)
+                    crud.get_campaign(session, names[index % len(names)], with_children=True)
+                latencies.append(time.perf_counter() - started)
+            except Exception as exc:  # "database is locked" under the default profile
+                errors.append(type(exc).__name__)
+            index += 1
+
+    def write_loop():
+        nonlocal writes
+        low = 0
+        while not stop.is_set():
+            try:
+                with writer.begin() as conn:
+                    for _ in range(args.batches):
+                        conn.execute(REWRITE, {"low": low, "rows": args.batch_rows})
+                        low = (low + args.batch_rows) % site_rows
+                        time.sleep(args.pause_ms / 1000)
+                writes += 1
+            except Exception:
+                pass
+
+    threads = [threading.Thread(target=read_loop, args=(worker,)) for worker in range(readers)]
+    threads.append(threading.Thread(target=write_loop))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    reader.dispose()
+    writer.dispose()
+
+    latencies.sort()
+    return {
+        "profile": profile,
+        "db_mib": db_path.stat().st_size / (1024 * 1024),
+        "cache_mib": cache_mib,
+        "reads_per_sec": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else float("nan"),
+        "max_ms": latencies[-1] * 1000 if latencies else float("nan"),
+        "read_errors": len(errors),
+        "writes": writes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100, help="Copias de los CSV incluidos")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--batches", type=int, default=10, help="Lotes por transacción del escritor")
+    parser.add_argument("--batch-rows", type=int, default=5_000, help="Filas de campaign_sites por lote")
+    parser.add_argument("--pause-ms", type=float, default=20, help="Trabajo simulado entre lotes")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=PROFILES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        write_scaled_csvs(BASE_DIR / "data", tmp_dir, args.scale)
+        print(
+            f"{'profile':<12} {'db MiB':>7} {'cache MiB':>9} {'reads/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+            f"{'max ms':>8} {'errors':>7} {'writes':>7}"
+        )
+        for profile in args.profiles:
+            result = run_profile(profile, tmp_dir, tmp_dir / f"{profile}.db", args)
+            print(
+                f"{result['profile']:<12} {result['db_mib']:>7.0f} {result['cache_mib']:>9.1f} "
+                f"{result['reads_per_sec']:>8.0f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{result['max_ms']:>8.0f} {result['read_errors']:>7} {result['writes']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
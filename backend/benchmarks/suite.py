@@ -0,0 +1,263 @@
+"""Backend benchmark suite: seed, every ``crud`` function and every endpoint.
+
+Generates a synthetic dataset (``benchmarks.generator``) or reuses
+``--data-dir``, times ``seed.load_data`` into a fresh SQLite file, then
+samples each case until ``--iterations`` runs or ``--max-seconds`` elapse
+and reports p50/p95/p99 latency plus the traced peak memory of one extra
+run. Endpoints go through ``TestClient`` against the real app with the
+response cache disabled. Results are written as JSON; ``--compare`` prints
+the p50 ratio against an earlier results file::
+
+    python -m benchmarks.suite --campaigns 10000 --sites 5000000 --output results.json
+    python -m benchmarks.suite --campaigns 1000 --sites 50000 --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.generator import BASE_DIR, generate_dataset
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+
+def measure(fn: Callable[[], Any], iterations: int, max_seconds: float, trace_memory: bool) -> Dict[str, Any]:
+    fn()  # warm-up: first-use imports, statement compilation, page cache
+    samples: List[float] = []
+    deadline = time.perf_counter() + max_seconds
+    while len(samples) < iterations and (len(samples) < 3 or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    peak_mib = None
+    if trace_memory:
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mib = peak / (1024 * 1024)
+
+    millis = np.array(samples) * 1000
+    return {
+        "samples": len(samples),
+        "mean_ms": float(millis.mean()),
+        "p50_ms": float(np.percentile(millis, 50)),
+        "p95_ms": float(np.percentile(millis, 95)),
+        "p99_ms": float(np.percentile(millis, 99)),
+        "peak_mib": peak_mib,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args: argparse.Namespace, work_dir: Path) -> Dict[str, Any]:
+    # The app binds its engines at import time, so point it at the benchmark
+    # database before anything under app/ is imported
+    db_path = work_dir / "bench.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RESPONSE_CACHE_SIZE"] = "0"
+
+    import seed
+    from app import analytics, crud
+    from app.database import SessionLocal, engine
+    from app.export import iter_export
+    from app.search import search_campaigns
+    from app.similarity import similar_campaigns
+
+    data_dir = args.data_dir
+    if data_dir is None:
+        data_dir = work_dir / "data"
+        started = time.perf_counter()
+        rows = generate_dataset(data_dir, args.campaigns, args.sites, args.periods, args.seed)
+        print(f"generated {rows} in {time.perf_counter() - started:.1f}s")
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    seed.load_data(bind=engine, data_dir=data_dir)
+    seed_seconds = time.perf_counter() - started
+    _, seed_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    seed_result = {"seconds": seed_seconds, "peak_mib": seed_peak / (1024 * 1024)}
+    print(f"seed.load_data: {seed_seconds:.1f}s, peak {seed_result['peak_mib']:.1f} MiB")
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    session = SessionLocal()
+    campaigns, total, cursor = crud.get_campaigns(session, limit=50)
+    if cursor is None:
+        raise SystemExit("Se necesitan más de 50 campañas para medir la paginación por cursor")
+    names = [campaign.name for campaign in campaigns]
+    name = names[0]
+    deep_page = max(total // 2, 0)
+    middle = campaigns[len(campaigns) // 2]
+    start, end = middle.fecha_inicio, middle.fecha_fin
+    # The first characters of a name match most of the catalogue as a prefix:
+    # the worst case for ranking, next to a selective exact-name query
+    prefix = name[:3]
+    facets = ",".join(crud.FACET_FIELDS)
+
+    crud_cases: Dict[str, Callable[[], Any]] = {
+        "get_data_generation": lambda: crud.get_data_generation(session),
+        "get_campaigns page 1": lambda: crud.get_campaigns(session, limit=50),
+        "get_campaigns deep offset": lambda: crud.get_campaigns(session, skip=deep_page, limit=50),
+        "get_campaigns cursor, no total": lambda: crud.get_campaigns(session, limit=50, cursor=cursor,
+                                                                     include_total=False),
+        "get_campaigns tipo": lambda: crud.get_campaigns(session, limit=50, tipo_campania="catorcenal"),
+        "search_campaigns_by_date": lambda: crud.search_campaigns_by_date(session, start_date=start, end_date=end,
+                                                                          limit=50),
+        "get_facets": lambda: crud.get_facets(session, list(crud.FACET_FIELDS)),
+        "get_facets window": lambda: crud.get_facets(session, list(crud.FACET_FIELDS), start_date=start,
+                                                     end_date=end),
+        "search_campaigns name": lambda: search_campaigns(session, name),
+        "search_campaigns prefix": lambda: search_campaigns(session, prefix),
+        "get_campaign": lambda: crud.get_campaign(session, name),
+        "get_campaign with children": lambda: crud.get_campaign(session, name, with_children=True),
+        "get_campaign_summary": lambda: crud.get_campaign_summary(session, name),
+        "get_campaign_details x50": lambda: crud.get_campaign_details(session, names),
+        "export campaigns": lambda: b"".join(iter_export(session, crud.export_select("campaigns"), "ndjson")),
+        "export sites of one campaign": lambda: b"".join(
+            iter_export(session, crud.campaign_sites_select(name), "ndjson")
+        ),
+        "analytics.site_rollups": lambda: analytics.site_rollups(session),
+        "analytics.site_rollups window": lambda: analytics.site_rollups(session, start_date=start, end_date=end),
+        "analytics.hourly_rollups": lambda: analytics.hourly_rollups(session),
+        "analytics.demographic_profile x50": lambda: analytics.demographic_profile(session, campaign_names=names),
+        "analytics.period_series": lambda: analytics.period_series(session),
+        "analytics.period_series tipo": lambda: analytics.period_series(session, tipo_campania="catorcenal"),
+        "similar_campaigns": lambda: similar_campaigns(session, name),
+    }
+
+    client = TestClient(app)
+    window = f"start_date={start}&end_date={end}"
+    endpoint_cases = {
+        "/campaigns/": "/campaigns/?limit=50",
+        "/campaigns/ deep page": f"/campaigns/?limit=50&page={deep_page // 50 + 1}",
+        "/campaigns/ cursor": f"/campaigns/?limit=50&include_total=false&cursor={cursor}",
+        "/campaigns/ facets": f"/campaigns/?limit=50&facets={facets}",
+        "/campaigns/search-by-date": f"/campaigns/search-by-date?{window}&limit=50",
+        "/search name": f"/search?q={name}",
+        "/search prefix": f"/search?q={prefix}",
+        "/export/campaigns": "/export/campaigns",
+        "/export/campaigns periods csv": "/export/campaigns?dataset=periods&format=csv",
+        "/campaigns/{id}": f"/campaigns/{name}",
+        "/campaigns/{id}/summary": f"/campaigns/{name}/summary",
+        "/campaigns/{id}/hourly": f"/campaigns/{name}/hourly",
+        "/campaigns/{id}/sites/export": f"/campaigns/{name}/sites/export",
+        "/campaigns/{id}/similar": f"/campaigns/{name}/similar",
+        "/campaign-details x50": f"/campaign-details?ids={','.join(names)}",
+        "/analytics/sites": "/analytics/sites",
+        "/analytics/sites window": f"/analytics/sites?{window}",
+        "/analytics/hourly": "/analytics/hourly",
+        "/analytics/periods": "/analytics/periods",
+        "/analytics/demographics x50": f"/analytics/demographics?campaigns={','.join(names)}",
+    }
+
+    def get(url: str) -> Callable[[], Any]:
+        def call():
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code, response.text[:200])
+        return call
+
+    cases = []
+    for group, group_cases in (
+        ("crud", crud_cases),
+        ("endpoint", {label: get(url) for label, url in endpoint_cases.items()}),
+    ):
+        for label, fn in group_cases.items():
+            result = measure(fn, args.iterations, args.max_seconds, not args.no_memory)
+            cases.append({"group": group, "name": label, **result})
+            peak = "" if result["peak_mib"] is None else f" peak {result['peak_mib']:.2f} MiB"
+            print(
+                f"{group:<8} {label:<36} p50 {result['p50_ms']:9.2f}  p95 {result['p95_ms']:9.2f}  "
+                f"p99 {result['p99_ms']:9.2f} ms  (n={result['samples']}){peak}"
+            )
+    session.close()
+
+    with engine.connect() as conn:
+        counts = {
+            table: conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table}").scalar()
+            for table in ("campaigns", "campaign_periods", "campaign_sites")
+        }
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "rows": counts,
+            "generator": None if args.data_dir else {
+                "campaigns": args.campaigns, "sites": args.sites, "periods": args.periods, "seed": args.seed,
+            },
+            "iterations": args.iterations,
+            "max_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        },
+        "seed": seed_result,
+        "cases": cases,
+    }
+
+
+def compare(results: Dict[str, Any], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(case["group"], case["name"]): case for case in baseline["cases"]}
+    print(f"\ncompared with {baseline_path} ({baseline['meta'].get('git_revision')}):")
+    print(f"{'case':<46} {'before p50':>11} {'after p50':>10} {'ratio':>7}")
+    rows = [("seed", "seed.load_data", baseline["seed"]["seconds"] * 1000, results["seed"]["seconds"] * 1000)]
+    for case in results["cases"]:
+        before = previous.get((case["group"], case["name"]))
+        if before is not None:
+            rows.append((case["group"], case["name"], before["p50_ms"], case["p50_ms"]))
+    for group, label, before, after in rows:
+        print(f"{group + ' ' + label:<46} {before:>11.2f} {after:>10.2f} {after / before if before else float('nan'):>6.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=1_000)
+    parser.add_argument("--sites", type=int, default=50_000)
+    parser.add_argument("--periods", type=int, default=3, help="Periodos por campaña")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+    parser.add_argument("--data-dir", type=Path, help="Usa estos CSV en lugar de generarlos")
+    parser.add_argument("--iterations", type=int, default=30, help="Muestras máximas por caso")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="Tiempo máximo por caso (mínimo 3 muestras)")
+    parser.add_argument("--no-memory", action="store_true", help="Omite la corrida extra con tracemalloc")
+    parser.add_argument("--output", type=Path, help="Archivo JSON de resultados")
+    parser.add_argument("--compare", type=Path, help="Resultados previos contra los que comparar")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        results = run_suite(args, Path(tmp))
+
+    output = args.output or BASE_DIR / "benchmarks" / "results" / f"suite-{results['meta']['timestamp'][:19].replace(':', '')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nresults written to {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Convert the seed CSVs into typed Parquet (or Arrow IPC) files, once.
+
+Every input is parsed with its declared schema (``seed.INPUT_SCHEMAS``),
+repaired and validated; the result only holds the declared columns, so
+later seeds read it without CSV parsing, dtype inference or repairs::
+
+    python convert_inputs.py --output data/parquet
+    DATA_DIR=data/parquet python seed.py --incremental
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+import seed
+
+OUTPUT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Columns that must have a value in every row, per input
+KEY_COLUMNS = {
+    seed.AGRUPADO: ("name", "fecha_inicio", "fecha_fin"),
+    seed.PERIODOS: ("name", "period"),
+    seed.SITIOS: ("name", "codigo_del_sitio"),
+}
+DATE_COLUMNS = {seed.AGRUPADO: ("fecha_inicio", "fecha_fin")}
+
+
+def validate(stem: str, frame: pd.DataFrame) -> List[str]:
+    """Problems that would make the seed load bad or incomplete rows."""
+    problems = []
+    for column in KEY_COLUMNS[stem]:
+        missing = int(frame[column].isna().sum())
+        if missing:
+            problems.append(f"{stem}.{column}: {missing} filas sin valor")
+    for column in DATE_COLUMNS.get(stem, ()):
+        parsed = pd.to_datetime(frame[column], format="%Y-%m-%d", errors="coerce")
+        invalid = int((parsed.isna() & frame[column].notna()).sum())
+        if invalid:
+            problems.append(f"{stem}.{column}: {invalid} fechas que no son AAAA-MM-DD")
+    for column in seed.DATE_FORMATTED_COLUMNS & set(frame.columns):
+        missing = int(frame[column].isna().sum())
+        if missing:
+            problems.append(f"{stem}.{column}: {missing} valores no numéricos")
+    return problems
+
+
+def arrow_schema(stem: str, frame: pd.DataFrame):
+    import pyarrow as pa
+
+    types = {seed.INT: pa.int64(), seed.FLOAT: pa.float64(), seed.TEXT: pa.string()}
+    schema = seed.INPUT_SCHEMAS[stem]
+    return pa.schema([(name, types[schema[name]]) for name in frame.columns])
+
+
+def write_table(frame: pd.DataFrame, schema, path: Path) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+    if path.suffix == ".parquet":
+        pq.write_table(table, path, compression="zstd")
+        return
+    # Uncompressed, so the seed's memory-mapped reads are zero-copy
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def convert(data_dir: Path, output_dir: Path, output_format: str = "parquet") -> Dict[str, Path]:
+    """Write every input of ``data_dir`` to ``output_dir``; nothing if any is invalid."""
+    if output_dir.resolve() == data_dir.resolve():
+        # The seed refuses a directory holding two formats of one input
+        raise ValueError("--output debe ser un directorio distinto de los CSV de origen")
+    frames = {stem: seed.read_input(stem, data_dir) for stem in seed.INPUT_STEMS}
+    problems = [problem for stem, frame in frames.items() for problem in validate(stem, frame)]
+    if problems:
+        raise ValueError("datos inválidos:\n  " + "\n  ".join(problems))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = {}
+    for stem, frame in frames.items():
+        path = output_dir / f"{stem}{OUTPUT_FORMATS[output_format]}"
+        write_table(frame, arrow_schema(stem, frame), path)
+        written[stem] = path
+    return written
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convierte los CSV del seed a Parquet/Arrow con tipos declarados.")
+    parser.add_argument("--data-dir", type=Path, default=seed.DATA_DIR, help="Directorio con los CSV de origen")
+    parser.add_argument("--output", type=Path, required=True, help="Directorio donde se escriben los archivos")
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="parquet",
+        help="parquet: comprimido con zstd; arrow: IPC sin comprimir (lectura mapeada sin copias)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        written = convert(args.data_dir, args.output, args.format)
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+    for stem, path in written.items():
+        source = seed.input_path(stem, args.data_dir)
+        print(f"{source.name} -> {path} ({source.stat().st_size:,} -> {path.stat().st_size:,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,128 +1,907 @@
+import argparse
 import os
+import shutil
+import sys
+import time
+import traceback
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional
 
 import pandas as pd
+from sqlalchemy import Table, and_, bindparam, create_engine, delete, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
 
-from app.database import SessionLocal, engine
-from app.models import Base, Campaign, CampaignPeriod, CampaignSite
+from app.analytics import (
+    FORTNIGHT_DAYS,
+    FORTNIGHTS_PER_YEAR,
+    HOURS,
+    SITE_DEMOGRAPHICS,
+    pack_demographics,
+    pack_hourly,
+)
+from app.crud import (
+    GENERATION_KEY,
+    bump_data_generation,
+    get_meta,
+    refresh_campaign_facets,
+    refresh_campaign_summaries,
+    set_meta,
+)
+from app.database import engine
+from app.manifest import Manifest, build_manifest, read_manifest, same_contents, stored_manifest, write_manifest
+from app.migrations import SCHEMA_KEY, schema_fingerprint, upgrade_schema
+from app.models import Base, Campaign, CampaignPeriod, CampaignSite, DatasetMeta
+from app.refresh import lock_path, refresh_lock
+from app.search import SEARCH_FIELDS, SEARCH_TABLE, refresh_search_index
+from app.similarity import AUDIENCE_FIELDS, pack_audience
 
 DATA_DIR = Path(os.getenv("DATA_DIR", "data"))
+INGEST_MODE = os.getenv("SEED_MODE", "bulk")
+CHUNK_SIZE = int(os.getenv("SEED_CHUNK_SIZE", "5000"))
 
-def clean_number(x):
-    if isinstance(x, str) and '-' in x:
-        # Handle cases where numbers are formatted as dates
-        return int(x.split('-')[0])
-    return x
+# Pre-built database copied into place by --skip-if-unchanged when the
+# configured database file does not exist yet (see the Dockerfile)
+DB_SNAPSHOT = os.getenv("DB_SNAPSHOT")
 
-def read_csv(file_name: str) -> pd.DataFrame:
-    file_path = DATA_DIR / file_name
-    if not file_path.exists():
-        raise FileNotFoundError(f"No se encontró el archivo requerido: {file_path}")
-    return pd.read_csv(file_path)
+INGEST_MODES = ("bulk", "orm")
 
-def load_data():
-    # Reset schema to avoid duplicados
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    db = SessionLocal()
+# Name the refresh's side database is attached under while it is swapped in
+STAGING_SCHEMA = "staging"
 
+# Above this many touched campaigns a full summary rebuild beats a long IN list
+SUMMARY_REFRESH_LIMIT = 500
+
+CAMPAIGN_NUMERIC_COLUMNS = [
+    "universo_zona_metro",
+    "impactos_personas",
+    "impactos_vehiculos",
+    "frecuencia_calculada",
+    "frecuencia_promedio",
+    "alcance",
+    "nse_ab",
+    "nse_c",
+    "nse_cmas",
+    "nse_d",
+    "nse_dmas",
+    "nse_e",
+    "edad_0a14",
+    "edad_15a19",
+    "edad_20a24",
+    "edad_25a34",
+    "edad_35a44",
+    "edad_45a64",
+    "edad_65mas",
+    "hombres",
+    "mujeres",
+]
+
+HOURLY_COLUMNS = [f"hourly_vehicle_count_{hour:02d}" for hour in range(HOURS)]
+
+SITE_VALUE_COLUMNS = [
+    "tipo_de_mueble",
+    "tipo_de_anuncio",
+    "estado",
+    "municipio",
+    "zm",
+    "frecuencia_catorcenal",
+    "frecuencia_mensual",
+    "impactos_catorcenal",
+    "impactos_mensuales",
+    "alcance_mensual",
+]
+
+# Seed inputs by stem; each may be a CSV or (see INPUT_FORMATS) a Parquet or
+# Arrow IPC file, e.g. the output of convert_inputs.py
+AGRUPADO = "bd_campanias_agrupado"
+PERIODOS = "bd_campanias_periodos"
+SITIOS = "bd_campanias_sitios"
+INPUT_STEMS = (AGRUPADO, PERIODOS, SITIOS)
+
+# Accepted file formats; a data directory holds exactly one per input
+INPUT_FORMATS = (".parquet", ".arrow", ".feather", ".csv")
+
+INT = "Int64"
+FLOAT = "float64"
+TEXT = "str"
+
+# Declared columns and dtypes of each input, in their clean form (the one
+# convert_inputs.py writes). Only these columns are ever read; every other
+# column of the exports is skipped by the parser.
+INPUT_SCHEMAS: Dict[str, Dict[str, str]] = {
+    AGRUPADO: {
+        "name": TEXT,
+        "tipo_campania": TEXT,
+        "fecha_inicio": TEXT,
+        "fecha_fin": TEXT,
+        **{
+            column: INT if column in ("universo_zona_metro", "impactos_personas", "impactos_vehiculos", "alcance")
+            else FLOAT
+            for column in CAMPAIGN_NUMERIC_COLUMNS
+        },
+        **{column: INT for column in HOURLY_COLUMNS},
+    },
+    PERIODOS: {
+        "name": TEXT,
+        "period": TEXT,
+        "impactos_periodo_personas": INT,
+        "impactos_periodo_vehiculos": INT,
+    },
+    SITIOS: {
+        "name": TEXT,
+        "codigo_del_sitio": TEXT,
+        "tipo_de_mueble": TEXT,
+        "tipo_de_anuncio": TEXT,
+        "estado": TEXT,
+        "municipio": TEXT,
+        "zm": TEXT,
+        "frecuencia_catorcenal": FLOAT,
+        "frecuencia_mensual": FLOAT,
+        "impactos_catorcenal": INT,
+        "impactos_mensuales": INT,
+        "alcance_mensual": FLOAT,
+        **{column: FLOAT for column in SITE_DEMOGRAPHICS},
+    },
+}
+
+# Columns pack_columns() can do without
+OPTIONAL_COLUMNS = set(HOURLY_COLUMNS) | set(SITE_DEMOGRAPHICS)
+
+# Export spellings of declared columns
+COLUMN_ALIASES = {"impactos_periodo_vehículos": "impactos_periodo_vehiculos"}
+
+# Columns the CSV exports format as dates ("14566-06-26"); parsed as text
+# and repaired by clean_number()
+DATE_FORMATTED_COLUMNS = {"impactos_periodo_vehiculos"}
+
+MODELS = {
+    Campaign.__tablename__: Campaign,
+    CampaignPeriod.__tablename__: CampaignPeriod,
+    CampaignSite.__tablename__: CampaignSite,
+}
+
+NATURAL_KEYS = {
+    Campaign.__tablename__: ["name"],
+    CampaignPeriod.__tablename__: ["campaign_name", "period"],
+    CampaignSite.__tablename__: ["campaign_name", "codigo_del_sitio"],
+}
+
+
+Timings = Dict[str, float]
+
+
+class TableChanges(NamedTuple):
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+
+
+@contextmanager
+def timed(timings: Optional[Timings], phase: str) -> Iterator[None]:
+    """Add the wall time of the block to ``timings[phase]`` (if given)."""
+    started = time.perf_counter()
     try:
-        # Read and clean agrupado data
-        df_agrupado = read_csv('bd_campanias_agrupado.csv')
-        df_agrupado['name_norm'] = df_agrupado['name'].astype(str).str.strip().str.lower()
-        df_agrupado = df_agrupado.drop_duplicates(subset=['name_norm']).drop(columns=['name_norm'])
-
-        # Read and clean periodos data
-        df_periodos = read_csv('bd_campanias_periodos.csv')
-        df_periodos['name_norm'] = df_periodos['name'].astype(str).str.strip().str.lower()
-        df_periodos['period_norm'] = df_periodos['period'].astype(str).str.strip().str.lower()
-        df_periodos = df_periodos.drop_duplicates(subset=['name_norm', 'period_norm']).drop(columns=['name_norm', 'period_norm'])
-        vehicles_col = 'impactos_periodo_vehículos'
-        if vehicles_col not in df_periodos.columns:
-            vehicles_col = 'impactos_periodo_vehiculos'
-        df_periodos['impactos_periodo_vehiculos'] = df_periodos[vehicles_col].apply(clean_number)
-
-        # Read and clean sitios data
-        df_sitios = read_csv('bd_campanias_sitios.csv')
-        df_sitios['name_norm'] = df_sitios['name'].astype(str).str.strip().str.lower()
-        df_sitios['codigo_norm'] = df_sitios['codigo_del_sitio'].astype(str).str.strip().str.lower()
-        df_sitios = df_sitios.drop_duplicates(subset=['name_norm', 'codigo_norm']).drop(columns=['name_norm', 'codigo_norm'])
-
-        # Process campaigns
-        for _, row in df_agrupado.iterrows():
-            name = str(row['name']).strip()
-            campaign = Campaign(
-                name=name,
-                tipo_campania=row['tipo_campania'],
-                fecha_inicio=datetime.strptime(row['fecha_inicio'], '%Y-%m-%d').date(),
-                fecha_fin=datetime.strptime(row['fecha_fin'], '%Y-%m-%d').date(),
-                universo_zona_metro=row['universo_zona_metro'],
-                impactos_personas=row['impactos_personas'],
-                impactos_vehiculos=row['impactos_vehiculos'],
-                frecuencia_calculada=row['frecuencia_calculada'],
-                frecuencia_promedio=row['frecuencia_promedio'],
-                alcance=row['alcance'],
-                nse_ab=row['nse_ab'],
-                nse_c=row['nse_c'],
-                nse_cmas=row['nse_cmas'],
-                nse_d=row['nse_d'],
-                nse_dmas=row['nse_dmas'],
-                nse_e=row['nse_e'],
-                edad_0a14=row['edad_0a14'],
-                edad_15a19=row['edad_15a19'],
-                edad_20a24=row['edad_20a24'],
-                edad_25a34=row['edad_25a34'],
-                edad_35a44=row['edad_35a44'],
-                edad_45a64=row['edad_45a64'],
-                edad_65mas=row['edad_65mas'],
-                hombres=row['hombres'],
-                mujeres=row['mujeres']
-            )
-            db.add(campaign)
-        
-        # Commit campaigns first
-        db.commit()
-
-        # Process periods
-        for _, row in df_periodos.iterrows():
-            name = str(row['name']).strip()
-            period_value = str(row['period']).strip()
-            period = CampaignPeriod(
-                campaign_name=name,
-                period=period_value,
-                impactos_periodo_personas=row['impactos_periodo_personas'],
-                impactos_periodo_vehiculos=row['impactos_periodo_vehiculos']
-            )
-            db.add(period)
-
-        # Process sites
-        for _, row in df_sitios.iterrows():
-            name = str(row['name']).strip()
-            site_code = str(row['codigo_del_sitio']).strip()
-            site = CampaignSite(
-                campaign_name=name,
-                codigo_del_sitio=site_code,
-                tipo_de_mueble=row['tipo_de_mueble'],
-                tipo_de_anuncio=row['tipo_de_anuncio'],
-                estado=row['estado'],
-                municipio=row['municipio'],
-                zm=row['zm'],
-                frecuencia_catorcenal=row['frecuencia_catorcenal'],
-                frecuencia_mensual=row['frecuencia_mensual'],
-                impactos_catorcenal=row['impactos_catorcenal'],
-                impactos_mensuales=row['impactos_mensuales'],
-                alcance_mensual=row['alcance_mensual']
-            )
-            db.add(site)
-
-        # Commit periods and sites
-        db.commit()
-    except Exception as e:
-        print(f"Error: {e}")
+        yield
+    finally:
+        if timings is not None:
+            timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - started
+
+
+def clean_number(values: pd.Series) -> pd.Series:
+    """Repair numeric columns whose values were exported as dates.
+
+    ``14566-06-26`` becomes ``14566``; the whole column is processed with
+    pandas string ops instead of a per-value ``apply``.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    leading = values.astype("string").str.split("-", n=1).str[0]
+    return pd.to_numeric(leading, errors="coerce").astype("Int64")
+
+
+def normalize_key(values: pd.Series) -> pd.Series:
+    return values.astype(str).str.strip().str.lower()
+
+
+def input_path(stem: str, data_dir: Optional[Path] = None) -> Path:
+    """The file an input is read from: its only file with one of INPUT_FORMATS.
+
+    Several formats of one input are refused rather than ranked, so a CSV
+    edited after convert_inputs.py never loses silently to a stale Parquet.
+    """
+    directory = data_dir or DATA_DIR
+    present = [directory / f"{stem}{suffix}" for suffix in INPUT_FORMATS]
+    present = [path for path in present if path.exists()]
+    if not present:
+        raise FileNotFoundError(f"No se encontró el archivo requerido: {directory / stem}.csv")
+    if len(present) > 1:
+        raise ValueError(
+            f"{stem} está en varios formatos ({', '.join(path.name for path in present)}); "
+            "deja uno solo en el directorio de datos"
+        )
+    return present[0]
+
+
+def input_paths(data_dir: Optional[Path] = None) -> List[Path]:
+    return [input_path(stem, data_dir) for stem in INPUT_STEMS]
+
+
+def read_csv(path: Path, schema: Dict[str, str]) -> pd.DataFrame:
+    """Parse only the declared columns of a CSV, with their declared dtypes.
+
+    pyarrow's multithreaded parser converts each column straight to its
+    type; without pyarrow the pandas C parser is used instead.
+    """
+    aliases = {alias: name for alias, name in COLUMN_ALIASES.items() if name in schema}
+    dtypes = {name: TEXT if name in DATE_FORMATTED_COLUMNS else dtype for name, dtype in schema.items()}
+    dtypes.update({alias: dtypes[name] for alias, name in aliases.items()})
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        # round_trip parses floats exactly as written, like pyarrow does
+        frame = pd.read_csv(
+            path, usecols=lambda column: column in dtypes, dtype=dtypes, float_precision="round_trip"
+        )
+        return frame.rename(columns=aliases)
+
+    # Exports write some integers as "2020091.0": they are parsed as decimals
+    # and cast to int64, which fails on a fractional value instead of
+    # rounding, and (unlike float64) keeps every digit of large counts
+    arrow_types = {TEXT: pa.string(), FLOAT: pa.float64(), INT: pa.decimal128(38, 9)}
+    columns = [column for column in pd.read_csv(path, nrows=0).columns if column in dtypes]
+    options = pa_csv.ConvertOptions(
+        include_columns=columns,
+        column_types={column: arrow_types[dtypes[column]] for column in columns},
+        strings_can_be_null=True,
+    )
+    table = pa_csv.read_csv(path, convert_options=options)
+    table = table.cast(pa.schema([
+        (field.name, pa.int64()) if pa.types.is_decimal(field.type) else field for field in table.schema
+    ]))
+    frame = table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get, self_destruct=True, split_blocks=True)
+    return frame.rename(columns=aliases)
+
+
+def read_arrow(path: Path, schema: Dict[str, str]) -> pd.DataFrame:
+    """Read the declared columns of a Parquet or Arrow IPC file, memory-mapped.
+
+    pyarrow is only imported here, so CSV-only deployments never load it.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(f"Leer {path.name} requiere pyarrow (pip install pyarrow)") from e
+
+    # Integers stay nullable instead of turning into float64 on a missing value
+    types_mapper = {pa.int64(): pd.Int64Dtype(), pa.int32(): pd.Int64Dtype()}.get
+    if path.suffix == ".parquet":
+        present = pq.read_schema(path, memory_map=True).names
+        columns = [name for name in present if name in schema]
+        table = pq.read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas(types_mapper=types_mapper)
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+        columns = [name for name in table.column_names if name in schema]
+        return table.select(columns).to_pandas(types_mapper=types_mapper)
+
+
+def read_input(stem: str, data_dir: Optional[Path] = None) -> pd.DataFrame:
+    """Read one input in its declared, clean form, whatever its file format.
+
+    Missing required columns or values that don't fit the declared dtype are
+    reported with the file name instead of surfacing later as bad rows.
+    """
+    path = input_path(stem, data_dir)
+    schema = INPUT_SCHEMAS[stem]
+    try:
+        frame = read_csv(path, schema) if path.suffix == ".csv" else read_arrow(path, schema)
+        missing = [name for name in schema if name not in frame.columns and name not in OPTIONAL_COLUMNS]
+        if missing:
+            raise ValueError(f"faltan columnas requeridas: {', '.join(missing)}")
+        for name in DATE_FORMATTED_COLUMNS & set(frame.columns):
+            frame[name] = clean_number(frame[name])
+        return frame.astype({name: schema[name] for name in frame.columns})
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{path.name}: {e}") from e
+
+
+def pack_columns(frame: pd.DataFrame, columns: List[str], pack) -> List[Optional[bytes]]:
+    """Pack ``columns`` of every row into one blob with ``pack``.
+
+    Rows with a missing or non-numeric value (or files without the columns)
+    get ``None`` rather than a partial vector.
+    """
+    if not set(columns).issubset(frame.columns):
+        return [None] * len(frame)
+    values = frame[columns].apply(pd.to_numeric, errors='coerce')
+    complete = values.notna().all(axis=1).to_numpy()
+    blobs = pack(values.fillna(0).to_numpy())
+    return [blob if is_complete else None for blob, is_complete in zip(blobs, complete)]
+
+
+def period_month_keys(periods: pd.Series, tipos: pd.Series) -> pd.Series:
+    """yyyymm month of each "YYYY-NN" period; the pandas twin of
+    ``app.analytics.month_key_expression`` (which backfills older databases).
+
+    NN is the month, or for catorcenal campaigns the 14-day period of the
+    year counted from January 1st. Only the distinct period strings (a few
+    hundred) are parsed.
+    """
+    codes, distinct = pd.factorize(periods)
+    distinct = pd.Series(distinct, dtype='str')
+    valid = distinct.str.fullmatch(r'\d{4}-\d{2}').fillna(False)
+    year = pd.to_numeric(distinct.str.slice(0, 4).where(valid), errors='coerce').astype('Int64')
+    number = pd.to_numeric(distinct.str.slice(5, 7).where(valid), errors='coerce').astype('Int64')
+    monthly = (year * 100 + number).where(number.between(1, 12))
+
+    jan_first = (year.fillna(1970).to_numpy(dtype='int64') - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+    offset = ((number.fillna(1) - 1) * FORTNIGHT_DAYS).to_numpy(dtype='int64').astype('timedelta64[D]')
+    months = (jan_first + offset).astype('datetime64[M]').astype('int64')
+    fortnightly = pd.Series((months // 12 + 1970) * 100 + months % 12 + 1, dtype='Int64')
+    fortnightly = fortnightly.where(number.between(1, FORTNIGHTS_PER_YEAR))
+
+    is_fortnight = tipos.eq('catorcenal').fillna(False).to_numpy(dtype=bool)
+    fortnightly, monthly = (
+        pd.Series(column.array.take(codes, allow_fill=True), index=periods.index)
+        for column in (fortnightly, monthly)
+    )
+    return fortnightly.where(is_fortnight, monthly)
+
+
+def prepare_frames(data_dir: Optional[Path] = None) -> Dict[str, pd.DataFrame]:
+    """Read the three inputs and return frames shaped like their tables.
+
+    The result is keyed by table name, in insertion order (campaigns first),
+    and every frame only carries columns that exist on the model.
+    """
+    # Read and clean agrupado data
+    df_agrupado = read_input(AGRUPADO, data_dir)
+    df_agrupado = df_agrupado.loc[~normalize_key(df_agrupado['name']).duplicated()]
+    campaigns = pd.DataFrame({
+        'name': df_agrupado['name'].astype(str).str.strip(),
+        'tipo_campania': df_agrupado['tipo_campania'],
+        'fecha_inicio': pd.to_datetime(df_agrupado['fecha_inicio'], format='%Y-%m-%d').dt.date,
+        'fecha_fin': pd.to_datetime(df_agrupado['fecha_fin'], format='%Y-%m-%d').dt.date,
+    })
+    for column in CAMPAIGN_NUMERIC_COLUMNS:
+        campaigns[column] = df_agrupado[column]
+    campaigns['hourly_vehicle_counts'] = pack_columns(df_agrupado, HOURLY_COLUMNS, pack_hourly)
+    campaigns['audience_vector'] = pack_columns(campaigns, AUDIENCE_FIELDS, pack_audience)
+
+    # Read and clean periodos data
+    df_periodos = read_input(PERIODOS, data_dir)
+    period_keys = pd.DataFrame({
+        'name': normalize_key(df_periodos['name']),
+        'period': normalize_key(df_periodos['period']),
+    })
+    df_periodos = df_periodos.loc[~period_keys.duplicated()]
+    periods = pd.DataFrame({
+        'campaign_name': df_periodos['name'].astype(str).str.strip(),
+        'period': df_periodos['period'].astype(str).str.strip(),
+        'impactos_periodo_personas': df_periodos['impactos_periodo_personas'],
+        'impactos_periodo_vehiculos': df_periodos['impactos_periodo_vehiculos'],
+    })
+    periods['tipo_campania'] = periods['campaign_name'].map(campaigns.set_index('name')['tipo_campania'])
+    periods['month_key'] = period_month_keys(periods['period'], periods['tipo_campania'])
+
+    # Read and clean sitios data
+    df_sitios = read_input(SITIOS, data_dir)
+    site_keys = pd.DataFrame({
+        'name': normalize_key(df_sitios['name']),
+        'codigo': normalize_key(df_sitios['codigo_del_sitio']),
+    })
+    df_sitios = df_sitios.loc[~site_keys.duplicated()]
+    sites = pd.DataFrame({
+        'campaign_name': df_sitios['name'].astype(str).str.strip(),
+        'codigo_del_sitio': df_sitios['codigo_del_sitio'].astype(str).str.strip(),
+    })
+    for column in SITE_VALUE_COLUMNS:
+        sites[column] = df_sitios[column]
+    sites['demographics'] = pack_columns(df_sitios, list(SITE_DEMOGRAPHICS), pack_demographics)
+
+    frames = {
+        Campaign.__tablename__: campaigns.reset_index(drop=True),
+        CampaignPeriod.__tablename__: periods.reset_index(drop=True),
+        CampaignSite.__tablename__: sites.reset_index(drop=True),
+    }
+    for frame in frames.values():
+        add_row_hash(frame)
+    return frames
+
+
+def add_row_hash(frame: pd.DataFrame) -> None:
+    """Store a 64-bit hash of every row's values in ``row_hash``."""
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    frame['row_hash'] = hashes.view('int64')
+
+
+def column_batches(frame: pd.DataFrame, chunk_size: int) -> Iterator[List[dict]]:
+    """Yield ``executemany`` parameter lists built from whole columns.
+
+    Each column is converted to Python objects once (``NaN``/``NA`` become
+    ``None``); rows are only materialized per chunk.
+    """
+    names = list(frame.columns)
+    columns = [frame[name].to_numpy(dtype=object, na_value=None) for name in names]
+    for start in range(0, len(frame), chunk_size):
+        stop = start + chunk_size
+        yield [
+            dict(zip(names, values))
+            for values in zip(*(column[start:stop] for column in columns))
+        ]
+
+
+def ingest_bulk(bind: Engine, frames: Dict[str, pd.DataFrame], chunk_size: int = CHUNK_SIZE) -> None:
+    """Write the prepared frames with chunked Core ``executemany`` inserts."""
+    with bind.begin() as conn:
+        for table_name, frame in frames.items():
+            table = Base.metadata.tables[table_name]
+            for batch in column_batches(frame, chunk_size):
+                conn.execute(insert(table), batch)
+
+
+def ingest_orm(bind: Engine, frames: Dict[str, pd.DataFrame]) -> None:
+    """One ORM object per ``iterrows()`` row of the prepared frames.
+
+    Isolates the cost of the insert strategy in ``benchmarks/ingest.py``;
+    the original seed as a whole is ``benchmarks.ingest.load_original``.
+    """
+    db = Session(bind=bind, autoflush=False)
+    try:
+        for table_name, frame in frames.items():
+            model = MODELS[table_name]
+            for _, row in frame.iterrows():
+                values = {key: (None if pd.isna(value) else value) for key, value in row.items()}
+                db.add(model(**values))
+            db.commit()
+    except Exception:
         db.rollback()
+        raise
     finally:
         db.close()
 
+
+def diff_table(conn: Connection, table_name: str, frame: pd.DataFrame):
+    """Compare ``frame`` with the stored ``(natural key, row_hash)`` pairs.
+
+    Returns the rows to upsert, the keys to delete and the change counts.
+    """
+    table = Base.metadata.tables[table_name]
+    keys = NATURAL_KEYS[table_name]
+    stored = pd.DataFrame(
+        conn.execute(select(*(table.c[key] for key in keys), table.c.row_hash)).fetchall(),
+        columns=keys + ['stored_hash'],
+    )
+    stored['stored_hash'] = stored['stored_hash'].astype('Int64')
+    stored['is_stored'] = True
+
+    current = frame[keys + ['row_hash']].merge(stored, on=keys, how='left')
+    is_new = current['is_stored'].isna()
+    is_changed = (current['row_hash'] != current['stored_hash']).fillna(True).to_numpy(dtype=bool)
+    upserts = frame.loc[is_changed]
+
+    removed = stored[keys].merge(frame[keys], on=keys, how='left', indicator=True)
+    deletes = removed.loc[removed['_merge'] == 'left_only', keys]
+
+    inserted = int(is_new.sum())
+    changes = TableChanges(
+        inserted=inserted,
+        updated=len(upserts) - inserted,
+        deleted=len(deletes),
+        unchanged=len(frame) - len(upserts),
+    )
+    return upserts, deletes, changes
+
+
+def upsert_frame(conn: Connection, table_name: str, frame: pd.DataFrame, chunk_size: int) -> None:
+    table = Base.metadata.tables[table_name]
+    keys = NATURAL_KEYS[table_name]
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={column: stmt.excluded[column] for column in frame.columns if column not in keys},
+    )
+    for batch in column_batches(frame, chunk_size):
+        conn.execute(stmt, batch)
+
+
+def delete_keys(conn: Connection, table_name: str, keys_frame: pd.DataFrame, chunk_size: int) -> None:
+    table = Base.metadata.tables[table_name]
+    keys = NATURAL_KEYS[table_name]
+    stmt = delete(table).where(and_(*(table.c[key] == bindparam(f"key_{key}") for key in keys)))
+    renamed = keys_frame.rename(columns={key: f"key_{key}" for key in keys})
+    for batch in column_batches(renamed, chunk_size):
+        conn.execute(stmt, batch)
+
+
+def ingest_incremental(
+    bind: Engine,
+    frames: Dict[str, pd.DataFrame],
+    chunk_size: int = CHUNK_SIZE,
+    manifest: Optional[Manifest] = None,
+) -> Dict[str, TableChanges]:
+    """Apply only the inserted, updated and deleted rows in one transaction.
+
+    Children are deleted before their campaigns and upserted after them so
+    the foreign keys stay valid at every step. Summaries are refreshed only
+    for the campaigns that were touched. ``manifest`` is stored in the same
+    transaction, so it always describes the CSVs the data came from.
+    """
+    summary: Dict[str, TableChanges] = {}
+    touched = set()
+    with bind.begin() as conn:
+        diffs = {name: diff_table(conn, name, frame) for name, frame in frames.items()}
+        for table_name in reversed(list(frames)):
+            _, deletes, _ = diffs[table_name]
+            delete_keys(conn, table_name, deletes, chunk_size)
+        for table_name in frames:
+            upserts, deletes, changes = diffs[table_name]
+            upsert_frame(conn, table_name, upserts, chunk_size)
+            name_column = NATURAL_KEYS[table_name][0]
+            touched.update(upserts[name_column].tolist())
+            touched.update(deletes[name_column].tolist())
+            summary[table_name] = changes
+        if touched:
+            names = None if len(touched) > SUMMARY_REFRESH_LIMIT else touched
+            refresh_campaign_summaries(conn, names)
+            refresh_campaign_facets(conn, names)
+            refresh_search_index(conn, names)
+            bump_data_generation(conn)
+        if manifest is not None:
+            write_manifest(conn, manifest)
+    return summary
+
+
+def print_changes(summary: Dict[str, TableChanges]) -> None:
+    for table_name, changes in summary.items():
+        print(
+            f"{table_name}: {changes.inserted} insertados, {changes.updated} actualizados, "
+            f"{changes.deleted} eliminados, {changes.unchanged} sin cambios"
+        )
+
+
+def print_timings(timings: Timings) -> None:
+    print("Tiempos: " + ", ".join(f"{phase} {seconds:.2f} s" for phase, seconds in timings.items()))
+
+
+def load_data(
+    mode: str = INGEST_MODE,
+    chunk_size: int = CHUNK_SIZE,
+    bind: Engine = engine,
+    data_dir: Optional[Path] = None,
+    incremental: bool = False,
+    timings: Optional[Timings] = None,
+    refresh: bool = False,
+):
+    """Seed ``bind`` from the inputs in ``data_dir``.
+
+    Errors propagate, so callers (the CLI, benchmarks, tests) never mistake
+    a failed or partial load for a finished one.
+    """
+    return _load(mode, chunk_size, bind, data_dir or DATA_DIR, incremental, timings, refresh)
+
+
+def _load(
+    mode: str,
+    chunk_size: int,
+    bind: Engine,
+    data_dir: Path,
+    incremental: bool,
+    timings: Optional[Timings],
+    refresh: bool = False,
+):
+    if mode not in INGEST_MODES:
+        raise ValueError(f"mode debe ser uno de: {', '.join(INGEST_MODES)}")
+
+    with timed(timings, "lectura"):
+        manifest = build_manifest(input_paths(data_dir), stored_manifest(bind))
+        frames = prepare_frames(data_dir)
+
+    if incremental:
+        with timed(timings, "ingesta"):
+            upgrade_schema(bind)
+            summary = ingest_incremental(bind, frames, chunk_size, manifest)
+        print_changes(summary)
+        return summary
+
+    if refresh:
+        counts = refresh_tables(bind, frames, manifest, mode, chunk_size, timings)
+        print("Refresco aplicado: " + ", ".join(f"{name} {count}" for name, count in counts.items()))
+        return counts
+
+    load_full(bind, frames, manifest, mode, chunk_size, timings)
+    return None
+
+
+def data_tables() -> List[Table]:
+    """Every table the seed fills; dataset_meta is kept across reloads."""
+    return [table for table in Base.metadata.sorted_tables if table is not DatasetMeta.__table__]
+
+
+def load_full(
+    bind: Engine,
+    frames: Dict[str, pd.DataFrame],
+    manifest: Manifest,
+    mode: str = INGEST_MODE,
+    chunk_size: int = CHUNK_SIZE,
+    timings: Optional[Timings] = None,
+) -> None:
+    """Recreate the data tables of ``bind`` from ``frames``, derived tables included."""
+    with timed(timings, "ingesta"):
+        # Reset schema to avoid duplicados; dataset_meta survives so the
+        # generation counter keeps increasing across full reloads
+        Base.metadata.drop_all(bind=bind, tables=data_tables())
+        Base.metadata.create_all(bind=bind)
+
+        if mode == "bulk":
+            ingest_bulk(bind, frames, chunk_size)
+        else:
+            ingest_orm(bind, frames)
+    with timed(timings, "derivados"), bind.begin() as conn:
+        refresh_campaign_summaries(conn)
+        refresh_campaign_facets(conn)
+        refresh_search_index(conn)
+        bump_data_generation(conn)
+        write_manifest(conn, manifest)
+        # create_all just built the current schema
+        set_meta(conn, SCHEMA_KEY, schema_fingerprint(bind))
+
+
+def staging_path(bind: Engine) -> Path:
+    """Side file a refresh seeds before swapping it into ``bind``'s database."""
+    # <db>.refresh.lock -> <db>.refresh
+    return lock_path(bind).with_suffix("")
+
+
+def table_counts(conn: Connection, schema: str = "main") -> Dict[str, int]:
+    """Row count of every data table (and the search index) in ``schema``."""
+    names = [table.name for table in data_tables()] + [SEARCH_TABLE]
+    return {name: conn.exec_driver_sql(f"SELECT COUNT(*) FROM {schema}.{name}").scalar() for name in names}
+
+
+def validate_counts(counts: Dict[str, int], frames: Dict[str, pd.DataFrame]) -> None:
+    """Reject a staged load that is empty or lost rows on the way in."""
+    problems = [
+        f"{name}: {counts[name]} filas de {len(frame)}"
+        for name, frame in frames.items()
+        if counts[name] != len(frame)
+    ]
+    if counts[SEARCH_TABLE] != counts[Campaign.__tablename__]:
+        problems.append(f"{SEARCH_TABLE}: {counts[SEARCH_TABLE]} documentos de {counts[Campaign.__tablename__]}")
+    if not counts[Campaign.__tablename__]:
+        problems.append(f"{Campaign.__tablename__}: sin filas")
+    if problems:
+        raise ValueError("carga auxiliar inválida: " + "; ".join(problems))
+
+
+def copy_rows(conn: Connection, table_name: str, columns: List[str]) -> None:
+    names = ", ".join(columns)
+    conn.exec_driver_sql(
+        f"INSERT INTO main.{table_name} ({names}) SELECT {names} FROM {STAGING_SCHEMA}.{table_name}"
+    )
+
+
+def swap_tables(bind: Engine, staged: Path) -> None:
+    """Replace every data row of ``bind`` with the staged database's, in one transaction.
+
+    Under WAL, readers that started before the commit keep seeing the old
+    rows and later ones only the new rows. The generation bump commits with
+    the rows, so in-process caches are dropped only once the swap is visible.
+    """
+    tables = data_tables()
+    with bind.connect() as conn:
+        conn.exec_driver_sql(f"ATTACH DATABASE ? AS {STAGING_SCHEMA}", (str(staged),))
+        conn.commit()
+        try:
+            with conn.begin():
+                for table in reversed(tables):
+                    conn.execute(delete(table))
+                conn.exec_driver_sql(f"DELETE FROM main.{SEARCH_TABLE}")
+                for table in tables:
+                    copy_rows(conn, table.name, list(table.columns.keys()))
+                copy_rows(conn, SEARCH_TABLE, list(SEARCH_FIELDS.values()))
+                # Manifest and schema fingerprint; the live generation keeps counting
+                for key, value in conn.exec_driver_sql(f"SELECT key, value FROM {STAGING_SCHEMA}.dataset_meta"):
+                    if key != GENERATION_KEY:
+                        set_meta(conn, key, value)
+                if table_counts(conn) != table_counts(conn, STAGING_SCHEMA):
+                    raise ValueError("el intercambio no copió todas las filas")
+                bump_data_generation(conn)
+        finally:
+            conn.exec_driver_sql(f"DETACH DATABASE {STAGING_SCHEMA}")
+            conn.commit()
+        # The swap wrote the whole dataset to the WAL; fold what readers
+        # allow back into the database file without waiting for them
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)")
+        conn.commit()
+
+
+def refresh_tables(
+    bind: Engine,
+    frames: Dict[str, pd.DataFrame],
+    manifest: Manifest,
+    mode: str = INGEST_MODE,
+    chunk_size: int = CHUNK_SIZE,
+    timings: Optional[Timings] = None,
+) -> Dict[str, int]:
+    """Reload ``bind`` without taking its tables away from the API.
+
+    The frames are seeded into a side file next to the live database and
+    checked there; only a complete load is copied over, by
+    ``swap_tables``. Returns the row counts that were swapped in.
+    """
+    staged = staging_path(bind)
+    # Held from before the side file is reset until after the swap, so
+    # concurrent refreshes (other API workers, the CLI) never share it
+    with refresh_lock(lock_path(bind)):
+        upgrade_schema(bind)
+        staged.unlink(missing_ok=True)
+        staging = create_engine(f"sqlite:///{staged}")
+        try:
+            load_full(staging, frames, manifest, mode, chunk_size, timings)
+            with timed(timings, "validación"), staging.connect() as conn:
+                counts = table_counts(conn)
+            validate_counts(counts, frames)
+            with timed(timings, "intercambio"):
+                swap_tables(bind, staged)
+        finally:
+            staging.dispose()
+            staged.unlink(missing_ok=True)
+    return counts
+
+
+def restore_snapshot(bind: Engine, snapshot: Optional[str]) -> bool:
+    """Copy ``snapshot`` to the database file of ``bind`` if it doesn't exist.
+
+    The copy goes through a temporary file and a rename, so an interrupted
+    start never leaves a truncated database behind.
+    """
+    target = bind.url.database
+    if not snapshot or not target or target == ":memory:" or os.path.exists(target):
+        return False
+    if not os.path.exists(snapshot):
+        return False
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    partial = f"{target}.partial"
+    shutil.copyfile(snapshot, partial)
+    os.replace(partial, target)
+    return True
+
+
+def seed_is_current(bind: Engine = engine, data_dir: Optional[Path] = None) -> bool:
+    """True when the database was seeded from CSVs with the current contents.
+
+    Compares the SHA-256 manifest stored by the last seed with the files in
+    ``data_dir``; unchanged size and mtime skip the hashing. A manifest that
+    only differs in size/mtime (same contents, e.g. files copied into a new
+    container) is rewritten so the next start is three ``stat`` calls again.
+    """
+    upgrade_schema(bind)
+    with bind.begin() as conn:
+        if not get_meta(conn, GENERATION_KEY):
+            return False
+        stored = read_manifest(conn)
+        current = build_manifest(input_paths(data_dir), stored)
+        if not same_contents(stored, current):
+            return False
+        if current != stored:
+            write_manifest(conn, current)
+    return True
+
+
+def build_snapshot(
+    path: Path,
+    mode: str = INGEST_MODE,
+    chunk_size: int = CHUNK_SIZE,
+    data_dir: Optional[Path] = None,
+    timings: Optional[Timings] = None,
+) -> None:
+    """Seed a fresh, compacted SQLite file at ``path`` (for baking into images).
+
+    The file is written with SQLite's default rollback journal, so the result
+    is a single self-contained file, and only renamed into place once it has
+    been vacuumed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.partial")
+    partial.unlink(missing_ok=True)
+    bind = create_engine(f"sqlite:///{partial}")
+    try:
+        _load(mode, chunk_size, bind, data_dir or DATA_DIR, False, timings)
+        with timed(timings, "vacuum"), bind.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("VACUUM")
+    finally:
+        bind.dispose()
+    os.replace(partial, path)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Carga los CSV de campañas en la base de datos.")
+    parser.add_argument(
+        "--mode",
+        choices=INGEST_MODES,
+        default=INGEST_MODE,
+        help="bulk: inserts por lotes con Core; orm: un objeto ORM por fila sobre los mismos datos preparados",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help="Filas por lote en el modo bulk",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Aplica sólo las filas insertadas, modificadas o eliminadas (upserts por llave natural)",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Carga los CSV en una base auxiliar, valida los conteos y la intercambia con la base en uso "
+        "en una sola transacción; la API sigue respondiendo durante la carga",
+    )
+    parser.add_argument(
+        "--skip-if-unchanged",
+        action="store_true",
+        help="No carga nada si los CSV coinciden con el manifiesto guardado por el último seed; "
+        "si la base no existe y DB_SNAPSHOT está definido, la copia primero",
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        metavar="RUTA",
+        help="Genera en RUTA una base SQLite nueva y compactada con los CSV (para incluirla en la imagen)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    started = time.perf_counter()
+    args = parse_args(argv)
+    timings: Timings = {}
+
+    # A non-zero exit stops start.sh before uvicorn and marks the API's
+    # refresh worker as failed
+    try:
+        run(args, timings)
+    except Exception as e:
+        traceback.print_exc()
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    timings["total"] = time.perf_counter() - started
+    print_timings(timings)
+    return 0
+
+
+def run(args: argparse.Namespace, timings: Timings) -> None:
+    if args.snapshot:
+        build_snapshot(args.snapshot, mode=args.mode, chunk_size=args.chunk_size, timings=timings)
+        print(f"Snapshot generado en {args.snapshot}")
+        return
+    if args.skip_if_unchanged:
+        with timed(timings, "snapshot"):
+            restored = restore_snapshot(engine, DB_SNAPSHOT)
+        if restored:
+            print(f"Base restaurada desde {DB_SNAPSHOT}")
+        with timed(timings, "verificación"):
+            current = seed_is_current(engine)
+        if current:
+            print("CSV sin cambios; seed omitido")
+            return
+    load_data(
+        mode=args.mode,
+        chunk_size=args.chunk_size,
+        incremental=args.incremental,
+        timings=timings,
+        refresh=args.refresh,
+    )
+
+
 if __name__ == "__main__":
-    load_data()
+    sys.exit(main())
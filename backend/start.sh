@@ -1,5 +1,5 @@
 #!/bin/sh
 set -e
 
-python seed.py
+python seed.py --incremental --skip-if-unchanged
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000
@@ -1,15 +1,19 @@
 import os
 import sys
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
+from app import metrics
+from app.cache import response_cache
+from app.similarity import audience_index
 from app.database import Base
 from app.main import app, get_db
 from app import models
@@ -18,6 +22,7 @@ SQLALCHEMY_TEST_URL = "sqlite:///./test.db"
 engine = create_engine(
     SQLALCHEMY_TEST_URL, connect_args={"check_same_thread": False}
 )
+metrics.instrument_engine(engine, "test")
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -38,6 +43,13 @@ def setup_db():
     yield
     Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    # Tests write rows directly without bumping the data generation
+    response_cache.clear()
+    audience_index.clear()
+    yield
+
 @pytest.fixture
 def db_session():
     session = TestingSessionLocal()
@@ -49,3 +61,32 @@ def db_session():
 @pytest.fixture
 def client(db_session):
     return TestClient(app)
+
+@pytest.fixture
+def sql_statements():
+    """Record every ``(statement, parameters)`` sent to the test database."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def query_budget(sql_statements):
+    """Context manager asserting a block issues at most ``max_queries`` statements."""
+    @contextmanager
+    def budget(max_queries):
+        start = len(sql_statements)
+        yield
+        used = [statement for statement, _ in sql_statements[start:]]
+        assert len(used) <= max_queries, (
+            f"expected at most {max_queries} queries, got {len(used)}:\n" + "\n".join(used)
+        )
+
+    return budget
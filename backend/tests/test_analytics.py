@@ -0,0 +1,264 @@
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import seed
+from app import analytics, models, similarity
+from test_api import seed_campaign, seed_detail
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+@pytest.fixture(scope="module")
+def seeded_session(tmp_path_factory):
+    bind = create_engine(f"sqlite:///{tmp_path_factory.mktemp('analytics') / 'analytics.db'}")
+    seed.load_data(bind=bind, data_dir=DATA_DIR)
+    with Session(bind) as session:
+        yield session
+    bind.dispose()
+
+
+def test_site_rollups_match_pandas(seeded_session: Session):
+    sites = seed.prepare_frames(DATA_DIR)["campaign_sites"]
+    expected = sites.groupby(["zm", "tipo_de_mueble"]).agg(
+        total_sitios=("codigo_del_sitio", "size"),
+        impactos_mensuales=("impactos_mensuales", "sum"),
+        alcance_mensual_promedio=("alcance_mensual", "mean"),
+    )
+
+    result = analytics.site_rollups(
+        seeded_session,
+        measures=["total_sitios", "impactos_mensuales", "alcance_mensual_promedio", "impactos_por_sitio",
+                  "participacion_impactos"],
+        sort="impactos_mensuales",
+        limit=1000,
+    )
+
+    assert result["total_grupos"] == len(expected)
+    impactos = [row["impactos_mensuales"] for row in result["data"]]
+    assert impactos == sorted(impactos, reverse=True)
+    assert sum(row["participacion_impactos"] for row in result["data"]) == pytest.approx(1, abs=1e-3)
+    for row in result["data"]:
+        group = expected.loc[(row["zm"], row["tipo_de_mueble"])]
+        assert row["total_sitios"] == group.total_sitios
+        assert row["impactos_mensuales"] == group.impactos_mensuales
+        if pd.isna(group.alcance_mensual_promedio):
+            assert row["alcance_mensual_promedio"] is None
+        else:
+            assert row["alcance_mensual_promedio"] == pytest.approx(group.alcance_mensual_promedio, abs=1e-3)
+        assert row["impactos_por_sitio"] == pytest.approx(group.impactos_mensuales / group.total_sitios, abs=1e-3)
+
+
+@pytest.fixture
+def empty_tables(db_session: Session):
+    def clear():
+        db_session.query(models.CampaignSite).delete()
+        db_session.query(models.CampaignPeriod).delete()
+        db_session.query(models.Campaign).delete()
+        db_session.commit()
+
+    clear()
+    yield
+    clear()
+
+
+def test_analytics_endpoint_filters_and_validates(client: TestClient, db_session: Session, empty_tables):
+    seed_campaign(db_session, "ana_ene", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    seed_campaign(db_session, "ana_jun", "catorcenal", date(2024, 6, 1), date(2024, 6, 14))
+    seed_detail(db_session, "ana_ene")
+    seed_detail(db_session, "ana_jun")
+
+    response = client.get("/analytics/sites?dimensions=estado,tipo_campania&measures=total_sitios,campanias")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["dimensions"] == ["estado", "tipo_campania"]
+    assert {(row["tipo_campania"], row["total_sitios"]) for row in body["data"]} == {
+        ("mensual", 1), ("catorcenal", 1)
+    }
+
+    window = client.get("/analytics/sites?dimensions=zm&start_date=2024-06-10&end_date=2024-07-01")
+    assert window.json()["data"] == [
+        {"zm": "ZM1", "total_sitios": 1, "impactos_mensuales": 240, "alcance_mensual_promedio": 500.0}
+    ]
+
+    assert client.get("/analytics/sites?dimensions=color").status_code == 400
+    assert client.get("/analytics/sites?measures=total_sitios&sort=impactos_mensuales").status_code == 400
+
+
+def test_hourly_endpoints(client: TestClient, db_session: Session, empty_tables):
+    profiles = np.array([np.arange(24), np.arange(24)[::-1] * 2])
+    blobs = analytics.pack_hourly(profiles)
+    for name, tipo, blob in (("hora_a", "mensual", blobs[0]), ("hora_b", "catorcenal", blobs[1])):
+        seed_campaign(db_session, name, tipo, date(2024, 1, 1), date(2024, 1, 31))
+        db_session.query(models.Campaign).filter_by(name=name).update({"hourly_vehicle_counts": blob})
+    seed_campaign(db_session, "hora_sin_perfil", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    db_session.commit()
+
+    single = client.get("/campaigns/hora_a/hourly").json()
+    assert single["vehicle_counts"] == list(range(24))
+    assert (single["peak_hour"], single["peak_count"], single["total"]) == (23, 23, 276)
+    assert client.get("/campaigns/hora_sin_perfil/hourly").status_code == 404
+    assert client.get("/campaigns/missing/hourly").status_code == 404
+
+    rollup = client.get("/analytics/hourly").json()
+    assert rollup["campanias"] == 2
+    assert rollup["sum"] == profiles.sum(axis=0).tolist()
+    assert rollup["mean"] == profiles.mean(axis=0).tolist()
+    assert rollup["peak_hour"] == 0
+    assert rollup["peak_hour_campaigns"][0] == 1 and rollup["peak_hour_campaigns"][23] == 1
+
+    filtered = client.get("/analytics/hourly?tipo_campania=mensual").json()
+    assert filtered["sum"] == list(range(24))
+
+
+def test_demographic_profile_is_impact_weighted(seeded_session: Session):
+    names = ["campania_10", "campania_3"]
+    source = pd.read_csv(DATA_DIR / "bd_campanias_sitios.csv")
+    chosen = (
+        source.loc[source["name"].str.strip().isin(names)]
+        .drop_duplicates(["name", "codigo_del_sitio"])
+        .dropna(subset=list(analytics.SITE_DEMOGRAPHICS))
+    )
+    vectors = chosen[list(analytics.SITE_DEMOGRAPHICS)].to_numpy(dtype=float)
+    weights = chosen["impactos_mensuales"].fillna(0).to_numpy(dtype=float)
+    expected = dict(zip(analytics.DEMOGRAPHIC_FIELDS, weights @ vectors / weights.sum()))
+
+    profile = analytics.demographic_profile(seeded_session, campaign_names=names)
+
+    assert profile["sitios"] == len(chosen)
+    assert profile["nse"]["nse_ab"] == pytest.approx(expected["nse_ab"], abs=1e-4)
+    assert profile["edad"]["edad_65mas"] == pytest.approx(expected["edad_65mas"], abs=1e-4)
+    assert profile["genero"]["mujeres"] == pytest.approx(expected["mujeres"], abs=1e-4)
+
+
+def test_demographics_endpoint(client: TestClient, db_session: Session, empty_tables):
+    seed_campaign(db_session, "demo_a", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    seed_detail(db_session, "demo_a")
+    shares = np.zeros((2, len(analytics.DEMOGRAPHIC_FIELDS)))
+    shares[0, analytics.DEMOGRAPHIC_FIELDS.index("hombres")] = 1
+    shares[1, analytics.DEMOGRAPHIC_FIELDS.index("mujeres")] = 1
+    first, second = analytics.pack_demographics(shares)
+    db_session.query(models.CampaignSite).update({"demographics": first, "impactos_mensuales": 300})
+    db_session.add(models.CampaignSite(
+        campaign_name="demo_a", codigo_del_sitio="SITE-2", impactos_mensuales=100, demographics=second
+    ))
+    db_session.commit()
+
+    weighted = client.get("/analytics/demographics?campaigns=demo_a").json()
+    assert weighted["sitios"] == 2
+    assert weighted["genero"] == {"hombres": 0.75, "mujeres": 0.25}
+
+    uniform = client.get("/analytics/demographics?sites=SITE-1,SITE-2&weight=sitios").json()
+    assert uniform["genero"] == {"hombres": 0.5, "mujeres": 0.5}
+
+    assert client.get("/analytics/demographics?weight=edad").status_code == 400
+
+
+def test_period_series_matches_pandas(seeded_session: Session):
+    frames = seed.prepare_frames(DATA_DIR)
+    periods = frames["campaign_periods"].dropna(subset=["month_key"])
+    expected = periods.groupby("month_key")["impactos_periodo_personas"].sum()
+
+    series = analytics.period_series(seeded_session)
+    by_month = {analytics.month_key(row["month"]): row for row in series["data"]}
+
+    assert {key: by_month[key]["impactos_periodo_personas"] for key in expected.index} == expected.to_dict()
+    assert all(row["periodos"] == 0 for key, row in by_month.items() if key not in expected.index)
+    assert series["data"][-1]["acumulado_personas"] == series["impactos_periodo_personas"] == expected.sum()
+    # Catorcenal fortnights are placed in the month they start in
+    assert by_month[202508]["periodos"] == (periods["month_key"] == 202508).sum()
+
+
+def test_periods_endpoint(client: TestClient, db_session: Session, empty_tables):
+    seed_campaign(db_session, "mes_a", "mensual", date(2024, 1, 1), date(2024, 4, 30))
+    seed_campaign(db_session, "cat_b", "catorcenal", date(2024, 2, 1), date(2024, 3, 31))
+    for name, period, people in (
+        ("mes_a", "2024-01", 10), ("mes_a", "2024-04", 40), ("cat_b", "2024-05", 5), ("cat_b", "2024-06", 7),
+    ):
+        db_session.add(models.CampaignPeriod(
+            campaign_name=name, period=period, impactos_periodo_personas=people, impactos_periodo_vehiculos=1
+        ))
+    db_session.commit()
+    analytics.refresh_period_month_keys(db_session.connection())
+    db_session.commit()
+
+    series = client.get("/analytics/periods").json()
+    assert [row["month"] for row in series["data"]] == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    # Fortnights 5 and 6 start on Feb 26th and Mar 11th
+    assert [row["impactos_periodo_personas"] for row in series["data"]] == [10, 5, 7, 40]
+    assert [row["acumulado_personas"] for row in series["data"]] == [10, 15, 22, 62]
+    assert series["impactos_periodo_vehiculos"] == 4
+
+    monthly = client.get("/analytics/periods?tipo_campania=mensual").json()
+    assert [(row["month"], row["periodos"]) for row in monthly["data"]] == [
+        ("2024-01", 1), ("2024-02", 0), ("2024-03", 0), ("2024-04", 1)
+    ]
+    window = client.get("/analytics/periods?start_month=2024-02&end_month=2024-03").json()
+    assert [row["acumulado_personas"] for row in window["data"]] == [5, 12]
+
+    assert client.get("/analytics/periods?start_month=2024-13").status_code == 422
+    assert client.get("/analytics/periods?start_month=2024-05&end_month=2024-01").status_code == 400
+
+
+def test_similar_campaigns_match_brute_force(seeded_session: Session):
+    campaigns = seed.prepare_frames(DATA_DIR)["campaigns"].set_index("name")
+    shares = campaigns[similarity.AUDIENCE_FIELDS].dropna().astype(float)
+    shares = shares.loc[(shares != 0).any(axis=1)].sort_index()
+    unit = shares.to_numpy() / np.linalg.norm(shares.to_numpy(), axis=1, keepdims=True)
+    expected = unit @ unit.T
+
+    matrix = similarity.load_audience_matrix(seeded_session.connection())
+    assert list(matrix.names) == list(shares.index)
+    for position, name in enumerate(matrix.names):
+        neighbours = similarity.nearest(matrix, position, 3)
+        best = np.sort(np.delete(expected[position], position))[::-1][:3]
+        assert [neighbour.similarity for neighbour in neighbours] == pytest.approx(best, abs=1e-5)
+        assert name not in [neighbour.name for neighbour in neighbours]
+
+
+def test_audience_index_reloads_per_generation(seeded_session: Session):
+    index = similarity.AudienceIndex()
+    first = index.load(seeded_session, generation=1)
+    assert index.load(seeded_session, generation=1) is first
+    second = index.load(seeded_session, generation=2)
+    assert second is not first
+    assert index.load(seeded_session, generation=2) is second
+
+
+def test_similar_endpoint(client: TestClient, db_session: Session, empty_tables, sql_statements):
+    profiles = {
+        "joven": {"edad_15a19": 0.5, "edad_20a24": 0.5},
+        "joven_2": {"edad_15a19": 0.4, "edad_20a24": 0.6},
+        "mayor": {"edad_45a64": 0.3, "edad_65mas": 0.7},
+        "mixta": {"edad_20a24": 0.5, "edad_65mas": 0.5},
+    }
+    for name, shares in profiles.items():
+        tipo = "catorcenal" if name == "joven_2" else "mensual"
+        seed_campaign(db_session, name, tipo, date(2024, 1, 1), date(2024, 1, 31))
+        db_session.query(models.Campaign).filter_by(name=name).update(shares)
+    seed_campaign(db_session, "sin_perfil", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    db_session.commit()
+    similarity.refresh_audience_vectors(db_session.connection())
+    db_session.commit()
+
+    similar = client.get("/campaigns/joven/similar?k=2").json()
+    # Once loaded, a cache miss only reads the data generation
+    sql_statements.clear()
+    assert client.get("/campaigns/joven/similar?k=3").status_code == 200
+    assert len(sql_statements) == 1
+    assert [row["name"] for row in similar["data"]] == ["joven_2", "mixta"]
+    assert similar["data"][0]["similarity"] == pytest.approx(0.98058, abs=1e-5)
+    assert similar["campanias"] == 4
+
+    monthly = client.get("/campaigns/joven/similar?tipo_campania=mensual").json()
+    assert [row["name"] for row in monthly["data"]] == ["mixta", "mayor"]
+
+    assert client.get("/campaigns/sin_perfil/similar").status_code == 404
+    assert client.get("/campaigns/no_existe/similar").json()["detail"] == "Campaign not found"
+    assert client.get("/campaigns/joven/similar?k=0").status_code == 422
@@ -2,7 +2,7 @@ from datetime import date
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from app import models
+from app import crud, models
 
 
 def seed_campaign(session: Session, name: str, tipo: str, start: date, end: date):
@@ -116,3 +116,124 @@ def test_campaign_detail(client: TestClient, db_session: Session):
     assert body["general_summary"]["impactos_personas"] == 1000
     assert len(body["periods"]) == 1
     assert len(body["sites"]) == 1
+
+
+def test_cursor_pagination_walks_all_campaigns(client: TestClient, db_session: Session):
+    db_session.query(models.Campaign).delete()
+    for index in range(5):
+        seed_campaign(db_session, f"camp_{index}", "mensual", date(2024, 1, 1 + index % 2), date(2024, 2, 1))
+    # Undated campaigns sort after every dated one
+    for name in ("sin_fecha_a", "sin_fecha_b", "sin_fecha_c"):
+        seed_campaign(db_session, name, "mensual", None, None)
+
+    first = client.get("/campaigns?limit=2").json()
+    seen = [campaign["name"] for campaign in first["data"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        body = client.get(f"/campaigns?limit=2&include_total=false&cursor={cursor}").json()
+        assert body["total"] is None
+        seen.extend(campaign["name"] for campaign in body["data"])
+        cursor = body["next_cursor"]
+
+    assert seen == ["camp_3", "camp_1", "camp_4", "camp_2", "camp_0", "sin_fecha_c", "sin_fecha_b", "sin_fecha_a"]
+    for page in (2, 3):
+        offset_page = client.get(f"/campaigns?page={page}&limit=2").json()
+        assert [campaign["name"] for campaign in offset_page["data"]] == seen[2 * page - 2:2 * page]
+
+
+def test_invalid_cursor_and_tipo_are_rejected(client: TestClient):
+    assert client.get("/campaigns?cursor=not-a-cursor").status_code == 400
+    assert client.get("/campaigns?tipo_campania=anual").status_code == 400
+
+
+def test_campaign_detail_serves_materialized_summary(client: TestClient, db_session: Session):
+    db_session.query(models.CampaignSummary).delete()
+    db_session.query(models.CampaignSite).delete()
+    db_session.query(models.CampaignPeriod).delete()
+    db_session.query(models.Campaign).delete()
+    seed_campaign(db_session, "camp_resumen", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    seed_detail(db_session, "camp_resumen")
+
+    computed = client.get("/campaigns/camp_resumen/summary").json()
+    assert computed["period_summary"] == {"total_periodos": 1, "impactos_personas": 200, "impactos_vehiculos": 100}
+    assert computed["site_summary"]["alcance_mensual_promedio"] == 500
+
+    crud.refresh_campaign_summaries(db_session.connection())
+    db_session.query(models.CampaignSummary).update({"total_sitios": 7})
+    db_session.commit()
+
+    detail = client.get("/campaigns/camp_resumen").json()
+    assert detail["site_summary"]["total_sitios"] == 7
+    assert detail["period_summary"] == computed["period_summary"]
+    assert client.get("/campaigns/missing/summary").status_code == 404
+
+
+def test_batch_details_match_single_details(client: TestClient, db_session: Session):
+    for name in ("camp_lote_a", "camp_lote_b"):
+        seed_campaign(db_session, name, "mensual", date(2024, 1, 1), date(2024, 1, 31))
+        seed_detail(db_session, name)
+
+    response = client.get("/campaign-details?ids=camp_lote_b,camp_inexistente,camp_lote_a")
+    assert response.status_code == 200
+    body = response.json()
+    assert [detail["name"] for detail in body["data"]] == ["camp_lote_b", "camp_lote_a"]
+    assert body["missing"] == ["camp_inexistente"]
+    assert body["data"][1] == client.get("/campaigns/camp_lote_a").json()
+
+    posted = client.post("/campaign-details", json={"ids": ["camp_lote_b", "camp_lote_a"]})
+    assert posted.json()["data"] == body["data"]
+    assert client.get("/campaign-details?ids=,").status_code == 400
+
+    # Campaign names never collide with the batch route
+    seed_campaign(db_session, "details", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    assert client.get("/campaigns/details").json()["name"] == "details"
+
+
+def test_list_and_search_return_facet_counts(client: TestClient, db_session: Session):
+    def clear():
+        db_session.query(models.CampaignFacet).delete()
+        db_session.query(models.CampaignSite).delete()
+        db_session.query(models.CampaignPeriod).delete()
+        db_session.query(models.Campaign).delete()
+        db_session.commit()
+
+    clear()
+    seed_campaign(db_session, "faceta_ene", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    seed_campaign(db_session, "faceta_feb", "mensual", date(2024, 2, 1), date(2024, 2, 28))
+    seed_campaign(db_session, "faceta_jun", "catorcenal", date(2024, 6, 1), date(2024, 6, 14))
+    for name in ("faceta_ene", "faceta_feb", "faceta_jun"):
+        seed_detail(db_session, name)
+    db_session.add(models.CampaignSite(campaign_name="faceta_ene", codigo_del_sitio="SITE-2",
+                                       estado="CDMX", tipo_de_mueble="Parabús"))
+    db_session.add(models.CampaignSite(campaign_name="faceta_jun", codigo_del_sitio="SITE-2",
+                                       estado="Jalisco", tipo_de_mueble="Mupi"))
+    db_session.commit()
+    crud.refresh_campaign_facets(db_session.connection())
+    db_session.commit()
+
+    body = client.get("/campaigns?limit=1&facets=tipo_campania,estado,tipo_de_mueble").json()
+    assert body["total"] == 3
+    assert body["facets"] == {
+        "tipo_campania": [{"value": "mensual", "count": 2}, {"value": "catorcenal", "count": 1}],
+        # Each campaign counts once per value, however many sites share it
+        "estado": [{"value": "CDMX", "count": 3}, {"value": "Jalisco", "count": 1}],
+        "tipo_de_mueble": [{"value": "Mupi", "count": 3}, {"value": "Parabús", "count": 1}],
+    }
+
+    # Facets follow the other filters; tipo_campania still lists every type
+    filtered = client.get("/campaigns?tipo_campania=catorcenal&facets=tipo_campania,estado").json()
+    assert filtered["facets"]["tipo_campania"] == body["facets"]["tipo_campania"]
+    assert filtered["facets"]["estado"] == [{"value": "CDMX", "count": 1}, {"value": "Jalisco", "count": 1}]
+
+    window = client.get(
+        "/campaigns/search-by-date?start_date=2024-01-15&end_date=2024-02-15&facets=tipo_campania,tipo_de_mueble"
+    ).json()
+    assert window["total"] == 2
+    assert window["facets"] == {
+        "tipo_campania": [{"value": "mensual", "count": 2}],
+        "tipo_de_mueble": [{"value": "Mupi", "count": 2}, {"value": "Parabús", "count": 1}],
+    }
+
+    assert "facets" not in client.get("/campaigns?limit=1").json()
+    assert client.get("/campaigns?facets=color").status_code == 400
+    clear()
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import to_async_url
+from app.main import app, get_db
+from conftest import SQLALCHEMY_TEST_URL, override_get_db
+from test_api import seed_campaign, seed_detail
+
+
+@pytest.fixture
+def async_client():
+    """TestClient whose endpoints receive an aiosqlite ``AsyncSession``."""
+    async_engine = create_async_engine(to_async_url(SQLALCHEMY_TEST_URL))
+    AsyncTestingSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_async_db
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides[get_db] = override_get_db
+        async_engine.sync_engine.dispose()
+
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///./campaigns.db") == "sqlite+aiosqlite:///./campaigns.db"
+    assert to_async_url("sqlite+pysqlite:////data/campaigns.db") == "sqlite+aiosqlite:////data/campaigns.db"
+
+
+def test_endpoints_work_with_async_sessions(async_client: TestClient, db_session: Session):
+    db_session.query(models.CampaignSite).delete()
+    db_session.query(models.CampaignPeriod).delete()
+    db_session.query(models.Campaign).delete()
+    seed_campaign(db_session, "camp_async", "mensual", date(2024, 3, 1), date(2024, 3, 31))
+    seed_detail(db_session, "camp_async")
+
+    listing = async_client.get("/campaigns?limit=5")
+    assert listing.status_code == 200
+    assert listing.json()["data"][0]["name"] == "camp_async"
+
+    search = async_client.get("/campaigns/search-by-date?start_date=2024-03-15&end_date=2024-04-01")
+    assert search.json()["total"] == 1
+
+    detail = async_client.get("/campaigns/camp_async")
+    assert detail.status_code == 200
+    assert len(detail.json()["sites"]) == 1
+    assert async_client.get("/campaigns/missing").status_code == 404
+
+    export = async_client.get("/export/campaigns?dataset=sites&format=csv")
+    assert export.status_code == 200
+    assert export.text.splitlines()[1].split(",")[1:3] == ["camp_async", "SITE-1"]
@@ -0,0 +1,63 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.cache import ResponseCache, response_cache
+from test_api import seed_campaign
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries():
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1, b"a")
+    cache.set("b", 1, b"b")
+    assert cache.get("a", 1).body == b"a"
+    cache.set("c", 1, b"c")
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None
+    clock.now = 11
+    assert cache.get("a", 1) is None
+    assert cache.stats()["evictions"] == 2
+
+
+def test_cache_drops_entries_from_older_generations():
+    cache = ResponseCache(max_entries=10, ttl_seconds=10)
+    cache.set("a", 1, b"a")
+    assert cache.get("a", 2) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_etag_revalidation_and_generation_invalidation(client: TestClient, db_session: Session):
+    db_session.query(models.Campaign).delete()
+    seed_campaign(db_session, "camp_etag", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+
+    first = client.get("/campaigns?limit=5")
+    etag = first.headers["etag"]
+    revalidated = client.get("/campaigns?limit=5", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+    seed_campaign(db_session, "camp_etag_2", "mensual", date(2024, 2, 1), date(2024, 2, 28))
+    assert client.get("/campaigns?limit=5").json()["total"] == 1
+
+    crud.bump_data_generation(db_session.connection())
+    db_session.commit()
+    fresh = client.get("/campaigns?limit=5", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["total"] == 2
+
+    stats = client.get("/cache/stats").json()
+    assert stats["hits"] >= 2
+    assert stats["invalidations"] == 1
+    assert stats["generation"] == response_cache.generation
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.database import apply_sqlite_profile, sqlite_pragmas, to_read_only_url, use_snapshot_reads
+
+
+def test_read_only_url_only_rewrites_sqlite_files():
+    assert to_read_only_url("sqlite:///./campaigns.db") == "sqlite:///file:./campaigns.db?mode=ro&uri=true"
+    assert to_read_only_url("sqlite://") == "sqlite://"
+    assert to_read_only_url("sqlite:///:memory:") == "sqlite:///:memory:"
+    assert to_read_only_url("postgresql://user@host/db") == "postgresql://user@host/db"
+
+
+def test_default_profile_sets_no_pragmas():
+    assert sqlite_pragmas(profile="default") == []
+    assert ("journal_mode", "WAL") not in sqlite_pragmas(read_only=True, profile="performance")
+
+
+def test_performance_profile_and_read_only_pool(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    writer = create_engine(url)
+    apply_sqlite_profile(writer, profile="performance")
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO items VALUES (1)"))
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+    reader = create_engine(to_read_only_url(url))
+    apply_sqlite_profile(reader, read_only=True, profile="performance")
+    with reader.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM items")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.execute(text("INSERT INTO items VALUES (2)"))
+    reader.dispose()
+    writer.dispose()
+
+
+def test_snapshot_reads_see_one_commit(tmp_path):
+    url = f"sqlite:///{tmp_path / 'snapshot.db'}"
+    writer = create_engine(url)
+    apply_sqlite_profile(writer, profile="performance")
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO items VALUES (1)"))
+
+    reader = create_engine(to_read_only_url(url))
+    apply_sqlite_profile(reader, read_only=True, profile="performance")
+    use_snapshot_reads(reader)
+    with reader.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM items")).scalar() == 1
+        with writer.begin() as write:
+            write.execute(text("INSERT INTO items VALUES (2)"))
+        # Same transaction, same snapshot
+        assert conn.execute(text("SELECT COUNT(*) FROM items")).scalar() == 1
+        conn.rollback()
+        assert conn.execute(text("SELECT COUNT(*) FROM items")).scalar() == 2
+    reader.dispose()
+    writer.dispose()
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.export import iter_export
+from app.crud import export_select
+from test_api import seed_campaign, seed_detail
+
+
+def reset(session: Session):
+    session.query(models.CampaignSite).delete()
+    session.query(models.CampaignPeriod).delete()
+    session.query(models.Campaign).delete()
+    session.commit()
+
+
+def test_export_streams_ndjson_with_list_filters(client: TestClient, db_session: Session):
+    reset(db_session)
+    seed_campaign(db_session, "exp_ene", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    seed_campaign(db_session, "exp_jun", "catorcenal", date(2024, 6, 1), date(2024, 6, 14))
+    seed_detail(db_session, "exp_ene")
+    seed_detail(db_session, "exp_jun")
+
+    response = client.get("/export/campaigns")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["exp_jun", "exp_ene"]
+    assert rows[0]["fecha_inicio"] == "2024-06-01"
+    assert "row_hash" not in rows[0]
+
+    filtered = client.get("/export/campaigns?tipo_campania=catorcenal")
+    assert [json.loads(line)["name"] for line in filtered.text.splitlines()] == ["exp_jun"]
+
+    sites = client.get("/export/campaigns?dataset=sites&start_date=2024-01-15&end_date=2024-02-01")
+    assert [json.loads(line)["campaign_name"] for line in sites.text.splitlines()] == ["exp_ene"]
+
+
+def test_export_csv_and_single_campaign_sites(client: TestClient, db_session: Session):
+    reset(db_session)
+    seed_campaign(db_session, "exp_csv", "mensual", date(2024, 3, 1), date(2024, 3, 31))
+    seed_detail(db_session, "exp_csv")
+
+    periods = client.get("/export/campaigns?dataset=periods&format=csv")
+    assert periods.headers["content-type"] == "text/csv; charset=utf-8"
+    records = list(csv.DictReader(io.StringIO(periods.text)))
+    assert records == [{
+        "id": records[0]["id"],
+        "campaign_name": "exp_csv",
+        "period": "Q1",
+        "impactos_periodo_personas": "200",
+        "impactos_periodo_vehiculos": "100",
+    }]
+
+    sites = client.get("/campaigns/exp_csv/sites/export?format=csv")
+    assert sites.status_code == 200
+    assert "attachment" in sites.headers["content-disposition"]
+    assert [record["codigo_del_sitio"] for record in csv.DictReader(io.StringIO(sites.text))] == ["SITE-1"]
+
+    assert client.get("/campaigns/missing/sites/export").status_code == 404
+    assert client.get("/export/campaigns?format=xml").status_code == 422
+    assert client.get("/export/campaigns?start_date=2024-02-01&end_date=2024-01-01").status_code == 400
+
+
+def test_campaign_named_export_is_not_shadowed(client: TestClient, db_session: Session):
+    reset(db_session)
+    seed_campaign(db_session, "export", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    response = client.get("/campaigns/export")
+    assert response.status_code == 200
+    assert response.json()["name"] == "export"
+
+
+def test_export_yields_one_chunk_per_batch(db_session: Session):
+    reset(db_session)
+    for index in range(5):
+        seed_campaign(db_session, f"exp_batch_{index}", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+
+    chunks = list(iter_export(db_session, export_select("campaigns"), "ndjson", batch_size=2))
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
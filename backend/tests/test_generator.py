@@ -0,0 +1,22 @@
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+import seed
+from benchmarks.generator import generate_dataset, source_headers
+
+
+def test_generator_matches_source_schema_and_is_deterministic(tmp_path):
+    counts = generate_dataset(tmp_path / "a", campaigns=30, sites=301, periods=2, seed=7, chunk_campaigns=8)
+    generate_dataset(tmp_path / "b", campaigns=30, sites=301, periods=2, seed=7, chunk_campaigns=8)
+
+    assert counts == {"bd_campanias_agrupado.csv": 30, "bd_campanias_periodos.csv": 60, "bd_campanias_sitios.csv": 301}
+    for file_name, header in source_headers().items():
+        assert list(pd.read_csv(tmp_path / "a" / file_name, nrows=0).columns) == header
+        assert (tmp_path / "a" / file_name).read_bytes() == (tmp_path / "b" / file_name).read_bytes()
+
+    bind = create_engine(f"sqlite:///{tmp_path / 'generated.db'}")
+    seed.load_data(bind=bind, data_dir=tmp_path / "a")
+    with bind.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM campaign_sites")).scalar() == 301
+        assert conn.execute(text("SELECT COUNT(*) FROM campaign_periods WHERE impactos_periodo_vehiculos IS NULL")).scalar() == 0
+    bind.dispose()
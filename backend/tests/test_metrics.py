@@ -0,0 +1,69 @@
+import logging
+import re
+from datetime import date
+
+from app import metrics
+from test_api import seed_campaign
+
+
+def metric_value(body: str, name: str, **labels) -> float:
+    for line in body.splitlines():
+        if line.startswith(name + "{") and all(f'{key}="{value}"' in line for key, value in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} {labels} not found")
+
+
+def test_metrics_attribute_latency_and_queries_to_route(client, db_session):
+    seed_campaign(db_session, "metrics_campaign", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    before = client.get("/metrics").text
+    try:
+        count_before = metric_value(before, "http_request_duration_seconds_count", route="/campaigns/{campaign_id}")
+    except AssertionError:
+        count_before = 0
+
+    response = client.get("/campaigns/metrics_campaign")
+    assert response.status_code == 200
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="[1-9]\d* queries"', response.headers["server-timing"])
+
+    body = client.get("/metrics").text
+    assert metric_value(
+        body, "http_request_duration_seconds_count", method="GET", route="/campaigns/{campaign_id}", status="200"
+    ) == count_before + 1
+    assert metric_value(body, "http_request_duration_seconds_bucket", route="/campaigns/{campaign_id}", le="+Inf") >= 1
+    assert metric_value(body, "http_request_db_queries_sum", route="/campaigns/{campaign_id}") >= 1
+    assert metric_value(body, "db_queries_total", engine="test") >= 1
+    assert "response_cache_misses_total" in body
+
+
+def test_unmatched_paths_share_one_label(client):
+    client.get("/no-such-route/123")
+    client.get("/no-such-route/456")
+
+    body = client.get("/metrics").text
+    assert metric_value(body, "http_request_duration_seconds_count", route="unmatched", status="404") >= 2
+    assert "/no-such-route" not in body
+
+
+def test_slow_query_log(client, db_session, monkeypatch, caplog):
+    seed_campaign(db_session, "slow_campaign", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    monkeypatch.setattr(metrics, "SLOW_QUERY_MS", 1e-9)
+    slow_before = metrics.db_slow_queries.value(("test",))
+
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        assert client.get("/campaigns/slow_campaign").status_code == 200
+
+    assert metrics.db_slow_queries.value(("test",)) > slow_before
+    assert any("Slow query" in record.getMessage() and "campaigns" in record.getMessage() for record in caplog.records)
+
+
+def test_histogram_render_is_cumulative():
+    histogram = metrics.Histogram("demo_seconds", "Demo.", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(("/x",), value)
+
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/x",le="1"} 3' in lines
+    assert 'demo_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{route="/x"} 4' in lines
+    assert 'demo_seconds_sum{route="/x"} 4.050000' in lines
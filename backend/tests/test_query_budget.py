@@ -0,0 +1,66 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from test_api import seed_campaign, seed_detail
+
+
+@pytest.fixture
+def seeded(db_session: Session):
+    db_session.query(models.CampaignSummary).delete()
+    db_session.query(models.CampaignFacet).delete()
+    db_session.query(models.CampaignSite).delete()
+    db_session.query(models.CampaignPeriod).delete()
+    db_session.query(models.Campaign).delete()
+    for index in range(3):
+        name = f"budget_{index}"
+        seed_campaign(db_session, name, "mensual", date(2024, 1, 1 + index), date(2024, 2, 1))
+        seed_detail(db_session, name)
+    crud.refresh_campaign_summaries(db_session.connection())
+    crud.refresh_campaign_facets(db_session.connection())
+    db_session.commit()
+
+
+# Every budget includes the data-generation lookup done by the response cache
+@pytest.mark.parametrize("url, max_queries", [
+    ("/campaigns?limit=5", 3),
+    ("/campaigns?limit=5&include_total=false", 2),
+    ("/campaigns/search-by-date?start_date=2024-01-01&end_date=2024-03-01", 3),
+    # All requested facets come from one extra UNION ALL statement
+    ("/campaigns?limit=5&facets=tipo_campania,estado,tipo_de_mueble", 4),
+    ("/campaigns/search-by-date?start_date=2024-01-01&end_date=2024-03-01&facets=tipo_campania,zm", 4),
+    ("/campaigns/budget_1", 5),
+    ("/campaigns/budget_1/summary", 3),
+    ("/campaign-details?ids=budget_0,budget_1,budget_2", 4),
+])
+def test_endpoint_query_budget(client: TestClient, seeded, query_budget, url, max_queries):
+    with query_budget(max_queries):
+        response = client.get(url)
+    assert response.status_code == 200
+
+    with query_budget(1):
+        cached = client.get(url)
+    assert cached.content == response.content
+
+
+def test_batch_details_cost_does_not_grow_with_ids(client: TestClient, db_session: Session, seeded, query_budget):
+    for index in range(3, 40):
+        name = f"budget_{index}"
+        seed_campaign(db_session, name, "mensual", date(2024, 3, 1), date(2024, 3, 31))
+        seed_detail(db_session, name)
+    crud.refresh_campaign_summaries(db_session.connection())
+    db_session.commit()
+
+    with query_budget(4):
+        response = client.post("/campaign-details", json={"ids": [f"budget_{index}" for index in range(40)]})
+    assert len(response.json()["data"]) == 40
+
+
+def test_relationships_never_lazy_load(db_session: Session, seeded):
+    campaign = crud.get_campaign(db_session, "budget_0")
+    with pytest.raises(InvalidRequestError):
+        campaign.sites
@@ -0,0 +1,88 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from test_api import seed_campaign, seed_detail
+
+
+@pytest.fixture
+def seeded(db_session: Session):
+    db_session.query(models.CampaignSite).delete()
+    db_session.query(models.CampaignPeriod).delete()
+    db_session.query(models.Campaign).delete()
+    seed_campaign(db_session, "plan_a", "mensual", date(2024, 1, 1), date(2024, 1, 31))
+    seed_campaign(db_session, "plan_b", "catorcenal", date(2024, 2, 1), date(2024, 2, 14))
+    seed_detail(db_session, "plan_a")
+
+
+def query_plans(session: Session, statements):
+    plans = []
+    with session.bind.connect() as conn:
+        for statement, parameters in statements:
+            if not statement.lstrip().upper().startswith("SELECT"):
+                continue
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+
+# Whole-index scans the unfiltered statements need: the COUNT(*) of every
+# campaign, the listing's walk of its sort index (stopped by LIMIT) and an
+# unfiltered export. Any other statement must SEARCH an index.
+UNFILTERED_COUNT = "SCAN campaigns USING COVERING INDEX sqlite_autoindex_campaigns_1"
+UNFILTERED_LIST = "SCAN campaigns USING INDEX ix_campaigns_fecha_inicio_name"
+UNFILTERED_PERIODS_EXPORT = "SCAN campaign_periods USING INDEX ux_campaign_periods_campaign_period"
+
+
+def assert_indexed(plans, allowed_scans=()):
+    assert plans
+    for statement, details in plans:
+        for detail in details:
+            assert "TEMP B-TREE" not in detail, f"sort without index: {detail}\n{statement}"
+            words = detail.split()
+            # Steps over materialized subqueries (anon_N) read already-filtered rows
+            if words[0] not in ("SCAN", "SEARCH") or words[1] not in models.Base.metadata.tables:
+                continue
+            if detail in allowed_scans:
+                continue
+            assert words[0] == "SEARCH", f"full scan: {detail}\n{statement}"
+            assert "AUTOMATIC" not in detail and ("INDEX" in detail or "PRIMARY KEY" in detail), (
+                f"search without a declared index: {detail}\n{statement}"
+            )
+
+
+@pytest.mark.parametrize("url, allowed_scans", [
+    ("/campaigns?page=2&limit=1", (UNFILTERED_COUNT, UNFILTERED_LIST)),
+    ("/campaigns?limit=1&tipo_campania=mensual", ()),
+    ("/campaigns/search-by-date?start_date=2024-01-15&end_date=2024-02-10", ()),
+    ("/campaigns/search-by-date?start_date=2024-01-15&end_date=2024-02-10&tipo_campania=catorcenal", ()),
+    ("/campaigns/plan_a", ()),
+    ("/export/campaigns?tipo_campania=mensual", ()),
+    ("/export/campaigns?dataset=sites&start_date=2024-01-15&end_date=2024-02-10", ()),
+    ("/export/campaigns?dataset=periods", (UNFILTERED_PERIODS_EXPORT,)),
+    ("/campaigns/plan_a/sites/export", ()),
+    ("/campaigns?facets=estado,tipo_de_mueble", (UNFILTERED_COUNT, UNFILTERED_LIST)),
+    ("/campaigns?tipo_campania=mensual&facets=estado", ()),
+    ("/analytics/periods?start_month=2024-01", ()),
+    ("/analytics/periods?tipo_campania=mensual", ()),
+])
+def test_queries_use_indexes(client: TestClient, db_session: Session, seeded, sql_statements, url, allowed_scans):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert_indexed(query_plans(db_session, sql_statements), allowed_scans)
+
+
+def test_cursor_pages_use_indexes(client: TestClient, db_session: Session, seeded, sql_statements):
+    seed_campaign(db_session, "plan_sin_fecha_a", "mensual", None, None)
+    seed_campaign(db_session, "plan_sin_fecha_b", "mensual", None, None)
+    cursor = client.get("/campaigns?limit=1").json()["next_cursor"]
+    # Dated page, the page crossing into undated campaigns, undated page
+    for _ in range(3):
+        sql_statements.clear()
+        response = client.get(f"/campaigns?limit=1&include_total=false&cursor={cursor}")
+        assert response.status_code == 200
+        assert_indexed(query_plans(db_session, sql_statements))
+        cursor = response.json()["next_cursor"]
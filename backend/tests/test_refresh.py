@@ -0,0 +1,159 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+import seed
+from app import refresh
+from app.database import apply_sqlite_profile, to_read_only_url, use_snapshot_reads
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+PEOPLE = "SELECT SUM(impactos_periodo_personas) FROM campaign_periods"
+GENERATION = "SELECT value FROM dataset_meta WHERE key = 'generation'"
+
+
+@pytest.fixture
+def live_engine(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path / 'live.db'}")
+    apply_sqlite_profile(bind, profile="performance")
+    seed.load_data(bind=bind, data_dir=DATA_DIR)
+    yield bind
+    bind.dispose()
+
+
+def test_refresh_swaps_rows_under_open_readers(live_engine, tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for csv_file in DATA_DIR.glob("*.csv"):
+        (data_dir / csv_file.name).write_bytes(csv_file.read_bytes())
+    periods = pd.read_csv(data_dir / "bd_campanias_periodos.csv")
+    periods["impactos_periodo_personas"] = 1
+    periods.to_csv(data_dir / "bd_campanias_periodos.csv", index=False)
+
+    reader = create_engine(to_read_only_url(str(live_engine.url)))
+    use_snapshot_reads(reader)
+    with reader.connect() as conn:
+        before = conn.execute(text(PEOPLE)).scalar()
+        counts = seed.load_data(bind=live_engine, data_dir=data_dir, refresh=True)
+        # A reader that started before the swap keeps its snapshot
+        assert conn.execute(text(PEOPLE)).scalar() == before
+        assert conn.execute(text(GENERATION)).scalar() == "1"
+    with reader.connect() as conn:
+        assert conn.execute(text(PEOPLE)).scalar() == counts["campaign_periods"] == 36
+        assert conn.execute(text(GENERATION)).scalar() == "2"
+    reader.dispose()
+
+    assert counts["search_index"] == counts["campaigns"] == 12
+    assert not seed.staging_path(live_engine).exists()
+    assert seed.seed_is_current(live_engine, data_dir)
+
+
+def test_invalid_staged_load_leaves_live_rows(live_engine, monkeypatch):
+    frames = seed.prepare_frames(DATA_DIR)
+    counts = {name: len(frame) for name, frame in frames.items()}
+    counts.update(search_index=12)
+    seed.validate_counts(counts, frames)
+    with pytest.raises(ValueError, match="campaign_sites: 50 filas de 51"):
+        seed.validate_counts({**counts, "campaign_sites": 50}, frames)
+
+    def lose_a_row(counts, frames):
+        raise ValueError("carga auxiliar inválida")
+
+    monkeypatch.setattr(seed, "validate_counts", lose_a_row)
+    with live_engine.connect() as conn:
+        before = conn.execute(text(PEOPLE)).scalar()
+    with pytest.raises(ValueError, match="carga auxiliar inválida"):
+        seed.load_data(bind=live_engine, data_dir=DATA_DIR, refresh=True)
+    with live_engine.connect() as conn:
+        assert conn.execute(text(PEOPLE)).scalar() == before
+        assert conn.execute(text(GENERATION)).scalar() == "1"
+    assert not seed.staging_path(live_engine).exists()
+
+
+def test_admin_refresh_endpoints(client: TestClient, monkeypatch, tmp_path):
+    worker = refresh.RefreshWorker(
+        command=[sys.executable, "-c", "import time; time.sleep(0.3); print('Refresco aplicado')"],
+        lock=tmp_path / "campaigns.db.refresh.lock",
+    )
+    monkeypatch.setattr(refresh, "refresh_worker", worker)
+
+    monkeypatch.setattr(refresh, "ADMIN_TOKEN", None)
+    assert client.post("/admin/refresh").status_code == 403
+
+    monkeypatch.setattr(refresh, "ADMIN_TOKEN", "secreto")
+    assert client.post("/admin/refresh", headers={"X-Admin-Token": "otro"}).status_code == 401
+
+    headers = {"X-Admin-Token": "secreto"}
+    started = client.post("/admin/refresh", headers=headers)
+    assert started.status_code == 202
+    assert started.json()["state"] == "running"
+    assert client.post("/admin/refresh", headers=headers).status_code == 409
+    assert worker.wait(timeout=30) == 0
+
+    status = client.get("/admin/refresh", headers=headers).json()
+    assert status["state"] == "succeeded"
+    assert status["output"] == ["Refresco aplicado"]
+
+    worker.command = [sys.executable, "-c", "raise SystemExit(1)"]
+    assert client.post("/admin/refresh", headers=headers).status_code == 202
+    assert worker.wait(timeout=30) == 1
+    assert client.get("/admin/refresh", headers=headers).json()["state"] == "failed"
+
+
+def test_concurrent_refreshes_swap_once(live_engine, monkeypatch):
+    holding, checked = threading.Event(), threading.Event()
+    validate = seed.validate_counts
+
+    def validate_and_wait(counts, frames):
+        validate(counts, frames)
+        holding.set()
+        assert checked.wait(timeout=30)
+
+    monkeypatch.setattr(seed, "validate_counts", validate_and_wait)
+    results = {}
+    first = threading.Thread(
+        target=lambda: results.update(first=seed.load_data(bind=live_engine, data_dir=DATA_DIR, refresh=True))
+    )
+    first.start()
+    try:
+        assert holding.wait(timeout=30)
+        # The first refresh is between staging and swap; a second one is refused
+        with pytest.raises(refresh.RefreshInProgress):
+            seed.load_data(bind=live_engine, data_dir=DATA_DIR, refresh=True)
+        assert seed.staging_path(live_engine).exists()
+    finally:
+        checked.set()
+        first.join(timeout=30)
+
+    assert results["first"]["campaigns"] == 12
+    with live_engine.connect() as conn:
+        assert conn.execute(text(GENERATION)).scalar() == "2"
+
+
+def test_admin_refresh_conflicts_with_a_refresh_in_another_process(client: TestClient, monkeypatch, tmp_path):
+    lock = tmp_path / "campaigns.db.refresh.lock"
+    worker = refresh.RefreshWorker(command=[sys.executable, "-c", "import time; time.sleep(0.3)"], lock=lock)
+    monkeypatch.setattr(refresh, "refresh_worker", worker)
+    monkeypatch.setattr(refresh, "ADMIN_TOKEN", "secreto")
+    headers = {"X-Admin-Token": "secreto"}
+
+    # Another process (CLI refresh or API worker) holds the lock
+    fd = refresh.try_lock(lock)
+    try:
+        assert client.post("/admin/refresh", headers=headers).status_code == 409
+        assert worker.status()["state"] == "idle"
+    finally:
+        os.close(fd)
+
+    # A refresh started here holds the lock in its seed process until it exits
+    assert client.post("/admin/refresh", headers=headers).status_code == 202
+    assert refresh.try_lock(lock) is None
+    assert worker.wait(timeout=30) == 0
+    fd = refresh.try_lock(lock)
+    assert fd is not None
+    os.close(fd)
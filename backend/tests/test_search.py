@@ -0,0 +1,94 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.crud import bump_data_generation
+from app.search import match_expression, refresh_search_index
+from test_api import seed_campaign
+
+
+def add_site(session: Session, campaign_name: str, codigo: str, municipio: str, estado: str = "CDMX", zm: str = "ZM1"):
+    session.add(models.CampaignSite(
+        campaign_name=campaign_name,
+        codigo_del_sitio=codigo,
+        estado=estado,
+        municipio=municipio,
+        zm=zm,
+    ))
+    session.commit()
+
+
+@pytest.fixture
+def indexed(db_session: Session):
+    def clear():
+        db_session.query(models.CampaignSite).delete()
+        db_session.query(models.CampaignPeriod).delete()
+        db_session.query(models.Campaign).delete()
+        db_session.commit()
+
+    clear()
+    seed_campaign(db_session, "verano_cdmx", "mensual", date(2024, 6, 1), date(2024, 6, 30))
+    seed_campaign(db_session, "invierno_gdl", "catorcenal", date(2024, 12, 1), date(2024, 12, 14))
+    seed_campaign(db_session, "cuauhtemoc_launch", "catorcenal", date(2024, 3, 1), date(2024, 3, 14))
+    add_site(db_session, "verano_cdmx", "PRUEBA-MEX-0501", "Cuauhtémoc")
+    add_site(db_session, "verano_cdmx", "PRUEBA-MEX-0502", "Benito Juárez")
+    add_site(db_session, "invierno_gdl", "PRUEBA-GDL-0101", "Zapopan", "Jalisco", "Guadalajara")
+    add_site(db_session, "cuauhtemoc_launch", "PRUEBA-MTY-0900", "Monterrey", "Nuevo León", "Monterrey")
+    with db_session.get_bind().begin() as conn:
+        refresh_search_index(conn)
+    yield
+    clear()
+    with db_session.get_bind().begin() as conn:
+        refresh_search_index(conn)
+
+
+def names(response):
+    assert response.status_code == 200, response.text
+    return [campaign["name"] for campaign in response.json()["data"]]
+
+
+def test_search_matches_site_locations_without_accents(client: TestClient, indexed):
+    assert sorted(names(client.get("/search?q=cuauhtemoc"))) == ["cuauhtemoc_launch", "verano_cdmx"]
+    # A hit on the campaign name outranks one on a site's municipio
+    assert names(client.get("/search?q=cuauhtemoc"))[0] == "cuauhtemoc_launch"
+    assert names(client.get("/search?q=cuauhtemoc&field=municipio")) == ["verano_cdmx"]
+    assert names(client.get("/search?q=nuevo leon")) == ["cuauhtemoc_launch"]
+
+
+def test_search_site_code_prefix(client: TestClient, indexed):
+    assert names(client.get("/search?q=PRUEBA-MEX-05")) == ["verano_cdmx"]
+    assert sorted(names(client.get("/search?q=prueba"))) == ["cuauhtemoc_launch", "invierno_gdl", "verano_cdmx"]
+    assert names(client.get("/search?q=PRUEBA-MEX-09")) == []
+
+
+def test_search_paginates_and_filters(client: TestClient, indexed):
+    body = client.get("/search?q=prueba&limit=2&page=2").json()
+    assert body["total"] == 3
+    assert body["page"] == 2
+    assert len(body["data"]) == 1
+    assert names(client.get("/search?q=prueba&tipo_campania=mensual")) == ["verano_cdmx"]
+
+
+def test_search_rejects_empty_queries(client: TestClient, indexed):
+    assert client.get("/search?q=--").status_code == 400
+    assert client.get("/search?q=x&field=periodo").status_code == 422
+
+
+def test_refresh_search_index_only_touches_given_campaigns(client: TestClient, db_session: Session, indexed):
+    add_site(db_session, "invierno_gdl", "NUEVO-1", "Tlaquepaque", "Jalisco", "Guadalajara")
+    assert names(client.get("/search?q=tlaquepaque")) == []
+
+    with db_session.get_bind().begin() as conn:
+        refresh_search_index(conn, ["invierno_gdl"])
+        bump_data_generation(conn)
+    assert names(client.get("/search?q=tlaquepaque")) == ["invierno_gdl"]
+    assert names(client.get("/search?q=cuauhtemoc&field=municipio")) == ["verano_cdmx"]
+
+
+def test_match_expression_quotes_terms():
+    assert match_expression('PRUEBA-MEX-05') == '"PRUEBA-MEX-05"*'
+    assert match_expression('benito "juarez"') == '"benito" """juarez"""*'
+    assert match_expression("zapopan", field="municipio") == 'municipios : ("zapopan"*)'
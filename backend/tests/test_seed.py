@@ -0,0 +1,290 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+import convert_inputs
+import seed
+from app import analytics, similarity
+from app.analytics import unpack_hourly
+from app.migrations import SCHEMA_KEY, schema_fingerprint, stored_fingerprint, upgrade_schema
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+TABLES = ("campaigns", "campaign_periods", "campaign_sites", "campaign_summaries")
+
+
+@pytest.fixture
+def seed_engine(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    yield bind
+    bind.dispose()
+
+
+def dump_tables(bind):
+    with bind.connect() as conn:
+        return {
+            table: conn.execute(text(f"SELECT * FROM {table} ORDER BY 1")).fetchall()
+            for table in TABLES
+        }
+
+
+def test_clean_number_repairs_date_formatted_values():
+    values = pd.Series(["14566-06-26", "120", None])
+    cleaned = seed.clean_number(values)
+    assert cleaned.tolist()[:2] == [14566, 120]
+    assert pd.isna(cleaned.iloc[2])
+
+
+def test_bulk_and_orm_modes_load_identical_rows(seed_engine, tmp_path):
+    seed.load_data(mode="bulk", chunk_size=7, bind=seed_engine, data_dir=DATA_DIR)
+    bulk_rows = dump_tables(seed_engine)
+
+    orm_engine = create_engine(f"sqlite:///{tmp_path / 'orm.db'}")
+    seed.load_data(mode="orm", bind=orm_engine, data_dir=DATA_DIR)
+    orm_rows = dump_tables(orm_engine)
+    orm_engine.dispose()
+
+    assert len(bulk_rows["campaigns"]) == 12
+    assert len(bulk_rows["campaign_periods"]) == 36
+    assert bulk_rows == orm_rows
+
+
+def test_incremental_seed_applies_only_changed_rows(seed_engine, tmp_path):
+    seed.load_data(bind=seed_engine, data_dir=DATA_DIR)
+    unchanged = seed.load_data(bind=seed_engine, data_dir=DATA_DIR, incremental=True)
+    assert all(changes.unchanged and not changes.inserted + changes.updated + changes.deleted
+               for changes in unchanged.values())
+
+    drop_dir = tmp_path / "drop"
+    drop_dir.mkdir()
+    for csv_file in DATA_DIR.glob("*.csv"):
+        (drop_dir / csv_file.name).write_bytes(csv_file.read_bytes())
+    periods = pd.read_csv(drop_dir / "bd_campanias_periodos.csv")
+    periods.loc[0, "impactos_periodo_personas"] = 1
+    periods.drop(index=3).to_csv(drop_dir / "bd_campanias_periodos.csv", index=False)
+
+    summary = seed.load_data(bind=seed_engine, data_dir=drop_dir, incremental=True)
+    assert summary["campaign_periods"] == seed.TableChanges(inserted=0, updated=1, deleted=1, unchanged=34)
+    assert summary["campaigns"].unchanged == 12
+
+    with seed_engine.connect() as conn:
+        total, updated = conn.execute(text(
+            "SELECT COUNT(*), SUM(impactos_periodo_personas = 1) FROM campaign_periods"
+        )).one()
+    assert (total, updated) == (35, 1)
+
+
+def test_seed_builds_search_index(seed_engine):
+    seed.load_data(bind=seed_engine, data_dir=DATA_DIR)
+    # A full reload drops and recreates the FTS table with the other tables
+    seed.load_data(bind=seed_engine, data_dir=DATA_DIR)
+    with seed_engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM search_index")).scalar() == 12
+        municipio = conn.execute(text("SELECT municipio FROM campaign_sites LIMIT 1")).scalar()
+
+    # Databases seeded before the index existed get it filled on upgrade
+    # (they have no schema fingerprint, so the upgrade isn't skipped)
+    with seed_engine.begin() as conn:
+        conn.execute(text("DELETE FROM search_index"))
+        conn.execute(text("DELETE FROM dataset_meta WHERE key = :key"), {"key": SCHEMA_KEY})
+    upgrade_schema(seed_engine)
+    with seed_engine.connect() as conn:
+        matches = conn.execute(
+            text("SELECT COUNT(*) FROM search_index WHERE search_index MATCH :q"), {"q": f'municipios : "{municipio}"'}
+        ).scalar()
+    assert matches >= 1
+
+
+def copy_data_dir(target):
+    target.mkdir()
+    for csv_file in DATA_DIR.glob("*.csv"):
+        (target / csv_file.name).write_bytes(csv_file.read_bytes())
+    return target
+
+
+def test_seed_is_current_compares_csv_contents(seed_engine, tmp_path):
+    data_dir = copy_data_dir(tmp_path / "data")
+    assert not seed.seed_is_current(seed_engine, data_dir)
+
+    seed.load_data(bind=seed_engine, data_dir=data_dir)
+    assert stored_fingerprint(seed_engine) == schema_fingerprint(seed_engine)
+    assert seed.seed_is_current(seed_engine, data_dir)
+
+    # Same bytes with new mtimes (a fresh copy) still count as unchanged
+    assert seed.seed_is_current(seed_engine, copy_data_dir(tmp_path / "copy"))
+
+    sites = data_dir / "bd_campanias_sitios.csv"
+    sites.write_bytes(sites.read_bytes() + b"\n")
+    assert not seed.seed_is_current(seed_engine, data_dir)
+    seed.load_data(bind=seed_engine, data_dir=data_dir, incremental=True)
+    assert seed.seed_is_current(seed_engine, data_dir)
+
+
+def test_snapshot_is_restored_once(tmp_path):
+    snapshot = tmp_path / "snapshot" / "campaigns.db"
+    seed.build_snapshot(snapshot, data_dir=DATA_DIR)
+    assert not (tmp_path / "snapshot" / "campaigns.db.partial").exists()
+
+    bind = create_engine(f"sqlite:///{tmp_path / 'live.db'}")
+    try:
+        assert seed.restore_snapshot(bind, str(snapshot))
+        assert not seed.restore_snapshot(bind, str(snapshot))
+        assert dump_tables(bind)["campaigns"]
+        assert seed.seed_is_current(bind, DATA_DIR)
+    finally:
+        bind.dispose()
+
+
+def test_read_input_prunes_and_types_declared_columns(tmp_path):
+    sites = seed.read_input(seed.SITIOS, DATA_DIR)
+    assert set(sites.columns) <= set(seed.INPUT_SCHEMAS[seed.SITIOS])
+    assert "disponible" not in sites.columns
+    assert str(sites["impactos_mensuales"].dtype) == "Int64"
+    # Date-formatted numbers are repaired while reading
+    periods = seed.read_input(seed.PERIODOS, DATA_DIR)
+    assert str(periods["impactos_periodo_vehiculos"].dtype) == "Int64"
+
+    data_dir = copy_data_dir(tmp_path / "data")
+    frame = pd.read_csv(data_dir / "bd_campanias_periodos.csv")
+    frame.drop(columns=["period"]).to_csv(data_dir / "bd_campanias_periodos.csv", index=False)
+    with pytest.raises(ValueError, match="faltan columnas requeridas: period"):
+        seed.read_input(seed.PERIODOS, data_dir)
+
+
+def test_csv_parsers_read_identical_frames(monkeypatch):
+    pytest.importorskip("pyarrow")
+    with_pyarrow = {stem: seed.read_input(stem, DATA_DIR) for stem in seed.INPUT_STEMS}
+    # Counts above 2**53 keep every digit
+    assert with_pyarrow[seed.PERIODOS]["impactos_periodo_personas"].max() > 2**53
+
+    monkeypatch.setitem(sys.modules, "pyarrow.csv", None)
+    for stem, frame in with_pyarrow.items():
+        pd.testing.assert_frame_equal(seed.read_input(stem, DATA_DIR), frame, check_like=True)
+
+
+def test_csv_rejects_fractional_integers(tmp_path):
+    data_dir = copy_data_dir(tmp_path / "data")
+    frame = pd.read_csv(data_dir / "bd_campanias_periodos.csv")
+    frame["impactos_periodo_personas"] = frame["impactos_periodo_personas"].astype(float) + 0.5
+    frame.to_csv(data_dir / "bd_campanias_periodos.csv", index=False)
+    with pytest.raises(ValueError, match="bd_campanias_periodos.csv"):
+        seed.read_input(seed.PERIODOS, data_dir)
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_converted_inputs_load_identical_rows(seed_engine, tmp_path, output_format):
+    pytest.importorskip("pyarrow")
+    converted = convert_inputs.convert(DATA_DIR, tmp_path / "converted", output_format)
+    assert {path.suffix for path in converted.values()} == {convert_inputs.OUTPUT_FORMATS[output_format]}
+
+    seed.load_data(bind=seed_engine, data_dir=DATA_DIR)
+    csv_rows = dump_tables(seed_engine)
+    summary = seed.load_data(bind=seed_engine, data_dir=tmp_path / "converted", incremental=True)
+    assert all(not changes.inserted + changes.updated + changes.deleted for changes in summary.values())
+    assert dump_tables(seed_engine) == csv_rows
+
+
+def test_inputs_in_several_formats_are_refused(tmp_path):
+    pytest.importorskip("pyarrow")
+    data_dir = copy_data_dir(tmp_path / "data")
+    with pytest.raises(ValueError, match="directorio distinto"):
+        convert_inputs.convert(data_dir, data_dir)
+    convert_inputs.convert(data_dir, tmp_path / "converted")
+    (tmp_path / "converted" / "bd_campanias_sitios.parquet").rename(data_dir / "bd_campanias_sitios.parquet")
+    with pytest.raises(ValueError, match="bd_campanias_sitios está en varios formatos"):
+        seed.prepare_frames(data_dir)
+
+
+def test_convert_rejects_invalid_dates(tmp_path):
+    data_dir = copy_data_dir(tmp_path / "data")
+    frame = pd.read_csv(data_dir / "bd_campanias_agrupado.csv")
+    frame.loc[0, "fecha_fin"] = "31/03/2025"
+    frame.to_csv(data_dir / "bd_campanias_agrupado.csv", index=False)
+    with pytest.raises(ValueError, match="fecha_fin: 1 fechas"):
+        convert_inputs.convert(data_dir, tmp_path / "out")
+    assert not (tmp_path / "out").exists()
+
+
+def test_month_keys_match_sql_backfill(seed_engine):
+    seed.load_data(bind=seed_engine, data_dir=DATA_DIR)
+    query = text("SELECT id, tipo_campania, month_key FROM campaign_periods ORDER BY id")
+    with seed_engine.begin() as conn:
+        derived = conn.execute(query).fetchall()
+        conn.execute(text("UPDATE campaign_periods SET tipo_campania = NULL, month_key = NULL"))
+        analytics.refresh_period_month_keys(conn)
+        assert conn.execute(query).fetchall() == derived
+    assert {row.tipo_campania for row in derived} == {"mensual", "catorcenal"}
+    assert all(row.month_key for row in derived)
+
+
+def test_audience_vectors_match_sql_backfill(seed_engine):
+    seed.load_data(bind=seed_engine, data_dir=DATA_DIR)
+    query = text("SELECT name, audience_vector FROM campaigns ORDER BY name")
+    with seed_engine.begin() as conn:
+        derived = conn.execute(query).fetchall()
+        conn.execute(text("UPDATE campaigns SET audience_vector = NULL"))
+        similarity.refresh_audience_vectors(conn)
+        assert conn.execute(query).fetchall() == derived
+    vectors = similarity.unpack_audience([row.audience_vector for row in derived if row.audience_vector])
+    assert len(vectors) > 0
+    assert np.linalg.norm(vectors, axis=1) == pytest.approx(1, abs=1e-6)
+
+
+def test_seed_materializes_campaign_summaries(seed_engine):
+    seed.load_data(bind=seed_engine, data_dir=DATA_DIR)
+    frames = seed.prepare_frames(DATA_DIR)
+    sites = frames["campaign_sites"]
+    expected = sites.groupby("campaign_name").agg(
+        total_sitios=("codigo_del_sitio", "size"),
+        impactos_mensuales=("impactos_mensuales", "sum"),
+        alcance=("alcance_mensual", "sum"),
+    )
+
+    with seed_engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT campaign_name, total_periodos, total_sitios, impactos_mensuales, "
+            "alcance_mensual_promedio FROM campaign_summaries"
+        )).fetchall()
+
+    assert len(rows) == 12
+    assert sum(row.total_periodos for row in rows) == 36
+    for row in rows:
+        if row.campaign_name not in expected.index:
+            assert row.total_sitios == 0
+            continue
+        site_stats = expected.loc[row.campaign_name]
+        assert row.total_sitios == site_stats.total_sitios
+        assert row.impactos_mensuales == site_stats.impactos_mensuales
+        assert row.alcance_mensual_promedio == round(site_stats.alcance / site_stats.total_sitios, 2)
+
+
+def test_seed_packs_hourly_vehicle_counts(seed_engine):
+    seed.load_data(bind=seed_engine, data_dir=DATA_DIR)
+    source = pd.read_csv(DATA_DIR / "bd_campanias_agrupado.csv")
+    source = source.assign(name=source["name"].str.strip()).drop_duplicates("name").set_index("name")
+
+    with seed_engine.connect() as conn:
+        rows = conn.execute(text("SELECT name, hourly_vehicle_counts FROM campaigns")).fetchall()
+
+    assert len(rows) == 12
+    for name, blob in rows:
+        assert len(blob) == 24 * 4
+        expected = source.loc[name, seed.HOURLY_COLUMNS].tolist()
+        assert unpack_hourly([blob])[0].tolist() == expected
+
+
+def test_cli_exits_non_zero_when_the_load_fails(tmp_path, monkeypatch, capsys):
+    data_dir = copy_data_dir(tmp_path / "data")
+    (data_dir / "bd_campanias_sitios.csv").unlink()
+    monkeypatch.setattr(seed, "DATA_DIR", data_dir)
+    # The CLI's default engine points at ./campaigns.db
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        seed.load_data(bind=create_engine(f"sqlite:///{tmp_path / 'seed.db'}"), data_dir=data_dir)
+    assert seed.main([]) == 1
+    err = capsys.readouterr().err
+    assert "Traceback" in err and "FileNotFoundError" in err
+    assert "Error: No se encontró el archivo requerido" in err
@@ -0,0 +1,37 @@
+import json
+from datetime import date
+
+from fastapi.encoders import jsonable_encoder
+
+from app import models, schemas
+from app.serialization import campaign_row, dumps, site_row
+
+
+def test_fast_rows_match_pydantic_payloads():
+    undated = models.Campaign(name="camp_sin_fecha", tipo_campania="mensual")
+    campaign = models.Campaign(
+        name="camp_ñandú",
+        tipo_campania="mensual",
+        fecha_inicio=date(2024, 1, 1),
+        fecha_fin=date(2024, 1, 31),
+        impactos_personas=1000,
+        frecuencia_calculada=1.1,
+        nse_ab=0.25,
+        mujeres=None,
+    )
+    site = models.CampaignSite(
+        id=7,
+        campaign_name="camp_ñandú",
+        codigo_del_sitio="SITE-1",
+        municipio="Benito Juárez",
+        impactos_mensuales=240,
+        alcance_mensual=512.5,
+    )
+
+    for serializer, schema, obj in ((campaign_row, schemas.Campaign, campaign),
+                                    (campaign_row, schemas.Campaign, undated),
+                                    (site_row, schemas.CampaignSite, site)):
+        expected = jsonable_encoder(schema.model_validate(obj).model_dump())
+        body = dumps(serializer(obj))
+        assert json.loads(body) == expected
+        assert list(json.loads(body)) == list(expected)
@@ -39,7 +39,8 @@ function App() {
                 : await getCampaigns({ page, limit: pageSize, tipoCampania });
 
             setCampaigns(response.data);
-            setTotal(response.total);
+            // Page-number requests always include the total
+            setTotal(response.total ?? 0);
         } catch (err) {
             console.error('Error loading campaigns:', err);
             setError(err instanceof Error ? err.message : 'Error loading campaigns');
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Campaign, CampaignDetail, PaginatedResponse } from '../types/campaign';
+import { Campaign, CampaignDetail, CampaignDetailsResponse, FacetField, PaginatedResponse } from '../types/campaign';
 
 const API_URL = import.meta.env.VITE_API_URL ?? 'http://localhost:8080';
 
@@ -39,7 +39,11 @@ interface ListParams {
     tipoCampania?: string;
 }
 
-interface DateSearchParams extends ListParams {
+interface FacetedListParams extends ListParams {
+    facets?: FacetField[];
+}
+
+interface DateSearchParams extends FacetedListParams {
     startDate: string;
     endDate: string;
 }
@@ -48,11 +52,13 @@ export const getCampaigns = async ({
     page = 1,
     limit = 5,
     tipoCampania,
-}: ListParams): Promise<PaginatedResponse<Campaign>> => {
+    facets,
+}: FacetedListParams): Promise<PaginatedResponse<Campaign>> => {
     const params = new URLSearchParams({
         page: page.toString(),
         limit: limit.toString(),
         ...(tipoCampania && { tipo_campania: tipoCampania }),
+        ...(facets && facets.length > 0 && { facets: facets.join(',') }),
     });
 
     const response = await api.get(`/campaigns/?${params.toString()}`);
@@ -64,12 +70,18 @@ export const getCampaignDetail = async (campaignId: string): Promise<CampaignDet
     return response.data;
 };
 
+export const getCampaignDetails = async (campaignIds: string[]): Promise<CampaignDetailsResponse> => {
+    const response = await api.post('/campaign-details', { ids: campaignIds });
+    return response.data;
+};
+
 export const searchCampaignsByDate = async ({
     startDate,
     endDate,
     page = 1,
     limit = 5,
     tipoCampania,
+    facets,
 }: DateSearchParams): Promise<PaginatedResponse<Campaign>> => {
     const params = new URLSearchParams({
         start_date: startDate,
@@ -77,8 +89,35 @@ export const searchCampaignsByDate = async ({
         page: page.toString(),
         limit: limit.toString(),
         ...(tipoCampania && { tipo_campania: tipoCampania }),
+        ...(facets && facets.length > 0 && { facets: facets.join(',') }),
     });
 
     const response = await api.get(`/campaigns/search-by-date?${params.toString()}`);
     return response.data;
 };
+
+export type SearchField = 'name' | 'codigo' | 'municipio' | 'estado' | 'zm';
+
+interface TextSearchParams extends ListParams {
+    query: string;
+    field?: SearchField;
+}
+
+export const searchCampaigns = async ({
+    query,
+    field,
+    page = 1,
+    limit = 10,
+    tipoCampania,
+}: TextSearchParams): Promise<PaginatedResponse<Campaign>> => {
+    const params = new URLSearchParams({
+        q: query,
+        page: page.toString(),
+        limit: limit.toString(),
+        ...(field && { field }),
+        ...(tipoCampania && { tipo_campania: tipoCampania }),
+    });
+
+    const response = await api.get(`/search?${params.toString()}`);
+    return response.data;
+};
@@ -1,8 +1,8 @@
 export interface Campaign {
     name: string;
     tipo_campania: string;
-    fecha_inicio: string;
-    fecha_fin: string;
+    fecha_inicio: string | null;
+    fecha_fin: string | null;
     universo_zona_metro: number | null;
     impactos_personas: number | null;
     impactos_vehiculos: number | null;
@@ -79,9 +79,24 @@ export interface CampaignDetail extends Campaign {
     site_summary: SiteSummary;
 }
 
+export interface CampaignDetailsResponse {
+    data: CampaignDetail[];
+    missing: string[];
+}
+
+export type FacetField = 'tipo_campania' | 'estado' | 'municipio' | 'zm' | 'tipo_de_mueble' | 'tipo_de_anuncio';
+
+export interface FacetCount {
+    value: string;
+    count: number;
+}
+
 export interface PaginatedResponse<T> {
     data: T[];
-    total: number;
-    page: number;
+    // null with cursor paging or include_total=false
+    total: number | null;
+    page: number | null;
     pageSize: number;
+    next_cursor?: string | null;
+    facets?: Partial<Record<FacetField, FacetCount[]>>;
 }